@@ -0,0 +1,185 @@
+"""
+Benchmark: JSON file backend vs SQLite backend for MemoryManager.
+
+Seeds a store of N entries for each backend and measures the
+operations used during orchestration:
+- store_memory on top of an existing store
+- retrieve_memory of random keys
+- search_memories by category and relevance
+- get_relevant_context
+- export_memories
+
+Seeding writes the on-disk layout directly (one bulk write per backend)
+so that large sizes do not spend hours in the JSON backend's per-write
+index rewrite; the store_memory timing then measures exactly that cost.
+
+Usage:
+    python benchmarks/bench_memory_backends.py
+    python benchmarks/bench_memory_backends.py --sizes 1000 10000 --writes 50
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from orchestrator.memory import MemoryManager  # noqa: E402
+from orchestrator.models import MemoryEntry  # noqa: E402
+from orchestrator.storage import SQLiteBackend  # noqa: E402
+
+CATEGORIES = [
+    "architectural_decision",
+    "pattern",
+    "learned_preference",
+    "error_solution",
+    "integration_config",
+]
+
+
+def make_entries(count: int, seed: int = 42):
+    """Generate deterministic synthetic memory entries."""
+    rng = random.Random(seed)
+    now = datetime.now().isoformat()
+    for i in range(count):
+        yield MemoryEntry(
+            key=f"bench_{i:07d}",
+            value=(
+                f"Use {rng.choice(['FastAPI', 'Flask', 'httpx', 'pydantic'])} for "
+                f"{rng.choice(['api_automation', 'data_processing', 'workflow_automation'])} "
+                f"project number {i}"
+            ),
+            category=rng.choice(CATEGORIES),
+            timestamp=now,
+            relevance_score=round(rng.random(), 3)
+        )
+
+
+def index_extra(entry: MemoryEntry) -> dict:
+    """Index metadata beyond the dedicated SQLite columns."""
+    metadata = MemoryManager._build_metadata(entry)
+    for column in ("category", "timestamp", "relevance_score"):
+        del metadata[column]
+    return metadata
+
+
+def seed_json(memory_dir: Path, count: int) -> None:
+    """Write the JSON layout directly: entry files plus one index write."""
+    memory_dir.mkdir(parents=True, exist_ok=True)
+    index = {}
+    for entry in make_entries(count):
+        index[entry.key] = {
+            **MemoryManager._build_metadata(entry),
+            "file": f"{entry.key}.json"
+        }
+        with open(memory_dir / f"{entry.key}.json", 'w', encoding='utf-8') as f:
+            json.dump(entry.model_dump(), f, indent=2, ensure_ascii=False)
+
+    with open(memory_dir / "index.json", 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=2, ensure_ascii=False)
+
+
+def seed_sqlite(memory_dir: Path, count: int) -> None:
+    """Insert all entries in a single transaction."""
+    backend = SQLiteBackend(memory_dir / "memories.db")
+    with backend._transaction() as conn:
+        conn.executemany(
+            "INSERT INTO memories "
+            "(key, category, timestamp, relevance_score, metadata, entry) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                (
+                    e.key, e.category, e.timestamp, e.relevance_score,
+                    json.dumps(index_extra(e), ensure_ascii=False),
+                    json.dumps(e.model_dump(), ensure_ascii=False)
+                )
+                for e in make_entries(count)
+            )
+        )
+    backend.close()
+
+
+def timed(func, repeat: int = 1) -> float:
+    """Run func `repeat` times and return mean milliseconds per call."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def bench_backend(backend: str, count: int, writes: int, lookups: int) -> dict:
+    """Benchmark one backend at one store size."""
+    with tempfile.TemporaryDirectory() as tmp:
+        memory_dir = Path(tmp) / "memories"
+        seed_started = time.perf_counter()
+        if backend == "json":
+            seed_json(memory_dir, count)
+        else:
+            seed_sqlite(memory_dir, count)
+        seed_ms = (time.perf_counter() - seed_started) * 1000
+
+        manager = MemoryManager(memory_dir, backend=backend)
+        rng = random.Random(7)
+        keys = [f"bench_{rng.randrange(count):07d}" for _ in range(lookups)]
+
+        results = {
+            "seed_ms": seed_ms,
+            "cold_index_ms": timed(manager._load_index),
+        }
+
+        new_entries = list(make_entries(writes, seed=99))
+        for entry in new_entries:
+            entry.key = f"new_{entry.key}"
+        results["store_ms"] = timed(
+            lambda: manager.store_memory(new_entries.pop()), repeat=writes
+        )
+
+        key_iter = iter(keys)
+        results["retrieve_ms"] = timed(
+            lambda: manager.retrieve_memory(next(key_iter)), repeat=lookups
+        )
+        results["search_ms"] = timed(
+            lambda: manager.search_memories(category="pattern", min_relevance=0.9)
+        )
+        results["context_ms"] = timed(
+            lambda: manager.get_relevant_context("api_automation")
+        )
+        results["export_ms"] = timed(
+            lambda: manager.export_memories(Path(tmp) / "export.json")
+        )
+
+        manager.close()
+        return results
+
+
+def main() -> None:
+    """Run the benchmark matrix and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--backends", nargs="+", default=["json", "sqlite"])
+    parser.add_argument("--writes", type=int, default=100)
+    parser.add_argument("--lookups", type=int, default=1000)
+    args = parser.parse_args()
+
+    columns = [
+        "seed_ms", "cold_index_ms", "store_ms", "retrieve_ms",
+        "search_ms", "context_ms", "export_ms"
+    ]
+    print(f"{'backend':<8} {'entries':>8} " + " ".join(f"{c:>14}" for c in columns))
+    for size in args.sizes:
+        for backend in args.backends:
+            results = bench_backend(backend, size, args.writes, args.lookups)
+            print(
+                f"{backend:<8} {size:>8} "
+                + " ".join(f"{results[c]:>14.3f}" for c in columns)
+            )
+            sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Benchmark: high-rate memory ingestion.
+
+Stores architectural decisions (time-ordered keys, so no two writes
+share a key) into an empty store and reports stores per second for:
+- sync: one store_architectural_decision call (and flush) per write
+- async: C coroutines writing through one AsyncMemoryManager, whose
+  queued writes are group-committed
+- processes: P processes running the async producer at the same time
+Every run checks that no decision was lost.
+
+Usage:
+    python benchmarks/bench_memory_ingest.py
+    python benchmarks/bench_memory_ingest.py --stores 20000 --coroutines 200 --processes 8
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from orchestrator.memory import AsyncMemoryManager, MemoryManager  # noqa: E402
+
+
+def ingest_sync(memory_dir: Path, backend: str, stores: int) -> None:
+    """Store decisions one call at a time."""
+    manager = MemoryManager(memory_dir, backend=backend)
+    for i in range(stores):
+        manager.store_architectural_decision(f"Decision {i}", context="sync")
+    manager.close()
+
+
+async def ingest_async(memory_dir: Path, backend: str, stores: int, coroutines: int) -> None:
+    """Store decisions from concurrent coroutines."""
+    memory = AsyncMemoryManager(MemoryManager(memory_dir, backend=backend))
+
+    async def produce(coroutine: int) -> None:
+        for i in range(coroutine, stores, coroutines):
+            await memory.store_architectural_decision(f"Decision {i}", context="async")
+
+    await asyncio.gather(*(produce(c) for c in range(coroutines)))
+    await memory.aclose()
+
+
+def ingest_process(memory_dir: str, backend: str, stores: int, coroutines: int, worker: int) -> None:
+    """Run the async producer in a worker process."""
+    asyncio.run(ingest_async(Path(memory_dir), backend, stores, coroutines))
+
+
+def ingest_processes(
+    memory_dir: Path,
+    backend: str,
+    stores: int,
+    coroutines: int,
+    processes: int
+) -> None:
+    """Split the stores across worker processes."""
+    context = multiprocessing.get_context("fork")
+    workers = [
+        context.Process(
+            target=ingest_process,
+            args=(str(memory_dir), backend, stores // processes, coroutines, worker)
+        )
+        for worker in range(processes)
+    ]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join()
+    if any(process.exitcode for process in workers):
+        raise RuntimeError("An ingestion worker failed")
+
+
+def run(mode: str, backend: str, args: argparse.Namespace) -> dict:
+    """Time one mode on a fresh store and verify the stored count."""
+    stores = args.sync_stores if mode == "sync" else args.stores
+    if mode == "processes":
+        stores -= stores % args.processes
+
+    with tempfile.TemporaryDirectory() as tmp:
+        memory_dir = Path(tmp) / "memories"
+        MemoryManager(memory_dir, backend=backend).close()
+
+        started = time.perf_counter()
+        if mode == "sync":
+            ingest_sync(memory_dir, backend, stores)
+        elif mode == "async":
+            asyncio.run(ingest_async(memory_dir, backend, stores, args.coroutines))
+        else:
+            ingest_processes(memory_dir, backend, stores, args.coroutines, args.processes)
+        elapsed = time.perf_counter() - started
+
+        manager = MemoryManager(memory_dir, backend=backend)
+        stored = manager.count_memories()
+        manager.close()
+
+    return {
+        "stores": stores,
+        "stored": stored,
+        "seconds": elapsed,
+        "stores_per_s": stores / elapsed,
+    }
+
+
+def main() -> None:
+    """Run every mode for each backend and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--stores", type=int, default=10000)
+    parser.add_argument("--sync-stores", type=int, default=1000)
+    parser.add_argument("--coroutines", type=int, default=100)
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--backends", nargs="+", default=["json", "sqlite"])
+    parser.add_argument("--modes", nargs="+", default=["sync", "async", "processes"])
+    args = parser.parse_args()
+
+    columns = ["stores", "stored", "seconds", "stores_per_s"]
+    print(f"{'backend':<8} {'mode':<10} " + " ".join(f"{c:>14}" for c in columns))
+    for backend in args.backends:
+        for mode in args.modes:
+            results = run(mode, backend, args)
+            print(
+                f"{backend:<8} {mode:<10} "
+                + " ".join(
+                    f"{results[c]:>14.3f}" if isinstance(results[c], float) else f"{results[c]:>14}"
+                    for c in columns
+                )
+            )
+            sys.stdout.flush()
+            if results["stored"] != results["stores"]:
+                raise SystemExit(f"{backend}/{mode}: lost {results['stores'] - results['stored']} stores")
+
+
+if __name__ == "__main__":
+    main()
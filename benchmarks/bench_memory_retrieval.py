@@ -0,0 +1,119 @@
+"""
+Benchmark: BM25 vs hashed-vector retrieval for memory context.
+
+Seeds a store of N synthetic memories, then measures for each
+retrieval mode:
+- the first rank_memories call, which builds the text index
+- rank_memories latency for user requests (the call behind
+  get_relevant_context)
+- VectorIndex.similarities alone (the sparse matrix-vector product)
+
+Measured on a 50k-memory store: vector rank_memories takes about
+5-6 ms and the product 3.5-4.5 ms. The synthetic vocabulary is small,
+so common query terms occur in every memory and a query sums about
+470k postings; pruning candidates by query term would not skip any.
+
+Usage:
+    python benchmarks/bench_memory_retrieval.py
+    python benchmarks/bench_memory_retrieval.py --sizes 1000 50000 --queries 200
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from orchestrator.memory import MemoryManager  # noqa: E402
+from orchestrator.models import MemoryEntry  # noqa: E402
+
+TOOLS = ["FastAPI", "Flask", "httpx", "pydantic", "pandas", "pdfplumber", "Slack", "Celery"]
+TASKS = [
+    "invoice extraction", "webhook notifications", "CSV validation", "JWT authentication",
+    "report scheduling", "email parsing", "retry with backoff", "web scraping"
+]
+REQUESTS = [
+    "Quiero procesar facturas PDF y extraer los campos (invoice extraction)",
+    "Build a REST API with JWT authentication and rate limiting",
+    "Send Slack notifications when a CSV upload fails validation",
+    "Scrape product prices every night and email a report",
+]
+
+
+def make_entries(count: int, seed: int = 42):
+    """Generate deterministic synthetic memories."""
+    rng = random.Random(seed)
+    now = datetime.now().isoformat()
+    for i in range(count):
+        yield MemoryEntry(
+            key=f"bench_{i:07d}",
+            value=(
+                f"Use {rng.choice(TOOLS)} for {rng.choice(TASKS)} in project {i}; "
+                f"pair it with {rng.choice(TOOLS)} for {rng.choice(TASKS)}"
+            ),
+            category="pattern",
+            timestamp=now,
+            relevance_score=round(0.7 + 0.3 * rng.random(), 3)
+        )
+
+
+def timed(func, repeat: int = 1) -> float:
+    """Run func `repeat` times and return mean milliseconds per call."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def bench(memory_dir: Path, retrieval: str, queries: int) -> dict:
+    """Benchmark one retrieval mode on an existing store."""
+    manager = MemoryManager(memory_dir, retrieval=retrieval)
+    requests = iter(REQUESTS * queries)
+    results = {
+        "build_ms": timed(lambda: manager.rank_memories("warm up")),
+        "rank_ms": timed(lambda: manager.rank_memories(next(requests)), repeat=queries),
+    }
+    if retrieval == "vector":
+        results["matvec_ms"] = timed(
+            lambda: manager._text_index.similarities(REQUESTS[0]), repeat=queries
+        )
+    manager.close()
+    return results
+
+
+def main() -> None:
+    """Run the benchmark matrix and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--queries", type=int, default=100)
+    args = parser.parse_args()
+
+    columns = ["build_ms", "rank_ms", "matvec_ms"]
+    print(f"{'retrieval':<10} {'entries':>8} " + " ".join(f"{c:>14}" for c in columns))
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            memory_dir = Path(tmp) / "memories"
+            seeder = MemoryManager(memory_dir, retrieval="bm25")
+            with seeder.batch():
+                for entry in make_entries(size):
+                    seeder.store_memory(entry)
+            seeder.close()
+
+            for retrieval in ("bm25", "vector"):
+                results = bench(memory_dir, retrieval, args.queries)
+                print(
+                    f"{retrieval:<10} {size:>8} "
+                    + " ".join(
+                        f"{results[c]:>14.3f}" if c in results else f"{'-':>14}"
+                        for c in columns
+                    )
+                )
+                sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
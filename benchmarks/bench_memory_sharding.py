@@ -0,0 +1,121 @@
+"""
+Benchmark: flat vs hash-sharded JSON memory layout.
+
+Seeds a flat JSON store of N entries whose values are longer than the
+index preview (so every lookup opens its entry file), then measures:
+- listing the memory directory
+- retrieve_memory of random keys with a fresh manager
+- export_memories
+- migrate_layout() from flat to sharded
+and repeats the measurements on the sharded layout.
+
+Usage:
+    python benchmarks/bench_memory_sharding.py
+    python benchmarks/bench_memory_sharding.py --entries 20000 --shard-width 2
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from orchestrator.memory import MemoryManager  # noqa: E402
+from orchestrator.models import MemoryEntry  # noqa: E402
+from orchestrator.storage import JSONFileBackend  # noqa: E402
+
+
+def seed_flat(memory_dir: Path, count: int) -> None:
+    """Write a flat JSON layout directly: entry files plus one index write."""
+    memory_dir.mkdir(parents=True, exist_ok=True)
+    now = datetime.now().isoformat()
+    filler = "Validate payloads with pydantic before calling the API. " * 8
+    index = {}
+    for i in range(count):
+        entry = MemoryEntry(
+            key=f"bench_{i:07d}",
+            value=f"Pattern {i}: {filler}",
+            category="pattern",
+            timestamp=now
+        )
+        index[entry.key] = {
+            **MemoryManager._build_metadata(entry),
+            "file": f"{entry.key}.json"
+        }
+        with open(memory_dir / f"{entry.key}.json", 'w', encoding='utf-8') as f:
+            json.dump(entry.model_dump(), f, indent=2, ensure_ascii=False)
+
+    with open(memory_dir / "index.json", 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=2, ensure_ascii=False)
+
+
+def timed(func, repeat: int = 1) -> float:
+    """Run func `repeat` times and return mean milliseconds per call."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def measure(memory_dir: Path, keys, export_file: Path) -> dict:
+    """Time directory listing, lookups and export on the current layout."""
+    manager = MemoryManager(memory_dir)
+    manager._load_index()
+    key_iter = iter(keys)
+    results = {
+        "list_dir_ms": timed(lambda: sum(1 for _ in os.scandir(memory_dir))),
+        "retrieve_ms": timed(
+            lambda: manager.retrieve_memory(next(key_iter)), repeat=len(keys)
+        ),
+        "export_ms": timed(lambda: manager.export_memories(export_file)),
+    }
+    manager.close()
+    return results
+
+
+def main() -> None:
+    """Run the benchmark and print one row per layout."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=100000)
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--shard-width", type=int, default=2)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    keys = [f"bench_{rng.randrange(args.entries):07d}" for _ in range(args.lookups)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        memory_dir = Path(tmp) / "memories"
+        export_file = Path(tmp) / "export.json"
+        seed_flat(memory_dir, args.entries)
+
+        rows = [("flat", measure(memory_dir, keys, export_file))]
+
+        backend = JSONFileBackend(memory_dir)
+        migrate_ms = timed(lambda: backend.migrate_layout(args.shard_width))
+        backend.close()
+
+        sharded = measure(memory_dir, keys, export_file)
+        sharded["migrate_ms"] = migrate_ms
+        rows.append((f"sharded/{args.shard_width}", sharded))
+
+    columns = ["list_dir_ms", "retrieve_ms", "export_ms", "migrate_ms"]
+    print(f"{'layout':<10} {'entries':>8} " + " ".join(f"{c:>14}" for c in columns))
+    for layout, results in rows:
+        print(
+            f"{layout:<10} {args.entries:>8} "
+            + " ".join(
+                f"{results[c]:>14.3f}" if c in results else f"{'-':>14}"
+                for c in columns
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
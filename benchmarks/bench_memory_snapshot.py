@@ -0,0 +1,107 @@
+"""
+Benchmark: worker cold start from the store vs. the mapped snapshot.
+
+Seeds a store of N synthetic memories, writes its snapshot, then
+measures in a fresh process for each source:
+- open: constructing the MemoryManager
+- first_read: the first retrieve_memory call (index load + one entry)
+- first_context: the first get_relevant_context call (text index build)
+
+Usage:
+    python benchmarks/bench_memory_snapshot.py
+    python benchmarks/bench_memory_snapshot.py --sizes 1000 50000 --backends json sqlite
+"""
+
+import argparse
+import json
+import multiprocessing
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from orchestrator.memory import MemoryManager  # noqa: E402
+from orchestrator.models import MemoryEntry  # noqa: E402
+
+TOOLS = ["FastAPI", "Flask", "httpx", "pydantic", "pandas", "pdfplumber", "Slack", "Celery"]
+TASKS = ["invoice extraction", "webhook notifications", "CSV validation", "JWT authentication"]
+
+
+def seed(memory_dir: Path, backend: str, count: int) -> None:
+    """Store deterministic synthetic memories and write the snapshot."""
+    rng = random.Random(42)
+    now = datetime.now().isoformat()
+    manager = MemoryManager(memory_dir, backend=backend)
+    with manager.batch():
+        for i in range(count):
+            manager.store_memory(MemoryEntry(
+                key=f"bench_{i:07d}",
+                value=f"Use {rng.choice(TOOLS)} for {rng.choice(TASKS)} in project {i}",
+                category="pattern",
+                timestamp=now
+            ))
+    if hasattr(manager.backend, "compact"):
+        manager.backend.compact()
+    manager.write_snapshot()
+    manager.close()
+
+
+def cold_start(memory_dir: str, backend: str, source: str, results) -> None:
+    """Time a worker's first calls (runs in a fresh process)."""
+    started = time.perf_counter()
+    if source == "snapshot":
+        manager = MemoryManager.open_snapshot(Path(memory_dir))
+    else:
+        manager = MemoryManager(Path(memory_dir), backend=backend)
+    opened = time.perf_counter()
+    manager.retrieve_memory("bench_0000001")
+    read = time.perf_counter()
+    manager.get_relevant_context("api", query="JWT authentication with FastAPI")
+    context = time.perf_counter()
+    results.put(json.dumps({
+        "open_ms": (opened - started) * 1000,
+        "first_read_ms": (read - opened) * 1000,
+        "first_context_ms": (context - read) * 1000,
+    }))
+
+
+def measure(memory_dir: Path, backend: str, source: str) -> dict:
+    """Run cold_start in a new process and collect its timings."""
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(target=cold_start, args=(str(memory_dir), backend, source, results))
+    process.start()
+    timings = json.loads(results.get())
+    process.join()
+    return timings
+
+
+def main() -> None:
+    """Run the benchmark matrix and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--backends", nargs="+", default=["json", "sqlite"])
+    args = parser.parse_args()
+
+    columns = ["open_ms", "first_read_ms", "first_context_ms"]
+    print(f"{'backend':<8} {'source':<9} {'entries':>8} " + " ".join(f"{c:>17}" for c in columns))
+    for backend in args.backends:
+        for size in args.sizes:
+            with tempfile.TemporaryDirectory() as tmp:
+                memory_dir = Path(tmp) / "memories"
+                seed(memory_dir, backend, size)
+                for source in ("store", "snapshot"):
+                    results = measure(memory_dir, backend, source)
+                    print(
+                        f"{backend:<8} {source:<9} {size:>8} "
+                        + " ".join(f"{results[c]:>17.3f}" for c in columns)
+                    )
+                    sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,7 @@ Main components:
 - Models: Pydantic models for data structures
 - MemoryManager: Persistent memory across sessions
 - OrchestrationWorkflow: Workflow coordination
+- ClientPool: SDK client sessions for subagents running in parallel
 - Specialized subagents: requirements_analyst, code_generator, test_writer, etc.
 
 Example usage:
@@ -35,9 +36,13 @@ try:
         OrchestrationResult,
         FileDefinition,
         AgentConfig,
-        MemoryEntry
+        MemoryEntry,
+        WorkflowEvent
     )
-    from .memory import MemoryManager
+    from .checkpoints import CheckpointStore
+    from .intent_cache import IntentCache
+    from .memory import AsyncMemoryManager, MemoryManager
+    from .sessions import ClientPool
     from .workflow import OrchestrationWorkflow
 except ImportError:
     # Allow importing __version__ even when dependencies aren't installed
@@ -52,6 +57,11 @@ __all__ = [
     "FileDefinition",
     "AgentConfig",
     "MemoryEntry",
+    "WorkflowEvent",
     "MemoryManager",
+    "AsyncMemoryManager",
+    "ClientPool",
+    "CheckpointStore",
+    "IntentCache",
     "OrchestrationWorkflow"
 ]
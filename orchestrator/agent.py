@@ -8,8 +8,9 @@ automation projects.
 
 import asyncio
 import json
+from contextlib import aclosing
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, AsyncIterator
 from datetime import datetime
 
 # Conditional import for Claude Agent SDK
@@ -35,9 +36,15 @@ try:
         AutomationIntent,
         ProjectStructure,
         ValidationResult,
-        OrchestrationResult
+        OrchestrationResult,
+        WorkflowEvent
     )
-    from .memory import MemoryManager
+    from .checkpoints import RUNS_KEPT, CheckpointStore
+    from .eviction import DEFAULT_LIMITS
+    from .intent_cache import IntentCache
+    from .memory import AsyncMemoryManager, MemoryManager
+    from .sessions import DEFAULT_POOL_SIZE, ClientPool
+    from .similarity import NEAR_DUPLICATE_DISTANCE
     from .tools import create_orchestrator_tools
     from .subagents import get_subagent_definitions
     from .workflow import OrchestrationWorkflow
@@ -49,7 +56,14 @@ except ImportError:
     ProjectStructure = None
     ValidationResult = None
     OrchestrationResult = None
+    WorkflowEvent = None
     MemoryManager = None
+    AsyncMemoryManager = None
+    ClientPool = None
+    CheckpointStore = None
+    IntentCache = None
+    DEFAULT_POOL_SIZE = 3
+    RUNS_KEPT = 100
 
 
 class OrchestratorAgent:
@@ -75,7 +89,11 @@ class OrchestratorAgent:
     def __init__(
         self,
         working_dir: Optional[Path] = None,
-        memory_dir: Optional[Path] = None
+        memory_dir: Optional[Path] = None,
+        max_sessions: int = DEFAULT_POOL_SIZE,
+        runs_dir: Optional[Path] = None,
+        intent_cache_dir: Optional[Path] = None,
+        max_runs: int = RUNS_KEPT
     ):
         """
         Initialize the orchestrator agent.
@@ -83,16 +101,42 @@ class OrchestratorAgent:
         Args:
             working_dir: Base directory for generating projects (default: current dir)
             memory_dir: Directory for persistent memory (default: .claude/memories)
+            max_sessions: SDK client sessions opened at most for subagents
+                running in parallel (1 runs them one after another)
+            runs_dir: Directory for run checkpoints (default: ``runs`` next
+                to memory_dir, i.e. .claude/runs)
+            intent_cache_dir: Directory for cached intent analyses
+                (default: ``intent_cache`` next to memory_dir)
+            max_runs: Runs kept in runs_dir; the oldest beyond this are
+                removed when a new run starts
+
+        Raises:
+            ValueError: If max_runs is less than 1
         """
+        if max_runs < 1:
+            raise ValueError("max_runs must be at least 1")
         self.working_dir = working_dir or Path.cwd()
+        self.max_sessions = max_sessions
+        memory_dir = memory_dir or Path(".claude/memories")
+        self.runs_dir = runs_dir or memory_dir.parent / "runs"
+        self.max_runs = max_runs
 
         # Only initialize components if available
         if COMPONENTS_AVAILABLE:
             self.memory = MemoryManager(
-                memory_dir or Path(".claude/memories")
+                memory_dir,
+                limits=DEFAULT_LIMITS,
+                merge_distance=NEAR_DUPLICATE_DISTANCE
+            )
+            # Non-blocking view used by the tools and workflow
+            self.async_memory = AsyncMemoryManager(self.memory)
+            self.intent_cache = IntentCache(
+                intent_cache_dir or memory_dir.parent / "intent_cache"
             )
         else:
             self.memory = None
+            self.async_memory = None
+            self.intent_cache = None
 
         # Will be set during orchestration
         self.client = None
@@ -190,7 +234,7 @@ When you make architectural decisions, store them in memory.
             mcp_servers={
                 "orchestrator": create_orchestrator_tools(
                     working_dir=self.working_dir,
-                    memory=self.memory
+                    memory=self.async_memory
                 )
             },
 
@@ -224,7 +268,8 @@ When you make architectural decisions, store them in memory.
     async def create_automation(
         self,
         user_request: str,
-        additional_context: Optional[str] = None
+        additional_context: Optional[str] = None,
+        bypass_cache: bool = False
     ) -> OrchestrationResult:
         """
         Create a complete automation project from user request.
@@ -234,6 +279,8 @@ When you make architectural decisions, store them in memory.
         Args:
             user_request: User's description of what they want to automate
             additional_context: Optional additional context or requirements
+            bypass_cache: Analyze the intent again even if an identical
+                request was analyzed before
 
         Returns:
             OrchestrationResult with success status and project details
@@ -252,7 +299,145 @@ When you make architectural decisions, store them in memory.
         self._check_sdk_available()
         self._check_components_available()
 
+        checkpoints = self._new_run(user_request, additional_context)
+        return await self._run(user_request, additional_context, checkpoints, bypass_cache)
+
+    async def create_automation_stream(
+        self,
+        user_request: str,
+        additional_context: Optional[str] = None,
+        bypass_cache: bool = False
+    ) -> AsyncIterator["WorkflowEvent"]:
+        """
+        Create an automation project, yielding progress events meanwhile.
+
+        Same as ``create_automation()``, but the caller sees phases start
+        and finish, subagent messages, tool calls and written files as
+        they happen, with the elapsed time and tokens so far. The last
+        event has kind "result" and carries the OrchestrationResult.
+        Closing the iterator early cancels the run; it can be resumed
+        later with ``resume()``.
+
+        Args:
+            user_request: User's description of what they want to automate
+            additional_context: Optional additional context or requirements
+            bypass_cache: Analyze the intent again even if an identical
+                request was analyzed before
+
+        Yields:
+            WorkflowEvent objects, the result event last
+
+        Example:
+            >>> async with aclosing(orchestrator.create_automation_stream(
+            ...     "Automatizar generación de reportes semanales"
+            ... )) as events:
+            ...     async for event in events:
+            ...         if event.kind == "phase_started":
+            ...             print(f"[{event.elapsed_seconds:.0f}s] {event.phase}...")
+            ...         elif event.kind == "result":
+            ...             print(event.result.project_path)
+        """
+        self._check_sdk_available()
+        self._check_components_available()
+
+        checkpoints = self._new_run(user_request, additional_context)
+        async with aclosing(
+            self._run_stream(user_request, additional_context, checkpoints, bypass_cache)
+        ) as events:
+            async for event in events:
+                yield event
+
+    async def resume(self, run_id: str) -> OrchestrationResult:
+        """
+        Resume a run that failed, skipping the phases it completed.
+
+        The intent, project structure and subagent results saved by the
+        earlier attempt are reused; only the remaining phases (and
+        validation) run again.
+
+        Args:
+            run_id: ``artifacts["run_id"]`` of the earlier result
+
+        Returns:
+            OrchestrationResult of the resumed run
+
+        Raises:
+            FileNotFoundError: If there is no such run
+            ValueError: If the run already completed
+
+        Example:
+            >>> result = await orchestrator.create_automation("Process PDF invoices")
+            >>> if not result.success:
+            ...     result = await orchestrator.resume(result.artifacts["run_id"])
+        """
+        self._check_sdk_available()
+        self._check_components_available()
+
+        checkpoints = CheckpointStore.open(self.runs_dir, run_id)
+        run = checkpoints.run_info()
+        if run["status"] == "completed":
+            # Its phase checkpoints are gone: resuming would redo every phase
+            raise ValueError(f"Run {run_id} already completed")
+        return await self._run(run["user_request"], run["additional_context"], checkpoints)
+
+    def _new_run(
+        self,
+        user_request: str,
+        additional_context: Optional[str]
+    ) -> "CheckpointStore":
+        """Start a run, removing the oldest runs beyond max_runs."""
+        checkpoints = CheckpointStore.create(self.runs_dir, user_request, additional_context)
+        CheckpointStore.prune(self.runs_dir, self.max_runs)
+        return checkpoints
+
+    async def _run(
+        self,
+        user_request: str,
+        additional_context: Optional[str],
+        checkpoints: "CheckpointStore",
+        bypass_cache: bool = False
+    ) -> OrchestrationResult:
+        """
+        Execute the workflow for a run and record its outcome.
+
+        Args:
+            user_request: User's description of what they want to automate
+            additional_context: Optional additional context or requirements
+            checkpoints: Store of the run's completed phases
+            bypass_cache: Skip the intent cache lookup
+
+        Returns:
+            OrchestrationResult with the run id in ``artifacts["run_id"]``
+        """
+        async with aclosing(
+            self._run_stream(user_request, additional_context, checkpoints, bypass_cache)
+        ) as events:
+            async for event in events:
+                result = event.result
+        return result
+
+    async def _run_stream(
+        self,
+        user_request: str,
+        additional_context: Optional[str],
+        checkpoints: "CheckpointStore",
+        bypass_cache: bool = False
+    ) -> AsyncIterator["WorkflowEvent"]:
+        """
+        Execute the workflow for a run, yielding its progress events.
+
+        Args:
+            user_request: User's description of what they want to automate
+            additional_context: Optional additional context or requirements
+            checkpoints: Store of the run's completed phases
+            bypass_cache: Skip the intent cache lookup
+
+        Yields:
+            WorkflowEvent objects; the last is the result event, whose
+            result has the run id in ``artifacts["run_id"]``
+        """
         start_time = datetime.now()
+        tokens = 0
 
         try:
             # Build options
@@ -260,43 +445,63 @@ When you make architectural decisions, store them in memory.
 
             # Create workflow
             self.workflow = OrchestrationWorkflow(
-                memory=self.memory,
-                working_dir=self.working_dir
+                memory=self.async_memory,
+                working_dir=self.working_dir,
+                max_concurrency=self.max_sessions,
+                intent_cache=self.intent_cache,
+                model=options.model
             )
 
-            # Execute orchestration workflow
-            async with ClaudeSDKClient(options=options) as client:
+            # Execute orchestration workflow; delegated subagents get
+            # sessions of their own so they run concurrently
+            async with ClaudeSDKClient(options=options) as client, ClientPool(
+                lambda: ClaudeSDKClient(options=options),
+                size=self.max_sessions
+            ) as pool:
                 self.client = client
 
-                # Pass client to workflow
+                # Pass client and session pool to workflow
                 self.workflow.client = client
+                self.workflow.pool = pool
 
                 # Execute workflow
-                result = await self.workflow.execute(
+                async with aclosing(self.workflow.execute_stream(
                     user_request=user_request,
-                    additional_context=additional_context
-                )
-
-                # Calculate execution time
-                execution_time = (datetime.now() - start_time).total_seconds()
-                result.execution_time_seconds = execution_time
-
-                return result
+                    additional_context=additional_context,
+                    checkpoints=checkpoints,
+                    bypass_cache=bypass_cache
+                )) as events:
+                    async for event in events:
+                        tokens = event.tokens
+                        if event.kind == "result":
+                            result = event.result
+                        else:
+                            yield event
 
         except Exception as e:
             # Handle errors gracefully
-            execution_time = (datetime.now() - start_time).total_seconds()
-
-            return OrchestrationResult(
+            result = OrchestrationResult(
                 success=False,
                 intent=None,  # Intent analysis may have failed
                 structure=None,
                 validation=None,
                 error=str(e),
-                execution_time_seconds=execution_time,
+                execution_time_seconds=0.0,
                 artifacts={"error_type": type(e).__name__}
             )
 
+        # Calculate execution time
+        execution_time = (datetime.now() - start_time).total_seconds()
+        result.execution_time_seconds = execution_time
+        result.artifacts["run_id"] = checkpoints.run_id
+        checkpoints.finish(result.success, result.error)
+        yield WorkflowEvent(
+            kind="result",
+            elapsed_seconds=execution_time,
+            tokens=tokens,
+            result=result
+        )
+
     async def analyze_intent(self, user_request: str) -> AutomationIntent:
         """
         Analyze user intent with structured output.
@@ -369,18 +574,23 @@ Please provide a structured analysis using AutomationIntent format."""
 
         if not self.workflow:
             self.workflow = OrchestrationWorkflow(
-                memory=self.memory,
+                memory=self.async_memory,
                 working_dir=self.working_dir
             )
 
         return await self.workflow.validate_project(project_path)
 
-    def get_memory_context(self, project_type: str) -> str:
+    def get_memory_context(
+        self,
+        project_type: str,
+        query: Optional[str] = None
+    ) -> str:
         """
         Get relevant memory context for a project type.
 
         Args:
             project_type: Type of project being created
+            query: Optional user request to rank memories against
 
         Returns:
             Formatted context string
@@ -390,7 +600,7 @@ Please provide a structured analysis using AutomationIntent format."""
             >>> print(context)
         """
         self._check_components_available()
-        return self.memory.get_relevant_context(project_type)
+        return self.memory.get_relevant_context(project_type, query=query)
 
     async def cleanup(self) -> None:
         """
@@ -401,3 +611,6 @@ Please provide a structured analysis using AutomationIntent format."""
         if self.client:
             # Client will be closed by context manager
             pass
+
+        if self.async_memory:
+            await self.async_memory.aclose()
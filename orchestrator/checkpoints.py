@@ -0,0 +1,222 @@
+"""
+Persistent checkpoints of orchestration runs.
+
+Each run gets a directory named by a ULID run id under the runs
+directory, holding ``run.json`` (the request and the run's status) and
+one JSON file per completed phase. A run that failed late, for example
+during validation, can be resumed from those files instead of repeating
+intent analysis, structure generation and every subagent delegation.
+
+A completed run cannot be resumed, so its phase files are removed when
+it finishes; ``prune()`` removes the oldest runs beyond ``RUNS_KEPT``.
+
+Layout::
+
+    runs/
+        01J9ZK3Q4V7M2X8N5R6T0W1YBC/
+            run.json
+            intent.json
+            structure.json
+            requirements.json
+            ...
+"""
+
+import json
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .keys import new_ulid
+from .models import AutomationIntent, ProjectStructure
+from .storage import write_atomic
+
+RUN_FILE = "run.json"
+RUNS_KEPT = 100  # Run directories kept per runs directory
+
+# Phases whose checkpoint is rebuilt as a model; the others are plain JSON
+PHASE_MODELS = {
+    "intent": AutomationIntent,
+    "structure": ProjectStructure,
+}
+
+
+def _dump(payload: Dict[str, Any]) -> bytes:
+    return json.dumps(payload, indent=2, ensure_ascii=False, default=str).encode('utf-8')
+
+
+class CheckpointStore:
+    """
+    Completed phase outputs of one orchestration run.
+
+    Files are replaced atomically, so a crash while saving leaves the
+    previous checkpoint (or none) rather than a torn one.
+
+    Example:
+        >>> store = CheckpointStore.create(Path(".claude/runs"), "Process PDF invoices")
+        >>> store.save("intent", intent)
+        >>> CheckpointStore.open(Path(".claude/runs"), store.run_id).load()["intent"]
+        AutomationIntent(...)
+    """
+
+    def __init__(self, runs_dir: Path, run_id: str):
+        """
+        Initialize a store for a run directory.
+
+        Use ``create()`` for a new run and ``open()`` for an existing one.
+
+        Args:
+            runs_dir: Directory holding one subdirectory per run
+            run_id: Run identifier
+        """
+        self.runs_dir = Path(runs_dir)
+        self.run_id = run_id
+        self.path = self.runs_dir / run_id
+
+    @classmethod
+    def create(
+        cls,
+        runs_dir: Path,
+        user_request: str,
+        additional_context: Optional[str] = None
+    ) -> "CheckpointStore":
+        """
+        Start a new run.
+
+        Args:
+            runs_dir: Directory holding one subdirectory per run
+            user_request: Request the run executes
+            additional_context: Optional additional context
+
+        Returns:
+            Store for the new run
+        """
+        store = cls(runs_dir, new_ulid())
+        store.path.mkdir(parents=True, exist_ok=True)
+        now = datetime.now().isoformat()
+        store._write_run({
+            "run_id": store.run_id,
+            "user_request": user_request,
+            "additional_context": additional_context,
+            "status": "running",
+            "error": None,
+            "created_at": now,
+            "updated_at": now
+        })
+        return store
+
+    @classmethod
+    def open(cls, runs_dir: Path, run_id: str) -> "CheckpointStore":
+        """
+        Open an existing run.
+
+        Args:
+            runs_dir: Directory holding one subdirectory per run
+            run_id: Run identifier
+
+        Returns:
+            Store for the run
+
+        Raises:
+            FileNotFoundError: If there is no such run
+        """
+        store = cls(runs_dir, run_id)
+        if not (store.path / RUN_FILE).exists():
+            raise FileNotFoundError(f"No orchestration run '{run_id}' in {runs_dir}")
+        return store
+
+    @staticmethod
+    def prune(runs_dir: Path, max_runs: int = RUNS_KEPT) -> int:
+        """
+        Remove the oldest runs beyond max_runs.
+
+        Run ids are ULIDs, so their order is the order runs were created.
+
+        Args:
+            runs_dir: Directory holding one subdirectory per run
+            max_runs: Runs kept
+
+        Returns:
+            Number of runs removed
+        """
+        if not Path(runs_dir).exists():
+            return 0
+        runs = sorted(path for path in Path(runs_dir).iterdir() if (path / RUN_FILE).exists())
+        excess = runs[:max(0, len(runs) - max_runs)]
+        for path in excess:
+            shutil.rmtree(path, ignore_errors=True)
+        return len(excess)
+
+    def _write_run(self, run: Dict[str, Any]) -> None:
+        write_atomic(self.path / RUN_FILE, _dump(run))
+
+    def run_info(self) -> Dict[str, Any]:
+        """
+        Get the run's request and status.
+
+        Returns:
+            Dictionary with run_id, user_request, additional_context,
+            status ("running", "failed" or "completed"), error and
+            timestamps
+        """
+        with open(self.path / RUN_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def finish(self, success: bool, error: Optional[str] = None) -> None:
+        """
+        Record how the latest attempt of the run ended.
+
+        A completed run's phase checkpoints are removed; ``run.json``
+        keeps its request and status.
+
+        Args:
+            success: Whether the run succeeded
+            error: Error message if it failed
+        """
+        run = self.run_info()
+        run.update(
+            status="completed" if success else "failed",
+            error=error,
+            updated_at=datetime.now().isoformat()
+        )
+        self._write_run(run)
+        if success:
+            for path in self._phase_files():
+                path.unlink(missing_ok=True)
+
+    def save(self, phase: str, value: Any) -> None:
+        """
+        Persist the output of a completed phase.
+
+        Args:
+            phase: Phase name, e.g. "intent" or "requirements"
+            value: Pydantic model or JSON-serializable value
+        """
+        if hasattr(value, "model_dump"):
+            value = value.model_dump(mode="json")
+        write_atomic(self.path / f"{phase}.json", _dump({
+            "phase": phase,
+            "saved_at": datetime.now().isoformat(),
+            "value": value
+        }))
+
+    def load(self) -> Dict[str, Any]:
+        """
+        Load every completed phase.
+
+        Returns:
+            Phase outputs by name, with models rebuilt for the phases in
+            ``PHASE_MODELS``
+        """
+        completed = {}
+        for path in self._phase_files():
+            with open(path, 'r', encoding='utf-8') as f:
+                checkpoint = json.load(f)
+            phase = checkpoint["phase"]
+            value = checkpoint["value"]
+            model = PHASE_MODELS.get(phase)
+            completed[phase] = model(**value) if model is not None else value
+        return completed
+
+    def _phase_files(self) -> List[Path]:
+        return sorted(path for path in self.path.glob("*.json") if path.name != RUN_FILE)
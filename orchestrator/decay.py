@@ -0,0 +1,290 @@
+"""
+Time decay of memory relevance.
+
+A memory's effective relevance is its stored ``relevance_score`` halved
+once per category half-life since the score was set. It is computed
+when memories are ranked, so aging never rewrites entries;
+``MemoryManager.materialize_decay()`` can persist the decayed scores in
+one batch when desired.
+
+Scores are kept as columns and decayed in one vectorized pass, with
+NumPy when it is installed and plain ``array`` loops otherwise.
+"""
+
+import heapq
+import math
+import time
+from array import array
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+SECONDS_PER_DAY = 86400.0
+
+# Half-life in days per category (None = never decays)
+DEFAULT_HALF_LIVES: Dict[str, Optional[float]] = {
+    "architectural_decision": None,
+    "pattern": 180.0,
+    "learned_preference": 90.0,
+    "error_solution": 60.0,
+    "integration_config": 120.0,
+}
+
+
+def parse_timestamp(timestamp: Optional[str]) -> float:
+    """
+    Convert an ISO 8601 timestamp to epoch seconds.
+
+    Unparseable timestamps map to +inf, i.e. an age of zero.
+    """
+    if not timestamp:
+        return math.inf
+    try:
+        return datetime.fromisoformat(timestamp).timestamp()
+    except ValueError:
+        return math.inf
+
+
+class DecayModel:
+    """
+    Exponential decay with a configurable half-life per category.
+
+    Example:
+        >>> model = DecayModel({"pattern": 30.0})
+        >>> model.decay(1.0, "pattern", age_days=30.0)
+        0.5
+    """
+
+    def __init__(
+        self,
+        half_lives: Optional[Dict[str, Optional[float]]] = None,
+        default_half_life: Optional[float] = None
+    ):
+        """
+        Initialize the decay model.
+
+        Args:
+            half_lives: Half-life in days per category, merged over
+                DEFAULT_HALF_LIVES (None = the category never decays)
+            default_half_life: Half-life in days for unlisted categories
+        """
+        self.half_lives = {**DEFAULT_HALF_LIVES, **(half_lives or {})}
+        self.default_half_life = default_half_life
+
+    def half_life_seconds(self, category: str) -> float:
+        """Get a category's half-life in seconds (inf = no decay)."""
+        days = self.half_lives.get(category, self.default_half_life)
+        if days is None or days <= 0:
+            return math.inf
+        return days * SECONDS_PER_DAY
+
+    def decay(self, score: float, category: str, age_days: float) -> float:
+        """Decay a single score by its age in days."""
+        half_life = self.half_life_seconds(category)
+        age = max(age_days * SECONDS_PER_DAY, 0.0)
+        return score * 2.0 ** (-age / half_life)
+
+
+class DecayIndex:
+    """
+    Column store of stored scores, decay anchors and half-lives.
+
+    Rows are added and removed one at a time; the columns are turned
+    into arrays lazily, so decaying every row after a batch of changes
+    costs one conversion plus one vectorized pass.
+    """
+
+    def __init__(self, model: DecayModel):
+        """
+        Initialize an empty decay index.
+
+        Args:
+            model: Decay model providing per-category half-lives
+        """
+        self.model = model
+        self._slots: Dict[str, int] = {}
+        self._keys: List[str] = []
+        self._categories: List[str] = []
+        self._scores: List[float] = []
+        self._anchors: List[float] = []
+        self._half_lives: List[float] = []
+        self._arrays: Optional[Tuple] = None
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._slots
+
+    @property
+    def keys(self) -> List[str]:
+        """Row keys, aligned with ``decayed()``."""
+        return self._keys
+
+    def add(self, key: str, category: str, score: float, anchor: Optional[str]) -> None:
+        """
+        Add or replace a row.
+
+        Args:
+            key: Memory key
+            category: Memory category (selects the half-life)
+            score: Stored relevance score
+            anchor: ISO 8601 time the score was set
+        """
+        if key in self._slots:
+            self.remove(key)
+
+        self._slots[key] = len(self._keys)
+        self._keys.append(key)
+        self._categories.append(category)
+        self._scores.append(score)
+        self._anchors.append(parse_timestamp(anchor))
+        self._half_lives.append(self.model.half_life_seconds(category))
+        self._arrays = None
+
+    def remove(self, key: str) -> None:
+        """Remove a row if present (the last row takes its slot)."""
+        slot = self._slots.pop(key, None)
+        if slot is None:
+            return
+
+        last = len(self._keys) - 1
+        columns = (
+            self._keys, self._categories, self._scores,
+            self._anchors, self._half_lives
+        )
+        if slot != last:
+            for column in columns:
+                column[slot] = column[last]
+            self._slots[self._keys[slot]] = slot
+        for column in columns:
+            column.pop()
+        self._arrays = None
+
+    def score(self, key: str, now: Optional[float] = None) -> Optional[float]:
+        """Get the decayed score of one row (None if unknown)."""
+        slot = self._slots.get(key)
+        if slot is None:
+            return None
+        now = time.time() if now is None else now
+        age = max(now - self._anchors[slot], 0.0)
+        return self._scores[slot] * 2.0 ** (-age / self._half_lives[slot])
+
+    def _columns(self) -> Tuple:
+        """
+        Scores, anchors, half-lives as arrays; with NumPy also category
+        codes and the category -> code mapping.
+        """
+        if self._arrays is None:
+            if NUMPY_AVAILABLE:
+                # Integer codes: comparing them is much cheaper than strings
+                codes: Dict[str, int] = {}
+                self._arrays = (
+                    np.array(self._scores, dtype=np.float64),
+                    np.array(self._anchors, dtype=np.float64),
+                    np.array(self._half_lives, dtype=np.float64),
+                    np.array(
+                        [codes.setdefault(c, len(codes)) for c in self._categories],
+                        dtype=np.int32
+                    ),
+                    codes,
+                )
+            else:
+                self._arrays = (
+                    array('d', self._scores),
+                    array('d', self._anchors),
+                    array('d', self._half_lives),
+                )
+        return self._arrays
+
+    def decayed(self, now: Optional[float] = None) -> Sequence[float]:
+        """
+        Decay every row in one pass.
+
+        Args:
+            now: Epoch seconds to decay to (default: current time)
+
+        Returns:
+            Decayed scores aligned with ``keys`` (a NumPy array when
+            NumPy is available)
+        """
+        now = time.time() if now is None else now
+        scores, anchors, half_lives = self._columns()[:3]
+        if NUMPY_AVAILABLE:
+            ages = np.maximum(now - anchors, 0.0)
+            return scores * np.exp2(-ages / half_lives)
+        return array('d', (
+            score * 2.0 ** (-max(now - anchor, 0.0) / half_life)
+            for score, anchor, half_life in zip(scores, anchors, half_lives)
+        ))
+
+    def changed(
+        self,
+        min_change: float,
+        now: Optional[float] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Get rows whose decayed score dropped by at least ``min_change``.
+
+        Args:
+            min_change: Smallest drop to report
+            now: Epoch seconds to decay to (default: current time)
+
+        Returns:
+            (key, decayed score) pairs in slot order
+        """
+        decayed = self.decayed(now)
+        stored = self._columns()[0]
+        if NUMPY_AVAILABLE:
+            slots = np.flatnonzero(stored - decayed >= min_change)
+            return [(self._keys[slot], float(decayed[slot])) for slot in slots]
+        return [
+            (key, score)
+            for key, base, score in zip(self._keys, stored, decayed)
+            if base - score >= min_change
+        ]
+
+    def top(
+        self,
+        k: int,
+        category: Optional[str] = None,
+        min_relevance: float = 0.0,
+        now: Optional[float] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Get the rows with the highest decayed scores.
+
+        Args:
+            k: Number of rows
+            category: Restrict to a category
+            min_relevance: Minimum decayed score
+            now: Epoch seconds to decay to (default: current time)
+
+        Returns:
+            Up to k (key, decayed score) pairs, best first
+        """
+        decayed = self.decayed(now)
+        if not NUMPY_AVAILABLE:
+            rows = (
+                (score, key)
+                for key, row_category, score in zip(self._keys, self._categories, decayed)
+                if score >= min_relevance and (not category or row_category == category)
+            )
+            return [(key, score) for score, key in heapq.nlargest(k, rows)]
+
+        mask = decayed >= min_relevance
+        if category:
+            category_codes, codes = self._columns()[3:]
+            mask &= category_codes == codes.get(category, -1)
+        slots = np.flatnonzero(mask)
+        if len(slots) > k:
+            slots = slots[np.argpartition(-decayed[slots], k - 1)[:k]]
+        rows = [(float(decayed[slot]), self._keys[slot]) for slot in slots]
+        rows.sort(reverse=True)
+        return [(key, score) for score, key in rows]
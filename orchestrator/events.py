@@ -0,0 +1,130 @@
+"""
+Progress events for streamed workflow runs.
+
+``OrchestrationWorkflow.execute_stream()`` reports what happens while a
+run is in progress: phases starting and finishing, messages and tool
+calls from the orchestrator and its subagents, files they write, and
+the elapsed time and tokens so far. ``ProgressReporter`` turns SDK
+messages into ``WorkflowEvent`` objects and hands them to a callback.
+
+SDK messages are inspected by shape rather than type, so the reporter
+works with any SDK version (and with test doubles):
+
+- ``content`` as a string, or a list of blocks with ``text``: message
+- blocks with ``name`` and an ``input`` dict: tool call; file-writing
+  tools (``WRITE_TOOLS``) also produce a files_written event
+- ``usage`` dict (result messages): input and output tokens are added
+"""
+
+import time
+from typing import Any, Callable, Dict, Optional
+
+from .models import WorkflowEvent
+
+# File-writing tools and the input field holding the path
+WRITE_TOOLS: Dict[str, str] = {
+    "Write": "file_path",
+    "Edit": "file_path",
+    "MultiEdit": "file_path",
+    "NotebookEdit": "notebook_path",
+}
+
+# Message text kept per event; full responses can be very long
+MESSAGE_PREVIEW_CHARS = 500
+
+
+class ProgressReporter:
+    """
+    Builds progress events for one workflow run.
+
+    Example:
+        >>> reporter = ProgressReporter(queue.put_nowait)
+        >>> reporter.emit("phase_started", phase="intent")
+        >>> async for message in client.receive_response():
+        ...     reporter.observe(message, phase="intent")
+    """
+
+    def __init__(self, callback: Callable[[WorkflowEvent], None]):
+        """
+        Initialize the reporter; the elapsed time starts now.
+
+        Args:
+            callback: Receives every event, in order
+        """
+        self.callback = callback
+        self.tokens = 0
+        self._started = time.perf_counter()
+
+    def elapsed(self) -> float:
+        """Seconds since the reporter was created."""
+        return time.perf_counter() - self._started
+
+    def emit(self, kind: str, **fields: Any) -> WorkflowEvent:
+        """
+        Send an event with the current elapsed time and token count.
+
+        Args:
+            kind: Event kind (see ``WorkflowEvent.kind``)
+            **fields: Other ``WorkflowEvent`` fields
+
+        Returns:
+            The event sent
+        """
+        event = WorkflowEvent(
+            kind=kind,
+            elapsed_seconds=self.elapsed(),
+            tokens=self.tokens,
+            **fields
+        )
+        self.callback(event)
+        return event
+
+    def observe(
+        self,
+        message: Any,
+        phase: Optional[str] = None,
+        agent: Optional[str] = None
+    ) -> None:
+        """
+        Report an SDK message received during a phase.
+
+        Args:
+            message: Message from ``receive_response()``
+            phase: Phase or subagent task receiving it
+            agent: Subagent it comes from (None for the orchestrator)
+        """
+        usage = getattr(message, "usage", None)
+        if isinstance(usage, dict):
+            self.tokens += int(usage.get("input_tokens") or 0)
+            self.tokens += int(usage.get("output_tokens") or 0)
+
+        content = getattr(message, "content", None)
+        if isinstance(content, str):
+            blocks = []
+            texts = [content]
+        elif isinstance(content, list):
+            blocks = content
+            texts = []
+        else:
+            return
+
+        for block in blocks:
+            name = getattr(block, "name", None)
+            tool_input = getattr(block, "input", None)
+            if isinstance(name, str) and isinstance(tool_input, dict):
+                self.emit("tool_call", phase=phase, agent=agent, message=name, data=tool_input)
+                path = tool_input.get(WRITE_TOOLS.get(name, ""))
+                if path:
+                    self.emit("files_written", phase=phase, agent=agent, files=[str(path)])
+            elif isinstance(getattr(block, "text", None), str):
+                texts.append(block.text)
+
+        text = "\n".join(t for t in texts if t)
+        if text:
+            self.emit(
+                "subagent_message",
+                phase=phase,
+                agent=agent,
+                message=text[:MESSAGE_PREVIEW_CHARS],
+                data={"chars": len(text)}
+            )
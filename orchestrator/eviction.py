@@ -0,0 +1,167 @@
+"""
+Eviction policies for capacity-limited memory stores.
+
+MemoryManager can cap the number of memories per category. When a write
+pushes a category over its limit, the category's policy picks which
+memories to delete:
+
+- LRUPolicy: least recently accessed first
+- RelevancePolicy: lowest effective (decayed) relevance first
+- TTLPolicy: expired memories always, then the oldest first
+"""
+
+import heapq
+import math
+from abc import ABC, abstractmethod
+from typing import Dict, List, NamedTuple, Optional, Union
+
+from .decay import SECONDS_PER_DAY
+
+# Suggested limits for long-running orchestrators
+DEFAULT_LIMITS: Dict[str, int] = {
+    "architectural_decision": 1000,
+    "pattern": 2000,
+    "learned_preference": 1000,
+    "error_solution": 1000,
+    "integration_config": 500,
+}
+
+
+class Candidate(NamedTuple):
+    """A memory considered for eviction."""
+
+    key: str
+    created: float  # Epoch seconds of the entry timestamp
+    last_access: float  # Epoch seconds of the last read in this process
+    relevance: float  # Effective (decayed) relevance
+    size: int  # Approximate bytes reclaimed by deleting it
+
+
+class EvictionPolicy(ABC):
+    """Chooses which memories of an over-capacity category to delete."""
+
+    name = "base"
+
+    # Whether expired() can return keys, i.e. the policy must be checked
+    # even while a category is under its limit
+    expires = False
+
+    def expired(self, category: str, candidates: List[Candidate], now: float) -> List[str]:
+        """Keys to delete regardless of capacity (none by default)."""
+        return []
+
+    @abstractmethod
+    def victims(self, candidates: List[Candidate], count: int, now: float) -> List[str]:
+        """
+        Pick memories to delete.
+
+        Args:
+            candidates: Memories of one category
+            count: Number of memories to pick
+            now: Current epoch seconds
+
+        Returns:
+            Up to ``count`` keys
+        """
+
+
+class LRUPolicy(EvictionPolicy):
+    """
+    Evict the least recently accessed memories.
+
+    Access times are tracked per process; memories not read since the
+    process started count as accessed when they were last written.
+    """
+
+    name = "lru"
+
+    def victims(self, candidates: List[Candidate], count: int, now: float) -> List[str]:
+        """Pick the least recently accessed memories."""
+        chosen = heapq.nsmallest(count, candidates, key=lambda c: (c.last_access, c.key))
+        return [c.key for c in chosen]
+
+
+class RelevancePolicy(EvictionPolicy):
+    """Evict the memories with the lowest effective relevance."""
+
+    name = "relevance"
+
+    def victims(self, candidates: List[Candidate], count: int, now: float) -> List[str]:
+        """Pick the least relevant memories, least recently accessed first on ties."""
+        chosen = heapq.nsmallest(
+            count, candidates, key=lambda c: (c.relevance, c.last_access, c.key)
+        )
+        return [c.key for c in chosen]
+
+
+class TTLPolicy(EvictionPolicy):
+    """
+    Expire memories after a maximum age.
+
+    Expired memories are deleted even when the category is under its
+    limit; when a category is still over its limit, the oldest go first.
+
+    Example:
+        >>> policy = TTLPolicy(max_age_days={"error_solution": 30, "pattern": 365})
+    """
+
+    name = "ttl"
+    expires = True
+
+    def __init__(self, max_age_days: Union[float, Dict[str, float]]):
+        """
+        Initialize the TTL policy.
+
+        Args:
+            max_age_days: Maximum age in days, for every category or per
+                category (categories not listed never expire)
+        """
+        self.max_age_days = max_age_days
+
+    def max_age_seconds(self, category: str) -> float:
+        """Maximum age in seconds for a category (inf = never expires)."""
+        if isinstance(self.max_age_days, dict):
+            days: Optional[float] = self.max_age_days.get(category)
+        else:
+            days = self.max_age_days
+        return math.inf if days is None else days * SECONDS_PER_DAY
+
+    def expired(self, category: str, candidates: List[Candidate], now: float) -> List[str]:
+        """Keys older than the category's maximum age."""
+        cutoff = now - self.max_age_seconds(category)
+        return [c.key for c in candidates if c.created < cutoff]
+
+    def victims(self, candidates: List[Candidate], count: int, now: float) -> List[str]:
+        """Pick the oldest memories."""
+        chosen = heapq.nsmallest(count, candidates, key=lambda c: (c.created, c.key))
+        return [c.key for c in chosen]
+
+
+POLICIES = {
+    LRUPolicy.name: LRUPolicy,
+    RelevancePolicy.name: RelevancePolicy,
+}
+
+
+def create_policy(policy: Union[str, EvictionPolicy]) -> EvictionPolicy:
+    """
+    Resolve a policy name or instance.
+
+    Args:
+        policy: "lru", "relevance" or an EvictionPolicy instance
+            (TTLPolicy needs its maximum age, so pass an instance)
+
+    Returns:
+        Eviction policy
+
+    Raises:
+        ValueError: If the policy name is unknown
+    """
+    if isinstance(policy, EvictionPolicy):
+        return policy
+    if policy not in POLICIES:
+        raise ValueError(
+            f"Unknown eviction policy '{policy}'. "
+            f"Expected one of: {', '.join(POLICIES)} or an EvictionPolicy"
+        )
+    return POLICIES[policy]()
@@ -0,0 +1,239 @@
+"""
+Persistent, content-addressed cache of intent analyses.
+
+Retried jobs and repeated requests would otherwise pay a full model
+round-trip in intent analysis each time. The cache stores the resulting
+``AutomationIntent`` under a hash of everything the analysis depends on:
+the normalized request and additional context, the model, and the
+learned-memory context included in the prompt. A change in any of them
+gives a different key, so stale analyses are never returned.
+
+Each entry is one JSON file named by its key, replaced atomically, so
+several processes can share a cache directory. A file's modification
+time is its last use: hits touch it, and once the cache holds more than
+``max_entries`` files the least recently used are removed. Entries older
+than ``ttl_seconds`` are treated as misses and removed.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .models import AutomationIntent
+from .storage import write_atomic
+
+INTENT_CACHE_SIZE = 256  # Cached analyses kept per directory
+INTENT_CACHE_SECONDS = 7 * 24 * 3600.0  # Analyses expire after a week
+
+
+def normalize_request(text: Optional[str]) -> str:
+    """
+    Normalize request text so trivially different requests share a key.
+
+    Collapses whitespace, ignores case and strips trailing punctuation.
+
+    Example:
+        >>> normalize_request("  Process PDF\\n invoices. ")
+        'process pdf invoices'
+    """
+    if not text:
+        return ""
+    return " ".join(text.split()).casefold().rstrip(".!?;, ")
+
+
+class IntentCache:
+    """
+    Directory of cached ``AutomationIntent`` analyses.
+
+    Example:
+        >>> cache = IntentCache(Path(".claude/intent_cache"))
+        >>> key = cache.key("Process PDF invoices", model="sonnet")
+        >>> intent = cache.get(key)
+        >>> if intent is None:
+        ...     intent = await analyze(...)
+        ...     cache.put(key, intent)
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        max_entries: int = INTENT_CACHE_SIZE,
+        ttl_seconds: Optional[float] = INTENT_CACHE_SECONDS
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding one file per cached analysis
+                (created on first write)
+            max_entries: Analyses kept; the least recently used beyond
+                this are removed
+            ttl_seconds: Age after which an analysis is ignored and
+                removed (None = never)
+
+        Raises:
+            ValueError: If max_entries is less than 1
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.cache_dir = Path(cache_dir)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+
+        # Statistics
+        self._hits = 0
+        self._misses = 0
+        self._stores = 0
+        self._expired = 0
+        self._evictions = 0
+
+    @staticmethod
+    def key(
+        user_request: str,
+        additional_context: Optional[str] = None,
+        model: Optional[str] = None,
+        memory_context: Optional[str] = None
+    ) -> str:
+        """
+        Compute the cache key of an analysis.
+
+        Args:
+            user_request: User's automation request
+            additional_context: Optional additional context
+            model: Model that analyzes the request
+            memory_context: Learned-memory block included in the prompt
+
+        Returns:
+            Hex SHA-256 digest
+        """
+        payload = json.dumps(
+            [
+                normalize_request(user_request),
+                normalize_request(additional_context),
+                model or "",
+                memory_context or ""
+            ],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[AutomationIntent]:
+        """
+        Look up a cached analysis and mark it as recently used.
+
+        Args:
+            key: Key from ``key()``
+
+        Returns:
+            The cached intent, or None on a miss or expired entry
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            with self._lock:
+                self._misses += 1
+            return None
+
+        if self.ttl_seconds is not None and time.time() - cached["created_at"] > self.ttl_seconds:
+            self._remove(path)
+            with self._lock:
+                self._expired += 1
+                self._misses += 1
+            return None
+
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass  # Evicted by another process meanwhile; the copy read is valid
+        with self._lock:
+            self._hits += 1
+        return AutomationIntent(**cached["intent"])
+
+    def put(self, key: str, intent: AutomationIntent) -> None:
+        """
+        Store an analysis, evicting the least recently used if full.
+
+        Args:
+            key: Key from ``key()``
+            intent: Analysis to cache
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        payload = json.dumps(
+            {"created_at": time.time(), "intent": intent.model_dump(mode="json")},
+            ensure_ascii=False
+        ).encode('utf-8')
+        # Losing an entry in a crash only costs a model call
+        write_atomic(self._path(key), payload, fsync=False)
+        with self._lock:
+            self._stores += 1
+        self._evict()
+
+    def _evict(self) -> None:
+        """Remove the least recently used entries beyond max_entries."""
+        entries = []
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                entries.append((path.stat().st_mtime, path))
+            except FileNotFoundError:
+                continue
+        excess = len(entries) - self.max_entries
+        if excess <= 0:
+            return
+        entries.sort()
+        for _, path in entries[:excess]:
+            self._remove(path)
+        with self._lock:
+            self._evictions += excess
+
+    @staticmethod
+    def _remove(path: Path) -> None:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def clear(self) -> int:
+        """
+        Remove every cached analysis.
+
+        Returns:
+            Number of entries removed
+        """
+        removed = 0
+        for path in self.cache_dir.glob("*.json"):
+            self._remove(path)
+            removed += 1
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics for this process.
+
+        Returns:
+            Dictionary with hits, misses, hit rate, stores, expired and
+            evicted entries and the entries currently on disk
+        """
+        with self._lock:
+            total = self._hits + self._misses
+            stats = {
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": self._hits / total if total else 0.0,
+                "stores": self._stores,
+                "expired": self._expired,
+                "evictions": self._evictions
+            }
+        stats["entries"] = (
+            sum(1 for _ in self.cache_dir.glob("*.json")) if self.cache_dir.exists() else 0
+        )
+        return stats
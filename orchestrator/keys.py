@@ -0,0 +1,109 @@
+"""
+Collision-free, time-ordered memory keys.
+
+Keys are ULIDs: a 48-bit millisecond timestamp followed by 80 random
+bits, written as 26 Crockford base32 characters. They sort by creation
+time, so ``order_by="key"`` lists memories chronologically.
+
+Within a process, keys created in the same millisecond increment the
+random part instead of drawing a new one, so every key is strictly
+greater than the previous one. Across processes, the 80 random bits
+make collisions negligible. The random bits come from a generator seeded
+from ``os.urandom`` once per process; keys need to be unique, not secret.
+"""
+
+import os
+import random
+import threading
+import time
+
+CROCKFORD_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+ULID_LENGTH = 26
+RANDOM_BITS = 80
+
+
+def encode_ulid(value: int) -> str:
+    """Encode a 128-bit integer as 26 Crockford base32 characters."""
+    chars = []
+    for _ in range(ULID_LENGTH):
+        chars.append(CROCKFORD_ALPHABET[value & 0x1F])
+        value >>= 5
+    return "".join(reversed(chars))
+
+
+def ulid_timestamp(ulid: str) -> float:
+    """
+    Get the creation time of a ULID.
+
+    Args:
+        ulid: ULID, optionally after a ``prefix_``
+
+    Returns:
+        Epoch seconds (millisecond precision)
+    """
+    value = 0
+    for char in ulid.rsplit("_", 1)[-1]:
+        value = value << 5 | CROCKFORD_ALPHABET.index(char)
+    return (value >> RANDOM_BITS) / 1000.0
+
+
+class ULIDGenerator:
+    """
+    Thread-safe generator of strictly increasing ULIDs.
+
+    The state is reset in forked children so that a parent and its
+    child never continue the same sequence.
+    """
+
+    def __init__(self):
+        """Initialize the generator."""
+        self._lock = threading.Lock()
+        self._reset()
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self) -> None:
+        """Forget the last key and reseed."""
+        self._last_ms = -1
+        self._random = 0
+        self._rng = random.Random(os.urandom(16))
+
+    def new(self) -> str:
+        """Create a ULID greater than every ULID this generator created."""
+        with self._lock:
+            now_ms = time.time_ns() // 1_000_000
+            if now_ms > self._last_ms:
+                self._last_ms = now_ms
+                self._random = self._rng.getrandbits(RANDOM_BITS)
+            else:
+                # Same millisecond (or the clock went back): keep counting
+                self._random += 1
+                if self._random >> RANDOM_BITS:
+                    self._last_ms += 1
+                    self._random = 0
+            return encode_ulid(self._last_ms << RANDOM_BITS | self._random)
+
+
+_generator = ULIDGenerator()
+
+
+def new_ulid() -> str:
+    """Create a ULID (see ``ULIDGenerator``)."""
+    return _generator.new()
+
+
+def monotonic_key(prefix: str) -> str:
+    """
+    Create a memory key that never collides and sorts by creation time.
+
+    Args:
+        prefix: Key prefix, e.g. "arch"
+
+    Returns:
+        ``"<prefix>_<ULID>"``
+
+    Example:
+        >>> monotonic_key("arch")
+        'arch_01J9ZK3Q4V7M2X8N5R6T0W1YBC'
+    """
+    return f"{prefix}_{new_ulid()}"
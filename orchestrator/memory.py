@@ -5,55 +5,691 @@ This module handles persistent storage and retrieval of architectural
 decisions, patterns, and learned preferences across sessions.
 """
 
+import asyncio
+import functools
+import gzip
+import hashlib
+import heapq
 import json
+import re
+import textwrap
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import (
+    List, Optional, Dict, Any, Union, Iterator, AsyncIterator, Callable, Tuple
+)
 from datetime import datetime
+from .decay import DecayIndex, DecayModel, parse_timestamp
+from .eviction import Candidate, EvictionPolicy, create_policy
+from .keys import monotonic_key
 from .models import MemoryEntry
+from .retrieval import NUMPY_AVAILABLE, BM25Index, VectorIndex, term_frequencies, tokenize
+from .similarity import NEAR_DUPLICATE_DISTANCE, SimHashIndex, shingles, simhash
+from .snapshot import SNAPSHOT_FILE, SnapshotBackend, snapshot_version, write_snapshot
+from .storage import ORDER_FIELDS, MemoryBackend, create_backend
+
+
+# Export/import file formats
+EXPORT_FORMATS = ("json", "jsonl")
+DEDUPE_MODES = ("key", "content")
+RETRIEVAL_MODES = ("vector", "bm25")
+RANK_CANDIDATES = 256  # Best text matches blended with relevance per query
+
+# Index metadata limits
+PREVIEW_CHARS = 280
+MAX_KEYWORDS = 32
+CHARS_PER_TOKEN = 4  # Rough prompt-token estimate
+
+CONTEXT_HEADER = "RELEVANT PATTERNS FROM PREVIOUS PROJECTS:"
+# "(seen Nx)" suffix of merged memories in a context block
+OCCURRENCES_SUFFIX = re.compile(r" \(seen \d+x\)$", re.MULTILINE)
+CONTEXT_CACHE_SIZE = 128  # Formatted context blocks kept per manager
+# Cached blocks are rebuilt after this long even if no memory changed,
+# so that relevance decay is reflected
+CONTEXT_CACHE_SECONDS = 300.0
+ENTRY_CACHE_SIZE = 1024  # Parsed entries kept per manager (0 = off)
+
+# Eviction frees this fraction of a category's limit at once, so a full
+# category is not rescanned on every write
+EVICTION_HEADROOM = 0.1
+EXPIRY_CHECK_SECONDS = 60.0  # Minimum time between TTL sweeps of a category
+
+# Automatic snapshot rebuilds wait this long after a write, so a burst
+# of writes costs one rebuild
+SNAPSHOT_DELAY_SECONDS = 1.0
+
+WATCH_INTERVAL = 0.5  # Seconds between store version checks in watch()
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough number of prompt tokens in a text."""
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def strip_occurrences(context: str) -> str:
+    """
+    Remove the "(seen Nx)" counts from a context block.
+
+    What is left depends only on which memories were ranked and their
+    values, so it stays the same while merges raise the counts.
+    """
+    return OCCURRENCES_SUFFIX.sub("", context)
+
+
+def content_hash(value: str) -> str:
+    """Stable hash of a memory value, used for duplicate detection."""
+    return hashlib.blake2b(value.encode('utf-8'), digest_size=16).hexdigest()
 
 
 class MemoryManager:
     """
     Manages persistent memory for the orchestrator agent.
 
-    Memory is stored as JSON files in the /memories directory and
-    accessed via the memory tool during orchestration.
+    Memory is stored in the /memories directory through a pluggable
+    storage backend and accessed via the memory tool during orchestration.
+    The default "json" backend keeps one JSON file per entry; the
+    "sqlite" backend keeps everything in a single WAL-mode database.
+
+    Mutations can be grouped with ``batch()`` / ``abatch()`` so that the
+    backend is flushed once per batch instead of once per entry.
+
+    Each index row carries a value preview, a content hash, size counts
+    and keyword frequencies, so searches, context ranking and duplicate
+    checks are answered from the index. Entry bodies are only read when
+    a value does not fit in its preview.
+
+    Relevance decays with age at query time (see ``orchestrator.decay``);
+    ranking never rewrites entries, and ``materialize_decay()`` persists
+    the decayed scores in one batch.
+
+    With ``limits``, each category holds a bounded number of memories:
+    writes that push a category over its limit evict memories chosen by
+    the category's policy (see ``orchestrator.eviction``).
+
+    With ``merge_distance``, a write under a new key whose value
+    duplicates a memory of the same category (same content hash, or
+    SimHash within ``merge_distance`` bits; see
+    ``orchestrator.similarity``) is merged into that memory, raising
+    its ``occurrences``, instead of being stored. ``consolidate_memories()``
+    merges the duplicates already stored.
+
+    Worker processes that only read can skip loading the store:
+    ``write_snapshot()`` packs it into a memory-mapped file (see
+    ``orchestrator.snapshot``) that ``MemoryManager.open_snapshot()``
+    serves read-only.
     """
 
-    def __init__(self, memory_dir: Path = Path(".claude/memories")):
+    def __init__(
+        self,
+        memory_dir: Path = Path(".claude/memories"),
+        backend: Union[str, MemoryBackend] = "json",
+        decay: Optional[DecayModel] = None,
+        limits: Optional[Dict[str, int]] = None,
+        eviction: Union[str, EvictionPolicy, Dict[str, Union[str, EvictionPolicy]]] = "relevance",
+        merge_distance: Optional[int] = None,
+        retrieval: Optional[str] = None,
+        entry_cache_size: int = ENTRY_CACHE_SIZE,
+        snapshot: bool = False,
+        snapshot_delay: float = SNAPSHOT_DELAY_SECONDS
+    ):
         """
         Initialize memory manager.
 
         Args:
             memory_dir: Directory for storing memory files
+            backend: Backend name ("json" or "sqlite") or a backend instance
+            decay: Relevance decay model (default: DEFAULT_HALF_LIVES)
+            limits: Maximum number of memories per category (None = unbounded;
+                see ``eviction.DEFAULT_LIMITS``)
+            eviction: Eviction policy ("lru", "relevance" or an instance such
+                as ``TTLPolicy``), or a mapping of category to policy
+            merge_distance: Merge new memories into near-duplicates up to this
+                SimHash distance in bits (None = off, 0 = identical terms only;
+                see ``similarity.NEAR_DUPLICATE_DISTANCE``)
+            retrieval: How ``rank_memories`` matches text: "vector" (hashed
+                TF-IDF cosine similarity, needs NumPy) or "bm25" (default:
+                "vector" when NumPy is installed)
+            entry_cache_size: Number of parsed entries kept in memory for
+                ``retrieve_memory`` and searches (0 = always read storage)
+            snapshot: Rewrite the worker snapshot (see ``write_snapshot``)
+                in the background after writes, and on ``close()``
+            snapshot_delay: Seconds between a write and the snapshot
+                rewrite; writes meanwhile share the rewrite
+
+        Raises:
+            ValueError: If the retrieval mode is unknown
         """
+        if retrieval is None:
+            retrieval = "vector" if NUMPY_AVAILABLE else "bm25"
+        if retrieval not in RETRIEVAL_MODES:
+            raise ValueError(
+                f"Unknown retrieval mode '{retrieval}'. "
+                f"Expected one of: {', '.join(RETRIEVAL_MODES)}"
+            )
+        self.retrieval = retrieval
+
         self.memory_dir = memory_dir
-        self.memory_dir.mkdir(parents=True, exist_ok=True)
-        self.index_file = self.memory_dir / "index.json"
-        self._ensure_index()
+        if isinstance(backend, str):
+            self.memory_dir.mkdir(parents=True, exist_ok=True)
+            backend = create_backend(backend, self.memory_dir)
+        elif not backend.read_only:
+            self.memory_dir.mkdir(parents=True, exist_ok=True)
+        self.backend = backend
+
+        # Worker snapshot regeneration
+        self._snapshot = snapshot
+        self._snapshot_delay = snapshot_delay
+        self._snapshot_lock = threading.RLock()
+        self._snapshot_timer: Optional[threading.Timer] = None
+        self._closed = False
+
+        # Write batching state
+        self._batch_lock = threading.RLock()
+        self._batch_depth = 0
+        self._batch_ops: Dict[str, Dict[str, Any]] = {}  # Last operation per key
+        self._flushing: Dict[str, Dict[str, Any]] = {}  # Operations being applied
+        self._batches = 0
+        self._operations = 0
+        self._merges = 0
+
+        # Text index over memory values (vectors or BM25), content-hash
+        # lookup and decay columns, all synced from the backend index
+        self._text_lock = threading.Lock()
+        self._decay_index = DecayIndex(decay or DecayModel())
+        self._text_index = VectorIndex() if retrieval == "vector" else BM25Index()
+        self._hash_index: Dict[str, Dict[str, None]] = {}  # Hash -> keys
+        self._text_indexed: Dict[str, Dict[str, Any]] = {}  # Key -> indexed metadata
+        self._key_hashes: Dict[str, str] = {}  # Key -> indexed content hash
+        self._category_keys: Dict[str, Dict[str, None]] = {}  # Category -> keys
+        self._merge_distance = merge_distance
+        self._simhash_index = SimHashIndex(
+            merge_distance if merge_distance is not None else NEAR_DUPLICATE_DISTANCE
+        )
+        self._text_generation = -1
+
+        # Capacity limits and eviction
+        self._limits = dict(limits or {})
+        if isinstance(eviction, dict):
+            self._default_policy = create_policy("relevance")
+            self._policies = {c: create_policy(p) for c, p in eviction.items()}
+        else:
+            self._default_policy = create_policy(eviction)
+            self._policies = {}
+        self._evict_lock = threading.RLock()
+        self._evict_pending: Dict[str, None] = {}  # Categories written in a batch
+        self._expiry_checked: Dict[str, float] = {}
+        self._access: Dict[str, float] = {}  # Key -> last read (this process)
+        self._evictions: Dict[str, int] = {}
+        self._bytes_reclaimed = 0
+
+        # Formatted context blocks: (text, top_k, max_tokens) ->
+        # (store version, built at, block, memory keys)
+        self._context_lock = threading.Lock()
+        self._context_cache: "OrderedDict[Tuple, Tuple[int, float, str, List[str]]]" = OrderedDict()
+        self._context_hits = 0
+        self._context_misses = 0
+
+        # Parsed entries, least recently used first: key -> (index
+        # metadata the entry was resolved from, entry)
+        self._entry_lock = threading.Lock()
+        self._entry_cache: "OrderedDict[str, Tuple[Dict[str, Any], MemoryEntry]]" = OrderedDict()
+        self._entry_cache_size = entry_cache_size
+        self._entry_generation = self.backend.generation
+        self._entry_hits = 0
+        self._entry_misses = 0
+
+    @classmethod
+    def open_snapshot(
+        cls,
+        memory_dir: Path = Path(".claude/memories"),
+        **kwargs
+    ) -> "MemoryManager":
+        """
+        Open a read-only manager over the store's mapped snapshot.
+
+        Meant for worker processes: nothing is created or parsed on open,
+        and the snapshot is remapped when a writer regenerates it. All
+        read APIs work as usual; writes raise ``RuntimeError``.
+
+        Args:
+            memory_dir: Memory directory holding the snapshot
+            **kwargs: Other ``MemoryManager`` options (decay, retrieval, ...)
+
+        Returns:
+            Read-only memory manager
+
+        Raises:
+            FileNotFoundError: If no snapshot was written yet
+
+        Example:
+            >>> memory = MemoryManager.open_snapshot(Path(".claude/memories"))
+            >>> context = memory.get_relevant_context("api", query=request)
+        """
+        return cls(memory_dir, backend=SnapshotBackend(memory_dir / SNAPSHOT_FILE), **kwargs)
+
+    def write_snapshot(self, path: Optional[Path] = None, force: bool = False) -> bool:
+        """
+        Regenerate the read-only snapshot served to worker processes.
+
+        The snapshot is only rewritten when the store version (see
+        ``version()``) differs from the one recorded in the snapshot, so
+        it is cheap to call after every orchestration run, from any
+        process.
+
+        Args:
+            path: Snapshot file (default: ``<memory_dir>/memories.snap``)
+            force: Rewrite even if the store is unchanged
+
+        Returns:
+            True if the snapshot was written
+
+        Example:
+            >>> with manager.batch():
+            ...     manager.store_pattern("retry", "Retry with backoff")
+            >>> manager.write_snapshot()
+            True
+        """
+        path = path or self.memory_dir / SNAPSHOT_FILE
+        with self._snapshot_lock:
+            version = self.backend.version()
+            if not force and snapshot_version(path) == version:
+                return False
+            write_snapshot(self.backend, path, version=version)
+            return True
+
+    def version(self) -> int:
+        """
+        Get the store version.
+
+        The version increases with every committed mutation, by this or
+        any other process sharing the memory directory, and reading it
+        costs a few bytes of I/O instead of an index load. Buffered batch
+        writes count once flushed.
+
+        Returns:
+            Current store version (0 for a new store)
+
+        Example:
+            >>> seen = manager.version()
+            >>> ...
+            >>> if manager.version() != seen:
+            ...     refresh_caches()
+        """
+        return self.backend.version()
+
+    async def watch(self, interval: float = WATCH_INTERVAL) -> AsyncIterator[int]:
+        """
+        Yield the store version each time it changes.
+
+        Polls ``version()`` every ``interval`` seconds, so a long-running
+        worker can refresh what it derived from the store only when
+        another process (or this one) modified it.
+
+        Args:
+            interval: Seconds between checks
 
-    def _ensure_index(self) -> None:
-        """Ensure the memory index file exists."""
-        if not self.index_file.exists():
-            self._save_index({})
+        Yields:
+            Each new store version
+
+        Example:
+            >>> async for version in manager.watch():
+            ...     context = manager.get_relevant_context("api", query=request)
+        """
+        seen = self.version()
+        while True:
+            await asyncio.sleep(interval)
+            current = self.version()
+            if current != seen:
+                seen = current
+                yield current
 
     def _load_index(self) -> Dict[str, Any]:
         """Load the memory index."""
-        with open(self.index_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return self.backend.load_index()
 
-    def _save_index(self, index: Dict[str, Any]) -> None:
-        """Save the memory index."""
-        with open(self.index_file, 'w', encoding='utf-8') as f:
-            json.dump(index, f, indent=2, ensure_ascii=False)
+    @staticmethod
+    def _build_metadata(entry: MemoryEntry) -> Dict[str, Any]:
+        """Build the index metadata for an entry."""
+        terms = tokenize(entry.value)
+        frequencies = term_frequencies(terms)
+        keywords = dict(heapq.nlargest(
+            MAX_KEYWORDS,
+            frequencies.items(),
+            key=lambda item: (item[1], item[0])
+        ))
+        return {
+            "category": entry.category,
+            "timestamp": entry.timestamp,
+            "relevance_score": entry.relevance_score,
+            "decayed_at": entry.decayed_at,
+            "occurrences": entry.occurrences,
+            "preview": entry.value[:PREVIEW_CHARS],
+            "content_hash": content_hash(entry.value),
+            "simhash": f"{simhash(shingles(terms)):016x}",
+            "chars": len(entry.value),
+            "bytes": len(entry.model_dump_json().encode('utf-8')),
+            "tokens": estimate_tokens(entry.value),
+            "terms": len(terms),
+            "keywords": keywords
+        }
+
+    @staticmethod
+    def _entry_from_index(
+        key: str,
+        metadata: Dict[str, Any]
+    ) -> Optional[MemoryEntry]:
+        """Build an entry from index metadata when the preview is complete."""
+        if "preview" not in metadata or metadata.get("chars", -1) > len(metadata["preview"]):
+            return None
+        return MemoryEntry(
+            key=key,
+            value=metadata["preview"],
+            category=metadata["category"],
+            timestamp=metadata["timestamp"],
+            relevance_score=metadata["relevance_score"],
+            decayed_at=metadata.get("decayed_at"),
+            occurrences=metadata.get("occurrences", 1)
+        )
+
+    def _read_entry(
+        self,
+        key: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Optional[MemoryEntry]:
+        """Read and validate a full entry from the backend."""
+        data = self.backend.read_entry(key, metadata)
+        return MemoryEntry(**data) if data else None
 
-    def store_memory(self, entry: MemoryEntry) -> None:
+    def _resolve_entry(
+        self,
+        key: str,
+        metadata: Optional[Dict[str, Any]],
+        cache: bool = True
+    ) -> Optional[MemoryEntry]:
+        """
+        Get an entry from the entry cache, the index or storage.
+
+        Args:
+            key: Memory key
+            metadata: The key's current index metadata
+            cache: Whether to use the entry cache (off for full scans,
+                which would push out every hot entry)
+
+        Returns:
+            A copy the caller may modify, or None if not found
+        """
+        cache = cache and metadata is not None and self._entry_cache_size > 0
+        if cache:
+            with self._entry_lock:
+                self._expire_entries()
+                generation = self._entry_generation
+                cached = self._entry_cache.get(key)
+                # A write replaces the key's metadata, so a cached entry
+                # is current while the metadata is the same dict (JSON
+                # index) or an equal one (backends that build rows per query)
+                if cached is not None and (cached[0] is metadata or cached[0] == metadata):
+                    self._entry_cache.move_to_end(key)
+                    self._entry_hits += 1
+                    return cached[1].model_copy()
+                self._entry_misses += 1
+
+        entry = None
+        if metadata is not None:
+            entry = self._entry_from_index(key, metadata)
+        if entry is None:
+            entry = self._read_entry(key, metadata)
+
+        if cache and entry is not None:
+            with self._entry_lock:
+                self._expire_entries()
+                # Skip if the store changed while reading
+                if self._entry_generation == generation:
+                    self._entry_cache[key] = (metadata, entry.model_copy())
+                    self._entry_cache.move_to_end(key)
+                    while len(self._entry_cache) > self._entry_cache_size:
+                        self._entry_cache.popitem(last=False)
+        return entry
+
+    def _expire_entries(self) -> None:
+        """
+        Drop cached entries changed since the last check, including by
+        other processes. Call with ``_entry_lock`` held.
+        """
+        generation = self.backend.generation
+        if generation == self._entry_generation:
+            return
+        changed = self.backend.changes_since(self._entry_generation)
+        if changed is None:
+            self._entry_cache.clear()
+        else:
+            for key in changed:
+                self._entry_cache.pop(key, None)
+        self._entry_generation = generation
+
+    def _forget_entry(self, key: str) -> None:
+        """Drop a key from the entry cache before it is written."""
+        with self._entry_lock:
+            self._entry_cache.pop(key, None)
+
+    def count_memories(self) -> int:
+        """Get the number of stored (flushed) memories."""
+        return len(self._load_index())
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """
+        Get index cache statistics.
+
+        Returns:
+            Dictionary with hits, misses and hit rate of the index cache,
+            plus hits and misses of the context block cache and of the
+            parsed entry cache
+
+        Example:
+            >>> stats = manager.cache_stats()
+            >>> print(f"Index hit rate: {stats['hit_rate']:.0%}")
+        """
+        entry_lookups = self._entry_hits + self._entry_misses
+        return {
+            **self.backend.stats(),
+            "context_hits": self._context_hits,
+            "context_misses": self._context_misses,
+            "entry_hits": self._entry_hits,
+            "entry_misses": self._entry_misses,
+            "entry_hit_rate": self._entry_hits / entry_lookups if entry_lookups else 0.0,
+            "cached_entries": len(self._entry_cache)
+        }
+
+    def write_stats(self) -> Dict[str, Any]:
+        """
+        Get write statistics.
+
+        Returns:
+            Dictionary with the number of mutations, flushed batches,
+            writes merged into near-duplicates, backend flushes and
+            bytes written
+
+        Example:
+            >>> with manager.batch():
+            ...     for pattern in patterns:
+            ...         manager.store_memory(pattern)
+            >>> print(manager.write_stats()["flushes"])
+        """
+        backend_stats = self.backend.stats()
+        return {
+            "operations": self._operations,
+            "batches": self._batches,
+            "merges": self._merges,
+            "flushes": backend_stats.get("flushes", 0),
+            "bytes_written": backend_stats.get("bytes_written", 0)
+        }
+
+    def close(self) -> None:
+        """
+        Release resources held by the storage backend.
+
+        With ``snapshot`` enabled, a pending snapshot rewrite is done now.
+        """
+        if self._snapshot:
+            with self._batch_lock:
+                timer, self._snapshot_timer = self._snapshot_timer, None
+            if timer is not None:
+                timer.cancel()
+            self.write_snapshot()
+        with self._snapshot_lock:  # Not while a scheduled rewrite runs
+            self._closed = True
+            self.backend.close()
+
+    def _submit(self, key: str, operation: Dict[str, Any]) -> bool:
+        """
+        Apply a mutation now, or buffer it if a batch is open.
+
+        Returns:
+            False only for an unbuffered delete of a missing key
+        """
+        self._forget_entry(key)
+        with self._batch_lock:
+            self._operations += 1
+            if self._batch_depth:
+                # Keep only the latest operation per key, in submission order
+                self._batch_ops.pop(key, None)
+                self._batch_ops[key] = operation
+                return True
+
+        if operation["op"] == "put":
+            self.backend.write_entry(operation["entry"], operation["metadata"])
+            changed = True
+        else:
+            changed = self.backend.delete_entry(key)
+        if changed and self._snapshot:
+            self._schedule_snapshot()
+        return changed
+
+    def _buffered(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get the not-yet-flushed operation for a key, if any."""
+        with self._batch_lock:
+            return self._batch_ops.get(key) or self._flushing.get(key)
+
+    def _begin_batch(self) -> None:
+        """Open a (possibly nested) batch."""
+        with self._batch_lock:
+            self._batch_depth += 1
+
+    def _end_batch(self) -> List[Dict[str, Any]]:
+        """
+        Close a batch.
+
+        Returns:
+            Operations to flush (only when the outermost batch closes)
+        """
+        with self._batch_lock:
+            self._batch_depth -= 1
+            if self._batch_depth or not self._batch_ops:
+                return []
+
+            operations = list(self._batch_ops.values())
+            self._flushing.update(self._batch_ops)
+            self._batch_ops = {}
+            self._batches += 1
+            return operations
+
+    def _flush(self, operations: List[Dict[str, Any]]) -> None:
+        """Apply buffered operations to the backend in one flush."""
+        try:
+            self.backend.apply_batch(operations)
+        finally:
+            with self._batch_lock:
+                for operation in operations:
+                    if self._flushing.get(operation["key"]) is operation:
+                        del self._flushing[operation["key"]]
+                categories = list(self._evict_pending)
+                self._evict_pending = {}
+
+        if categories:
+            self.enforce_limits(categories)
+        if self._snapshot:
+            self._schedule_snapshot()
+
+    def _schedule_snapshot(self) -> None:
+        """Rewrite the snapshot ``snapshot_delay`` from now, unless pending."""
+        with self._batch_lock:
+            if self._snapshot_timer is not None:
+                return
+            self._snapshot_timer = threading.Timer(self._snapshot_delay, self._scheduled_snapshot)
+            self._snapshot_timer.name = "memory-snapshot"
+            self._snapshot_timer.daemon = True
+            self._snapshot_timer.start()
+
+    def _scheduled_snapshot(self) -> None:
+        with self._batch_lock:
+            self._snapshot_timer = None
+        with self._snapshot_lock:
+            if not self._closed:
+                self.write_snapshot()
+
+    @contextmanager
+    def batch(self) -> Iterator["MemoryManager"]:
+        """
+        Buffer mutations and flush them once on exit.
+
+        ``store_memory``, ``update_relevance`` and ``delete_memory`` calls
+        inside the block are buffered, keeping only the last operation per
+        key. ``retrieve_memory`` sees buffered changes; searches only see
+        flushed entries. Nested batches flush when the outermost one exits,
+        including when the block raises.
+
+        Example:
+            >>> with manager.batch():
+            ...     manager.store_pattern("retry", "Retry with backoff")
+            ...     manager.store_pattern("logging", "Use structured logs")
+        """
+        self._begin_batch()
+        try:
+            yield self
+        finally:
+            operations = self._end_batch()
+            if operations:
+                self._flush(operations)
+
+    @asynccontextmanager
+    async def abatch(self) -> AsyncIterator["MemoryManager"]:
+        """
+        Async equivalent of ``batch()``.
+
+        The final flush runs in the default executor so it does not block
+        the event loop.
+
+        Example:
+            >>> async with manager.abatch():
+            ...     await run_tools_that_store_memories()
+        """
+        self._begin_batch()
+        try:
+            yield self
+        finally:
+            operations = self._end_batch()
+            if operations:
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(None, self._flush, operations)
+
+    def store_memory(self, entry: MemoryEntry) -> str:
         """
         Store a memory entry.
 
+        With ``merge_distance`` set, an entry under a new key that
+        duplicates a stored memory of its category is merged into it:
+        the stored memory keeps its key and value, adds the entry's
+        ``occurrences`` and takes the higher relevance.
+
         Args:
             entry: Memory entry to store
 
+        Returns:
+            Key the entry was stored or merged under
+
         Example:
             >>> memory = MemoryEntry(
             ...     key="api_pattern_rest",
@@ -62,26 +698,37 @@ class MemoryManager:
             ...     timestamp=datetime.now().isoformat()
             ... )
             >>> manager.store_memory(memory)
+            'api_pattern_rest'
         """
-        # Update index
-        index = self._load_index()
-        index[entry.key] = {
-            "category": entry.category,
-            "timestamp": entry.timestamp,
-            "relevance_score": entry.relevance_score,
-            "file": f"{entry.key}.json"
-        }
-        self._save_index(index)
+        return self._store(entry, self._build_metadata(entry))
 
-        # Store full entry
-        entry_file = self.memory_dir / f"{entry.key}.json"
-        with open(entry_file, 'w', encoding='utf-8') as f:
-            json.dump(entry.model_dump(), f, indent=2, ensure_ascii=False)
+    def _store(self, entry: MemoryEntry, metadata: Dict[str, Any]) -> str:
+        """Write an entry, merging it into a stored duplicate if enabled."""
+        if self._merge_distance is not None and not self._exists(entry.key):
+            duplicate = self._find_duplicate(entry.key, metadata)
+            if duplicate is not None:
+                return self._merge_into(duplicate, entry)
+        return self._put(entry, metadata)
+
+    def _put(self, entry: MemoryEntry, metadata: Dict[str, Any]) -> str:
+        """Write an entry as is."""
+        self._submit(entry.key, {
+            "op": "put",
+            "key": entry.key,
+            "entry": entry.model_dump(),
+            "metadata": metadata
+        })
+        self._after_put(entry.category)
+        return entry.key
 
     def retrieve_memory(self, key: str) -> Optional[MemoryEntry]:
         """
         Retrieve a specific memory by key.
 
+        Recently read entries come from an in-memory LRU cache (see
+        ``entry_cache_size``) until the memory is written, here or by
+        another process.
+
         Args:
             key: Memory key
 
@@ -93,56 +740,113 @@ class MemoryManager:
             >>> if memory:
             ...     print(memory.value)
         """
-        index = self._load_index()
-        if key not in index:
-            return None
+        buffered = self._buffered(key)
+        if buffered is not None:
+            if buffered["op"] == "delete":
+                return None
+            return MemoryEntry(**buffered["entry"])
 
-        entry_file = self.memory_dir / index[key]["file"]
-        if not entry_file.exists():
+        metadata = self._load_index().get(key)
+        if metadata is None:
             return None
-
-        with open(entry_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            return MemoryEntry(**data)
+        self._access[key] = time.time()
+        return self._resolve_entry(key, metadata)
 
     def search_memories(
         self,
         category: Optional[str] = None,
-        min_relevance: float = 0.0
+        min_relevance: float = 0.0,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        order_by: str = "relevance",
+        descending: bool = True
     ) -> List[MemoryEntry]:
         """
         Search memories by category and relevance.
 
+        Matching and ordering use only the index, so entry bodies are
+        loaded just for the page that is returned.
+
         Args:
             category: Filter by category (None = all categories)
             min_relevance: Minimum relevance score
+            limit: Maximum number of entries (None = all)
+            offset: Number of leading matches to skip
+            order_by: "relevance", "timestamp" or "key"
+            descending: Sort order (default: highest/newest first)
 
         Returns:
             List of matching memory entries
 
+        Raises:
+            ValueError: If order_by is not a supported ordering
+
         Example:
             >>> decisions = manager.search_memories(
             ...     category="architectural_decision",
-            ...     min_relevance=0.8
+            ...     min_relevance=0.8,
+            ...     limit=5
             ... )
         """
-        index = self._load_index()
+        if order_by not in ORDER_FIELDS:
+            raise ValueError(
+                f"Unknown order_by '{order_by}'. "
+                f"Expected one of: {', '.join(ORDER_FIELDS)}"
+            )
+
         results = []
+        rows = self.backend.query(
+            category,
+            min_relevance,
+            order_by=order_by,
+            descending=descending,
+            limit=limit,
+            offset=offset
+        )
+        now = time.time()
+        for key, metadata in rows:
+            entry = self._resolve_entry(key, metadata)
+            if entry:
+                self._access[key] = now
+                results.append(entry)
+
+        return results
+
+    def iter_memories(
+        self,
+        category: Optional[str] = None,
+        min_relevance: float = 0.0
+    ) -> Iterator[MemoryEntry]:
+        """
+        Lazily iterate over memories, in storage order.
 
-        for key, metadata in index.items():
+        Entries are loaded one at a time, so scans and exports of large
+        stores never hold more than one entry body in memory.
+
+        Args:
+            category: Filter by category (None = all categories)
+            min_relevance: Minimum relevance score
+
+        Yields:
+            Matching memory entries
+
+        Example:
+            >>> for entry in manager.iter_memories(category="pattern"):
+            ...     print(entry.key)
+        """
+        if category is None and min_relevance <= 0.0:
+            for data in self.backend.iter_entries():
+                yield MemoryEntry(**data)
+            return
+
+        for key, metadata in list(self._load_index().items()):
             if category and metadata["category"] != category:
                 continue
-
             if metadata["relevance_score"] < min_relevance:
                 continue
-
-            entry = self.retrieve_memory(key)
+            entry = self._resolve_entry(key, metadata, cache=False)
             if entry:
-                results.append(entry)
-
-        # Sort by relevance score (highest first)
-        results.sort(key=lambda e: e.relevance_score, reverse=True)
-        return results
+                yield entry
 
     def update_relevance(self, key: str, new_score: float) -> bool:
         """
@@ -156,7 +860,7 @@ class MemoryManager:
             True if updated, False if not found
 
         Example:
-            >>> # Decay old memories
+            >>> # Demote a memory; it keeps decaying from now on
             >>> manager.update_relevance("old_pattern", 0.5)
         """
         entry = self.retrieve_memory(key)
@@ -164,6 +868,7 @@ class MemoryManager:
             return False
 
         entry.relevance_score = max(0.0, min(1.0, new_score))
+        entry.decayed_at = datetime.now().isoformat()
         self.store_memory(entry)
         return True
 
@@ -177,91 +882,673 @@ class MemoryManager:
         Returns:
             True if deleted, False if not found
         """
-        index = self._load_index()
-        if key not in index:
-            return False
+        with self._batch_lock:
+            if not self._batch_depth:
+                return self._submit(key, {"op": "delete", "key": key})
 
-        # Remove from index
-        metadata = index.pop(key)
-        self._save_index(index)
+            exists = self._exists(key)
+            if exists:
+                self._submit(key, {"op": "delete", "key": key})
+            return exists
 
-        # Delete file
-        entry_file = self.memory_dir / metadata["file"]
-        if entry_file.exists():
-            entry_file.unlink()
+    def _exists(self, key: str) -> bool:
+        """Whether a key is stored, counting buffered writes."""
+        buffered = self._buffered(key)
+        if buffered is not None:
+            return buffered["op"] == "put"
+        return key in self._load_index()
 
-        return True
+    def _sync_indexes(self) -> Dict[str, Any]:
+        """
+        Bring the inverted index, hash lookup, decay columns and category
+        membership in line with the index.
+
+        Only keys reported by ``backend.changes_since()`` are revisited;
+        the whole index is rescanned when the backend cannot tell (first
+        sync or after a full reload), skipping rows whose metadata is
+        unchanged. Terms come from the keywords stored in the index; only
+        rows that predate keyword tracking need their entry read.
+
+        Returns:
+            The current backend index
+        """
+        with self._text_lock:
+            index = self._load_index()
+            generation = self.backend.generation
+            if generation == self._text_generation:
+                return index
+
+            changed = None
+            if self._text_generation >= 0:
+                changed = self.backend.changes_since(self._text_generation)
+
+            if changed is None:
+                for key in [k for k in self._text_indexed if k not in index]:
+                    self._unindex(key)
+                    self._access.pop(key, None)
+                rows = list(index.items())
+            else:
+                rows = [(key, index.get(key)) for key in dict.fromkeys(changed)]
+
+            for key, metadata in rows:
+                if metadata is None:
+                    self._unindex(key)
+                    self._access.pop(key, None)
+                elif self._text_indexed.get(key) is not metadata:
+                    self._index_row(key, metadata)
+
+            self._text_generation = generation
+            return index
+
+    def _index_row(self, key: str, metadata: Dict[str, Any]) -> None:
+        """(Re)index one row in the derived indexes."""
+        self._unindex(key)
+
+        if "keywords" in metadata:
+            self._text_index.add_terms(
+                key, metadata["keywords"], length=metadata["terms"]
+            )
+            digest = metadata["content_hash"]
+            if "simhash" in metadata:
+                fingerprint = int(metadata["simhash"], 16)
+            else:
+                fingerprint = simhash(metadata["keywords"])
+        else:
+            # Index rows written before keywords were tracked
+            entry = self.backend.read_entry(key, metadata)
+            if entry is None:
+                return
+            self._text_index.add(key, entry["value"])
+            digest = content_hash(entry["value"])
+            fingerprint = simhash(shingles(tokenize(entry["value"])))
+
+        self._hash_index.setdefault(digest, {})[key] = None
+        self._key_hashes[key] = digest
+        self._decay_index.add(
+            key,
+            metadata["category"],
+            metadata["relevance_score"],
+            metadata.get("decayed_at") or metadata["timestamp"]
+        )
+        self._category_keys.setdefault(metadata["category"], {})[key] = None
+        self._simhash_index.add(key, fingerprint)
+        self._text_indexed[key] = metadata
+
+    def _unindex(self, key: str) -> None:
+        """Remove a key from the derived indexes."""
+        metadata = self._text_indexed.pop(key, None)
+        if metadata is None:
+            return
+
+        self._text_index.remove(key)
+        self._decay_index.remove(key)
+        self._simhash_index.remove(key)
+        self._category_keys[metadata["category"]].pop(key, None)
+        digest = self._key_hashes.pop(key)
+        keys = self._hash_index[digest]
+        del keys[key]
+        if not keys:
+            del self._hash_index[digest]
+
+    def _policy(self, category: str) -> EvictionPolicy:
+        """Get the eviction policy of a category."""
+        return self._policies.get(category, self._default_policy)
+
+    def _after_put(self, category: str) -> None:
+        """Enforce the category's limit now, or when the open batch flushes."""
+        if category not in self._limits and not self._policy(category).expires:
+            return
+        with self._batch_lock:
+            if self._batch_depth:
+                self._evict_pending[category] = None
+                return
+        self.enforce_limits([category])
+
+    def _candidate(self, key: str, now: float) -> Candidate:
+        """Describe an indexed memory for the eviction policies."""
+        metadata = self._text_indexed[key]
+        created = parse_timestamp(metadata["timestamp"])
+        # Not read by this process: fall back to the last write
+        last_access = self._access.get(key) or parse_timestamp(
+            metadata.get("decayed_at") or metadata["timestamp"]
+        )
+        return Candidate(
+            key=key,
+            created=created,
+            last_access=last_access,
+            relevance=self._decay_index.score(key, now),
+            size=metadata.get("bytes", metadata.get("chars", 0))
+        )
+
+    def enforce_limits(self, categories: Optional[List[str]] = None) -> int:
+        """
+        Evict memories from categories over their limit, and expired ones.
+
+        Called automatically after writes (after the flush when batching).
+        A category over its limit is trimmed to ``EVICTION_HEADROOM`` below
+        it; expiring policies are checked at most every
+        ``EXPIRY_CHECK_SECONDS`` per category unless ``categories`` is None.
+
+        Args:
+            categories: Categories to check (None = all, including TTL sweeps)
+
+        Returns:
+            Number of evicted memories
+
+        Example:
+            >>> manager = MemoryManager(limits={"pattern": 500}, eviction="lru")
+            >>> manager.enforce_limits()  # e.g. after lowering a limit
+            0
+        """
+        sweep = categories is None
+        now = time.time()
+        self._sync_indexes()
+
+        with self._evict_lock:
+            if sweep:
+                categories = list(dict.fromkeys([*self._limits, *self._category_keys]))
+
+            victims: Dict[str, Tuple[str, Candidate]] = {}  # Key -> (category, candidate)
+            for category in categories:
+                policy = self._policy(category)
+                limit = self._limits.get(category)
+                with self._text_lock:
+                    keys = list(self._category_keys.get(category, ()))
+                    check_expiry = policy.expires and (
+                        sweep
+                        or now - self._expiry_checked.get(category, 0.0) >= EXPIRY_CHECK_SECONDS
+                    )
+                    over = limit is not None and len(keys) > limit
+                    if not (over or check_expiry):
+                        continue
+                    candidates = [self._candidate(key, now) for key in keys]
+
+                chosen = []
+                if check_expiry:
+                    chosen = policy.expired(category, candidates, now)
+                    self._expiry_checked[category] = now
+                remaining = len(candidates) - len(chosen)
+                if limit is not None and remaining > limit:
+                    target = max(0, limit - int(limit * EVICTION_HEADROOM))
+                    excluded = set(chosen)
+                    chosen += policy.victims(
+                        [c for c in candidates if c.key not in excluded],
+                        remaining - target,
+                        now
+                    )
+
+                by_key = {c.key: c for c in candidates}
+                for key in chosen:
+                    victims[key] = (category, by_key[key])
+
+            if not victims:
+                return 0
+
+            # Only count victims still stored: another writer may have
+            # deleted them since the candidates were gathered
+            evicted = 0
+            with self.batch():
+                for key, (category, candidate) in victims.items():
+                    if not self.delete_memory(key):
+                        continue
+                    evicted += 1
+                    self._evictions[category] = self._evictions.get(category, 0) + 1
+                    self._bytes_reclaimed += candidate.size
+            return evicted
+
+    def eviction_stats(self) -> Dict[str, Any]:
+        """
+        Get eviction counters.
+
+        Returns:
+            Total "evictions", "bytes_reclaimed" and evictions "by_category"
+        """
+        return {
+            "evictions": sum(self._evictions.values()),
+            "bytes_reclaimed": self._bytes_reclaimed,
+            "by_category": dict(self._evictions)
+        }
+
+    def find_by_content(
+        self,
+        value: str,
+        category: Optional[str] = None
+    ) -> List[str]:
+        """
+        Find memories whose value is exactly ``value``.
+
+        Uses the content hashes kept in the index; no entry is read.
+
+        Args:
+            value: Memory content to look for
+            category: Restrict matches to a category
+
+        Returns:
+            Keys of matching memories
+
+        Example:
+            >>> if not manager.find_by_content("Use asyncio for all I/O"):
+            ...     manager.store_architectural_decision("Use asyncio for all I/O")
+        """
+        index = self._sync_indexes()
+        with self._text_lock:
+            keys = list(self._hash_index.get(content_hash(value), {}))
+        return [
+            key for key in keys
+            if key in index and (not category or index[key]["category"] == category)
+        ]
+
+    def _duplicates(
+        self,
+        key: str,
+        category: str,
+        digest: str,
+        fingerprint: int
+    ) -> List[str]:
+        """
+        Indexed keys of a category whose value duplicates a row's.
+
+        Exact content matches come first, then SimHash neighbours,
+        closest first. Call with ``_text_lock`` held.
+        """
+        candidates = list(self._hash_index.get(digest, {}))
+        candidates += [
+            other for other, _ in self._simhash_index.near(fingerprint, self._merge_distance)
+        ]
+        return [
+            other for other in dict.fromkeys(candidates)
+            if other != key and self._text_indexed[other]["category"] == category
+        ]
+
+    def _find_duplicate(self, key: str, metadata: Dict[str, Any]) -> Optional[str]:
+        """Get a stored memory that a new row duplicates, if any."""
+        self._sync_indexes()
+        with self._text_lock:
+            duplicates = self._duplicates(
+                key,
+                metadata["category"],
+                metadata["content_hash"],
+                int(metadata["simhash"], 16)
+            )
+        for duplicate in duplicates:
+            if self._exists(duplicate):
+                return duplicate
+        return None
+
+    def _merge_into(self, key: str, entry: MemoryEntry) -> str:
+        """Fold a duplicate entry into the stored memory ``key``."""
+        target = self.retrieve_memory(key)
+        if target is None:  # Deleted concurrently: store the entry as is
+            return self._put(entry, self._build_metadata(entry))
+
+        with self._text_lock:
+            relevance = self._decay_index.score(key)
+        target.occurrences += entry.occurrences
+        target.relevance_score = max(
+            relevance if relevance is not None else target.relevance_score,
+            entry.relevance_score
+        )
+        target.decayed_at = datetime.now().isoformat()
+        self._merges += 1
+        self.store_memory(target)
+        return key
+
+    def consolidate_memories(self) -> int:
+        """
+        Merge near-duplicate memories that are already stored.
+
+        Within each category, the oldest memory of a group of duplicates
+        (see ``merge_distance``; the SimHash default applies when it is
+        None) absorbs the others: it keeps its key and value, sums their
+        ``occurrences`` and takes the highest decayed relevance. Runs in
+        one batch.
+
+        Returns:
+            Number of deleted (merged) memories
+
+        Example:
+            >>> manager.consolidate_memories()  # e.g. from a nightly job
+            4
+        """
+        index = self._sync_indexes()
+        now = time.time()
+        groups: Dict[str, List[str]] = {}
+        with self._text_lock:
+            keys = sorted(
+                self._text_indexed,
+                key=lambda k: (parse_timestamp(self._text_indexed[k]["timestamp"]), k)
+            )
+            absorbed = set()
+            for key in keys:
+                if key in absorbed:
+                    continue
+                members = [
+                    other for other in self._duplicates(
+                        key,
+                        self._text_indexed[key]["category"],
+                        self._key_hashes[key],
+                        self._simhash_index.fingerprint(key)
+                    )
+                    if other not in absorbed and other not in groups
+                ]
+                absorbed.update(members)
+                groups[key] = members
+            relevance = {
+                member: self._decay_index.score(member, now)
+                for key, members in groups.items() if members
+                for member in (key, *members)
+            }
+
+        anchor = datetime.fromtimestamp(now).isoformat()
+        merged = 0
+        with self.batch():
+            for key, members in groups.items():
+                if not members:
+                    continue
+                target = self._resolve_entry(key, index.get(key), cache=False)
+                if target is None:
+                    continue
+                target.occurrences += sum(
+                    index[member].get("occurrences", 1) for member in members
+                )
+                target.relevance_score = max(
+                    relevance[k] for k in (key, *members)
+                )
+                target.decayed_at = anchor
+                self.store_memory(target)
+                for member in members:
+                    self.delete_memory(member)
+                merged += len(members)
+        self._merges += merged
+        return merged
+
+    def reindex_metadata(self) -> int:
+        """
+        Rebuild index metadata for every memory in one batch.
+
+        Upgrades index rows written before previews, hashes and keywords
+        were tracked, so later searches no longer need to read them.
+
+        Returns:
+            Number of rewritten entries
+        """
+        with self.batch():
+            count = 0
+            for entry in self.iter_memories():
+                self.store_memory(entry)
+                count += 1
+        return count
+
+    def rank_memories(
+        self,
+        query: str,
+        top_k: int = 5,
+        min_relevance: float = 0.7,
+        relevance_weight: float = 0.3
+    ) -> List[MemoryEntry]:
+        """
+        Rank memories against a free-text query.
+
+        Text relevance is the cosine similarity of hashed TF-IDF vectors
+        (or the BM25 score, see ``retrieval``) of the memory value,
+        normalized to the best match, blended with the decayed
+        ``relevance_score``. Only the ``RANK_CANDIDATES`` best text
+        matches are blended. If fewer than ``top_k`` memories match the
+        query, the remaining slots go to the most relevant architectural
+        decisions.
+
+        Args:
+            query: Project type, user request or any free text
+            top_k: Number of memories to return
+            min_relevance: Minimum decayed relevance score
+            relevance_weight: Weight of relevance in the blend (0-1)
+
+        Returns:
+            Up to top_k memory entries, best first
+
+        Example:
+            >>> for entry in manager.rank_memories("REST API with JWT auth"):
+            ...     print(entry.key)
+        """
+        index = self._sync_indexes()
+        now = time.time()
+        with self._text_lock:
+            scores = self._text_index.score(query, limit=max(RANK_CANDIDATES, top_k))
+            relevance = {
+                key: self._decay_index.score(key, now) for key in scores
+            }
+
+        candidates = {
+            key: score for key, score in scores.items()
+            if key in index and relevance[key] >= min_relevance
+        }
+        best = max(candidates.values(), default=0.0) or 1.0
+        ranked = heapq.nlargest(
+            top_k,
+            (
+                (
+                    (1.0 - relevance_weight) * score / best
+                    + relevance_weight * relevance[key],
+                    key
+                )
+                for key, score in candidates.items()
+            )
+        )
+        keys = [key for _, key in ranked]
+
+        # Architectural decisions apply to every project
+        if len(keys) < top_k:
+            matched_decisions = sum(
+                1 for key in candidates
+                if index[key]["category"] == "architectural_decision"
+            )
+            with self._text_lock:
+                decisions = self._decay_index.top(
+                    top_k + matched_decisions,
+                    category="architectural_decision",
+                    min_relevance=min_relevance,
+                    now=now
+                )
+            for key, _ in decisions:
+                if key not in candidates:
+                    keys.append(key)
+                if len(keys) == top_k:
+                    break
+
+        entries = []
+        for key in keys:
+            entry = self._resolve_entry(key, index.get(key))
+            if entry:
+                self._access[key] = now
+                entries.append(entry)
+        return entries
+
+    def effective_relevance(
+        self,
+        key: str,
+        now: Optional[datetime] = None
+    ) -> Optional[float]:
+        """
+        Get the decayed relevance of a memory.
+
+        Args:
+            key: Memory key
+            now: Time to decay to (default: current time)
+
+        Returns:
+            Decayed relevance score or None if not found
+        """
+        self._sync_indexes()
+        with self._text_lock:
+            return self._decay_index.score(key, now.timestamp() if now else None)
+
+    def materialize_decay(
+        self,
+        min_change: float = 0.01,
+        now: Optional[datetime] = None
+    ) -> int:
+        """
+        Persist decayed relevance scores in one batch.
+
+        Optional maintenance job: ranking already applies decay, but
+        persisting it keeps ``search_memories(min_relevance=...)`` and
+        exports in line with ranking. Every row is decayed in one
+        vectorized pass and only rows that lost at least ``min_change``
+        are rewritten, re-anchored at ``now``.
+
+        Args:
+            min_change: Smallest score drop worth a write
+            now: Time to decay to (default: current time)
+
+        Returns:
+            Number of rewritten entries
+
+        Example:
+            >>> manager.materialize_decay()  # e.g. from a nightly job
+            12
+        """
+        now = now or datetime.now()
+        index = self._sync_indexes()
+        with self._text_lock:
+            changed = self._decay_index.changed(min_change, now.timestamp())
+
+        anchor = now.isoformat()
+        rewritten = 0
+        with self.batch():
+            for key, score in changed:
+                entry = self._resolve_entry(key, index.get(key), cache=False)
+                if entry is None:  # Deleted since the index was synced
+                    continue
+                entry.relevance_score = max(0.0, min(1.0, score))
+                entry.decayed_at = anchor
+                self.store_memory(entry)
+                rewritten += 1
+        return rewritten
 
     def get_relevant_context(
         self,
         project_type: str,
-        top_k: int = 5
+        top_k: int = 5,
+        query: Optional[str] = None,
+        max_tokens: Optional[int] = None
     ) -> str:
         """
         Get relevant memory context for a project type.
 
         This is used during orchestration to inject learned patterns
-        into the conversation.
+        into the conversation. Memories are ranked against the project
+        type and, when given, the raw user request (see
+        ``rank_memories``). With ``max_tokens``, the best ranked
+        memories that fit the budget are packed into the block, skipping
+        any that would overflow it.
+
+        Formatted blocks are cached per (request, top_k, max_tokens) and
+        reused while the store version is unchanged, for up to
+        ``CONTEXT_CACHE_SECONDS``; a cache hit neither loads the index
+        nor reads memory files.
 
         Args:
             project_type: Type of project being created
-            top_k: Number of top memories to retrieve
+            top_k: Maximum number of memories to include
+            query: Optional user request to rank memories against
+            max_tokens: Token budget for the whole block (None = no budget;
+                tokens are estimated at ``CHARS_PER_TOKEN`` per token)
 
         Returns:
-            Formatted context string for Claude
+            Formatted context string for Claude ("" if nothing fits)
 
         Example:
-            >>> context = manager.get_relevant_context("api_automation", top_k=3)
+            >>> context = manager.get_relevant_context(
+            ...     "api_automation", top_k=3, max_tokens=200
+            ... )
             >>> print(context)
             RELEVANT PATTERNS FROM PREVIOUS PROJECTS:
             1. [architectural_decision] Prefer FastAPI over Flask for REST APIs
             2. [pattern] Use Pydantic for all API request/response models
             ...
         """
-        # Get all high-relevance memories
-        memories = self.search_memories(min_relevance=0.7)
+        text = f"{project_type} {query}" if query else project_type
+        cache_key = (text, top_k, max_tokens)
+        version = self.backend.version()
+        now = time.time()
 
-        # Filter by relevance to project type (simple keyword matching)
-        relevant = [
-            m for m in memories
-            if project_type.lower() in m.value.lower()
-            or m.category == "architectural_decision"
-        ]
+        with self._context_lock:
+            cached = self._context_cache.get(cache_key)
+            if (
+                cached is not None
+                and cached[0] == version
+                and now - cached[1] < CONTEXT_CACHE_SECONDS
+            ):
+                self._context_cache.move_to_end(cache_key)
+                self._context_hits += 1
+                for key in cached[3]:
+                    self._access[key] = now
+                return cached[2]
+            self._context_misses += 1
 
-        # Take top K
-        top_memories = relevant[:top_k]
+        block, keys = self._format_context(text, top_k, max_tokens)
 
-        if not top_memories:
-            return ""
+        with self._context_lock:
+            self._context_cache[cache_key] = (version, now, block, keys)
+            self._context_cache.move_to_end(cache_key)
+            while len(self._context_cache) > CONTEXT_CACHE_SIZE:
+                self._context_cache.popitem(last=False)
+        return block
 
-        # Format context
-        lines = ["RELEVANT PATTERNS FROM PREVIOUS PROJECTS:"]
-        for i, memory in enumerate(top_memories, 1):
-            lines.append(
-                f"{i}. [{memory.category}] {memory.value}"
-            )
+    def _format_context(
+        self,
+        text: str,
+        top_k: int,
+        max_tokens: Optional[int]
+    ) -> Tuple[str, List[str]]:
+        """Rank memories and pack them into a context block under the budget."""
+        # With a budget, rank spare candidates to replace memories that do not fit
+        pool = self.rank_memories(text, top_k=top_k if max_tokens is None else 2 * top_k)
+
+        lines = [CONTEXT_HEADER]
+        used = estimate_tokens(CONTEXT_HEADER)
+        keys = []
+        for memory in pool:
+            if len(keys) == top_k:
+                break
+            seen = f" (seen {memory.occurrences}x)" if memory.occurrences > 1 else ""
+            line = f"{len(keys) + 1}. [{memory.category}] {memory.value}{seen}"
+            cost = estimate_tokens("\n" + line)
+            if max_tokens is not None and used + cost > max_tokens:
+                continue
+            lines.append(line)
+            keys.append(memory.key)
+            used += cost
 
-        return "\n".join(lines)
+        if not keys:
+            return "", []
+        return "\n".join(lines), keys
 
     def store_architectural_decision(
         self,
         decision: str,
         context: str = ""
-    ) -> None:
+    ) -> str:
         """
         Store an architectural decision.
 
+        Each decision gets a new time-ordered key (see ``orchestrator.keys``),
+        so decisions stored in the same second never overwrite each other.
+
         Args:
             decision: The decision made
             context: Additional context about why this decision was made
 
+        Returns:
+            Key the decision was stored or merged under
+
         Example:
             >>> manager.store_architectural_decision(
             ...     decision="Use asyncio for all I/O operations",
             ...     context="Improves performance for API calls"
             ... )
         """
-        key = f"arch_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        key = monotonic_key("arch")
         value = f"{decision}"
         if context:
             value += f"\nContext: {context}"
@@ -273,13 +1560,13 @@ class MemoryManager:
             timestamp=datetime.now().isoformat(),
             relevance_score=1.0
         )
-        self.store_memory(entry)
+        return self.store_memory(entry)
 
     def store_pattern(
         self,
         pattern_name: str,
         pattern_description: str
-    ) -> None:
+    ) -> str:
         """
         Store a reusable pattern.
 
@@ -287,6 +1574,9 @@ class MemoryManager:
             pattern_name: Name of the pattern
             pattern_description: How/when to use this pattern
 
+        Returns:
+            Key the pattern was stored or merged under
+
         Example:
             >>> manager.store_pattern(
             ...     pattern_name="error_handling_decorator",
@@ -301,22 +1591,415 @@ class MemoryManager:
             timestamp=datetime.now().isoformat(),
             relevance_score=1.0
         )
-        self.store_memory(entry)
+        return self.store_memory(entry)
+
+    @staticmethod
+    def _open_text(path: Path, mode: str, compress: Optional[bool]):
+        """Open a text file, gzip-compressed when requested or named ``*.gz``."""
+        if compress is None:
+            compress = path.suffix == ".gz"
+        if compress:
+            return gzip.open(path, mode + 't', encoding='utf-8')
+        return open(path, mode, encoding='utf-8')
 
-    def export_memories(self, output_file: Path) -> None:
+    def export_memories(
+        self,
+        output_file: Path,
+        format: str = "json",
+        compress: Optional[bool] = None
+    ) -> int:
         """
-        Export all memories to a single JSON file.
+        Export all memories to a single file.
+
+        Entries are streamed from the backend one at a time, so memory use
+        does not grow with the store size.
 
         Args:
             output_file: Path to output file
+            format: "json" (one indented array) or "jsonl" (one entry per line)
+            compress: Gzip the output (default: when output_file ends in .gz)
+
+        Returns:
+            Number of exported entries
+
+        Raises:
+            ValueError: If the format is not supported
+
+        Example:
+            >>> manager.export_memories(Path("memories.jsonl.gz"), format="jsonl")
+            1532
         """
-        index = self._load_index()
-        all_memories = []
+        if format not in EXPORT_FORMATS:
+            raise ValueError(
+                f"Unknown export format '{format}'. "
+                f"Expected one of: {', '.join(EXPORT_FORMATS)}"
+            )
+
+        count = 0
+        with self._open_text(output_file, 'w', compress) as f:
+            if format == "json":
+                f.write("[")
+            for data in self.backend.iter_entries():
+                if format == "jsonl":
+                    f.write(json.dumps(data, ensure_ascii=False) + "\n")
+                else:
+                    f.write("," if count else "")
+                    f.write("\n" + textwrap.indent(
+                        json.dumps(data, indent=2, ensure_ascii=False), "  "
+                    ))
+                count += 1
+            if format == "json":
+                f.write("\n]" if count else "]")
+        return count
+
+    def bulk_import(
+        self,
+        input_file: Path,
+        dedupe: Optional[str] = "key",
+        chunk_size: int = 1000
+    ) -> Dict[str, int]:
+        """
+        Import memories from a JSONL file (optionally gzipped).
+
+        Lines are parsed and validated ``chunk_size`` at a time. Nothing
+        is written unless the whole file is valid, and the imported
+        entries are applied to the backend in a single flush. Entries are
+        stored as by ``store_memory()``: with ``merge_distance`` set they
+        may be merged into stored duplicates, and category limits are
+        enforced after the flush.
+
+        Args:
+            input_file: JSONL file as written by
+                ``export_memories(format="jsonl")``; gzip is detected
+            dedupe: Skip entries whose "key" already exists, or whose
+                "content" matches an existing memory or an earlier line;
+                None replaces entries with the same key
+            chunk_size: Lines validated per chunk
+
+        Returns:
+            Counts of "read", "imported", "merged" and "skipped" entries
+
+        Raises:
+            ValueError: If dedupe is unknown or a line is not a valid memory
+
+        Example:
+            >>> manager.bulk_import(Path("memories.jsonl.gz"), dedupe="content")
+            {'read': 1532, 'imported': 1490, 'merged': 0, 'skipped': 42}
+        """
+        if dedupe is not None and dedupe not in DEDUPE_MODES:
+            raise ValueError(
+                f"Unknown dedupe mode '{dedupe}'. "
+                f"Expected one of: {', '.join(DEDUPE_MODES)} or None"
+            )
+
+        with open(input_file, 'rb') as f:
+            compressed = f.read(2) == b"\x1f\x8b"
+
+        index = self._sync_indexes()
+        with self._text_lock:
+            seen_hashes = set(self._hash_index) if dedupe == "content" else set()
+        seen_keys = set(index) if dedupe == "key" else set()
+
+        operations: List[Tuple[MemoryEntry, Dict[str, Any]]] = []
+        counts = {"read": 0, "imported": 0, "merged": 0, "skipped": 0}
+
+        def ingest(chunk: List[Tuple[int, str]]) -> None:
+            for line_number, line in chunk:
+                try:
+                    entry = MemoryEntry(**json.loads(line))
+                except (ValueError, TypeError) as e:
+                    raise ValueError(
+                        f"Invalid memory on line {line_number} of {input_file}: {e}"
+                    ) from e
+
+                counts["read"] += 1
+                metadata = self._build_metadata(entry)
+                if dedupe == "key":
+                    duplicate = entry.key in seen_keys
+                    seen_keys.add(entry.key)
+                elif dedupe == "content":
+                    duplicate = metadata["content_hash"] in seen_hashes
+                    seen_hashes.add(metadata["content_hash"])
+                else:
+                    duplicate = False
+
+                if duplicate:
+                    counts["skipped"] += 1
+                    continue
+                operations.append((entry, metadata))
+
+        with self._open_text(input_file, 'r', compressed) as f:
+            chunk: List[Tuple[int, str]] = []
+            for line_number, line in enumerate(f, 1):
+                if line.strip():
+                    chunk.append((line_number, line))
+                if len(chunk) >= chunk_size:
+                    ingest(chunk)
+                    chunk = []
+            ingest(chunk)
+
+        # Same path as store_memory(): merges apply, and limits are
+        # enforced once when the batch flushes
+        with self.batch():
+            for entry, metadata in operations:
+                if self._store(entry, metadata) == entry.key:
+                    counts["imported"] += 1
+                else:
+                    counts["merged"] += 1
+        return counts
+
+
+class AsyncMemoryManager:
+    """
+    Async API over a MemoryManager.
+
+    Every call that may touch the disk runs in a bounded thread pool, so
+    tool handlers and workflow phases never block the event loop.
+    Concurrent ``retrieve_memory`` calls for the same key share a single
+    read; a write to the key makes later reads start afresh.
+
+    Writes are group-committed: writes issued while a flush is running
+    queue up and are applied, in order, in one batch (one backend flush)
+    once it completes. Each caller still awaits its own result, which is
+    only returned after its write is flushed.
+
+    The wrapped manager stays usable synchronously through ``manager``.
+
+    Example:
+        >>> memory = AsyncMemoryManager(MemoryManager(Path(".claude/memories")))
+        >>> async with memory.abatch():
+        ...     await memory.store_pattern("retry", "Retry with backoff")
+        >>> context = await memory.get_relevant_context("api_automation")
+    """
+
+    def __init__(
+        self,
+        manager: MemoryManager,
+        max_workers: int = 4,
+        max_write_batch: int = 1000
+    ):
+        """
+        Initialize the async memory manager.
+
+        Args:
+            manager: Memory manager doing the actual work
+            max_workers: Maximum number of concurrent memory I/O threads
+            max_write_batch: Maximum number of queued writes per flush
+        """
+        self.manager = manager
+        self.max_write_batch = max_write_batch
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="memory-io"
+        )
+        self._reads: Dict[Tuple[str, str], asyncio.Future] = {}  # In-flight reads
+        self._coalesced_reads = 0
+        self._writes: List[Tuple[Callable, Tuple, asyncio.Future]] = []  # Queued writes
+        self._writer: Optional[asyncio.Task] = None
+        self._write_groups = 0
+
+    async def _run(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a blocking call in the memory executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(func, *args, **kwargs)
+        )
+
+    async def _shared_read(self, read_key: Tuple[str, str], func: Callable, *args) -> Any:
+        """Run a read, or join an identical one already in flight."""
+        future = self._reads.get(read_key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self._executor, func, *args)
+            self._reads[read_key] = future
+
+            def forget(done: asyncio.Future) -> None:
+                if self._reads.get(read_key) is done:
+                    del self._reads[read_key]
+
+            future.add_done_callback(forget)
+        else:
+            self._coalesced_reads += 1
+
+        # Shielded so one cancelled waiter does not cancel the others
+        return await asyncio.shield(future)
+
+    def _invalidate(self, key: str) -> None:
+        """Stop handing out an in-flight read of a key that is being written."""
+        self._reads.pop(("retrieve", key), None)
+
+    async def _write(self, func: Callable, *args) -> Any:
+        """Queue a write for the next group commit and wait for its result."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._writes.append((func, args, future))
+        if self._writer is None or self._writer.done():
+            self._writer = loop.create_task(self._drain_writes())
+        return await future
+
+    async def _drain_writes(self) -> None:
+        """Apply queued writes, one batch at a time, until the queue is empty."""
+        while self._writes:
+            group = self._writes[:self.max_write_batch]
+            del self._writes[:self.max_write_batch]
+            try:
+                results = await self._run(self._apply_writes, group)
+            except Exception as error:  # The flush failed: every write did
+                results = [(False, error)] * len(group)
+
+            self._write_groups += 1
+            for (_, _, future), (ok, value) in zip(group, results):
+                if future.done():  # Caller cancelled
+                    continue
+                if ok:
+                    future.set_result(value)
+                else:
+                    future.set_exception(value)
+
+    def _apply_writes(
+        self,
+        group: List[Tuple[Callable, Tuple, asyncio.Future]]
+    ) -> List[Tuple[bool, Any]]:
+        """Run queued writes in one batch; returns (ok, result or error) per write."""
+        results: List[Tuple[bool, Any]] = []
+        with self.manager.batch():
+            for func, args, _ in group:
+                try:
+                    results.append((True, func(*args)))
+                except Exception as error:
+                    results.append((False, error))
+        return results
+
+    @asynccontextmanager
+    async def abatch(self) -> AsyncIterator["AsyncMemoryManager"]:
+        """
+        Buffer mutations and flush them once on exit (see ``MemoryManager.batch``).
+
+        The flush runs in the memory executor.
+        """
+        self.manager._begin_batch()
+        try:
+            yield self
+        finally:
+            operations = self.manager._end_batch()
+            if operations:
+                await self._run(self.manager._flush, operations)
+
+    async def store_memory(self, entry: MemoryEntry) -> str:
+        """Store a memory entry; returns the key it was stored or merged under."""
+        self._invalidate(entry.key)
+        return await self._write(self.manager.store_memory, entry)
+
+    async def retrieve_memory(self, key: str) -> Optional[MemoryEntry]:
+        """
+        Retrieve a memory by key, sharing concurrent reads of the same key.
+
+        Each caller gets its own copy of the entry.
+        """
+        entry = await self._shared_read(
+            ("retrieve", key), self.manager.retrieve_memory, key
+        )
+        return entry.model_copy() if entry else None
+
+    async def search_memories(self, *args, **kwargs) -> List[MemoryEntry]:
+        """Search memories (see ``MemoryManager.search_memories``)."""
+        return await self._run(self.manager.search_memories, *args, **kwargs)
+
+    async def update_relevance(self, key: str, new_score: float) -> bool:
+        """Update the relevance score of a memory."""
+        self._invalidate(key)
+        return await self._write(self.manager.update_relevance, key, new_score)
+
+    async def delete_memory(self, key: str) -> bool:
+        """Delete a memory entry."""
+        self._invalidate(key)
+        return await self._write(self.manager.delete_memory, key)
+
+    async def find_by_content(self, value: str, category: Optional[str] = None) -> List[str]:
+        """Find memories whose value is exactly ``value``."""
+        return await self._run(self.manager.find_by_content, value, category)
+
+    async def rank_memories(self, query: str, **kwargs) -> List[MemoryEntry]:
+        """Rank memories against a free-text query."""
+        return await self._run(self.manager.rank_memories, query, **kwargs)
+
+    async def get_relevant_context(
+        self,
+        project_type: str,
+        top_k: int = 5,
+        query: Optional[str] = None,
+        max_tokens: Optional[int] = None
+    ) -> str:
+        """Get relevant memory context for a project type (cached, see ``MemoryManager``)."""
+        return await self._run(
+            self.manager.get_relevant_context, project_type, top_k, query, max_tokens
+        )
+
+    async def store_architectural_decision(self, decision: str, context: str = "") -> str:
+        """Store an architectural decision under a new time-ordered key."""
+        return await self._write(self.manager.store_architectural_decision, decision, context)
+
+    async def store_pattern(self, pattern_name: str, pattern_description: str) -> str:
+        """Store a reusable pattern."""
+        self._invalidate(f"pattern_{pattern_name}")
+        return await self._write(self.manager.store_pattern, pattern_name, pattern_description)
+
+    async def consolidate_memories(self) -> int:
+        """Merge near-duplicate memories in one batch."""
+        return await self._run(self.manager.consolidate_memories)
+
+    async def materialize_decay(self, **kwargs) -> int:
+        """Persist decayed relevance scores in one batch."""
+        return await self._run(self.manager.materialize_decay, **kwargs)
+
+    async def export_memories(self, output_file: Path, **kwargs) -> int:
+        """Export all memories to a single file (see ``MemoryManager.export_memories``)."""
+        return await self._run(self.manager.export_memories, output_file, **kwargs)
+
+    async def bulk_import(self, input_file: Path, **kwargs) -> Dict[str, int]:
+        """Import memories from a JSONL file (see ``MemoryManager.bulk_import``)."""
+        return await self._run(self.manager.bulk_import, input_file, **kwargs)
+
+    async def write_snapshot(self, path: Optional[Path] = None, force: bool = False) -> bool:
+        """Regenerate the worker snapshot (see ``MemoryManager.write_snapshot``)."""
+        return await self._run(self.manager.write_snapshot, path, force)
+
+    def version(self) -> int:
+        """Get the store version (see ``MemoryManager.version``)."""
+        return self.manager.version()
+
+    def watch(self, interval: float = WATCH_INTERVAL) -> AsyncIterator[int]:
+        """Yield each new store version (see ``MemoryManager.watch``)."""
+        return self.manager.watch(interval)
+
+    async def count_memories(self) -> int:
+        """Get the number of stored memories."""
+        return await self._run(self.manager.count_memories)
+
+    async def enforce_limits(self, categories: Optional[List[str]] = None) -> int:
+        """Evict memories over their category limit (see ``MemoryManager.enforce_limits``)."""
+        return await self._run(self.manager.enforce_limits, categories)
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Get index cache statistics plus the number of coalesced reads."""
+        return {**self.manager.cache_stats(), "coalesced_reads": self._coalesced_reads}
+
+    def write_stats(self) -> Dict[str, Any]:
+        """Get write statistics plus the number of group commits."""
+        return {**self.manager.write_stats(), "write_groups": self._write_groups}
+
+    def eviction_stats(self) -> Dict[str, Any]:
+        """Get eviction counters (see ``MemoryManager.eviction_stats``)."""
+        return self.manager.eviction_stats()
 
-        for key in index.keys():
-            memory = self.retrieve_memory(key)
-            if memory:
-                all_memories.append(memory.model_dump())
+    def close(self) -> None:
+        """Wait for pending memory I/O, then close the manager."""
+        self._executor.shutdown(wait=True)
+        self.manager.close()
 
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(all_memories, f, indent=2, ensure_ascii=False)
+    async def aclose(self) -> None:
+        """Async equivalent of ``close()``; waits without blocking the loop."""
+        if self._writer is not None:
+            await self._writer
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.close)
@@ -202,8 +202,9 @@ class OrchestrationResult(BaseModel):
         description="Path to the generated project"
     )
 
-    intent: AutomationIntent = Field(
-        description="Analyzed user intent"
+    intent: Optional[AutomationIntent] = Field(
+        default=None,
+        description="Analyzed user intent (None if the run failed before it)"
     )
 
     structure: Optional[ProjectStructure] = Field(
@@ -231,6 +232,66 @@ class OrchestrationResult(BaseModel):
     )
 
 
+class WorkflowEvent(BaseModel):
+    """
+    Progress event streamed while the orchestration workflow runs.
+
+    Every event carries the elapsed time and the tokens reported by the
+    model so far; the final event (kind "result") carries the
+    OrchestrationResult.
+    """
+
+    kind: Literal[
+        "phase_started",
+        "phase_finished",
+        "subagent_message",
+        "tool_call",
+        "files_written",
+        "result"
+    ] = Field(
+        description="Type of event"
+    )
+
+    phase: Optional[str] = Field(
+        default=None,
+        description="Workflow phase or subagent task (intent, structure, code, ...)"
+    )
+
+    agent: Optional[str] = Field(
+        default=None,
+        description="Subagent the event comes from (None for the orchestrator)"
+    )
+
+    message: Optional[str] = Field(
+        default=None,
+        description="Message text, or the tool name for tool calls"
+    )
+
+    files: List[str] = Field(
+        default_factory=list,
+        description="Files written (files_written events)"
+    )
+
+    data: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="Event details, e.g. tool input or phase run time"
+    )
+
+    elapsed_seconds: float = Field(
+        description="Seconds since the workflow started"
+    )
+
+    tokens: int = Field(
+        default=0,
+        description="Input plus output tokens reported so far"
+    )
+
+    result: Optional[OrchestrationResult] = Field(
+        default=None,
+        description="Final result (result events)"
+    )
+
+
 class MemoryEntry(BaseModel):
     """Entry for persistent memory storage."""
 
@@ -262,3 +323,14 @@ class MemoryEntry(BaseModel):
         default=1.0,
         description="How relevant this memory is (decays over time)"
     )
+
+    decayed_at: Optional[str] = Field(
+        default=None,
+        description="ISO 8601 time relevance_score was last set or decayed (None = timestamp)"
+    )
+
+    occurrences: int = Field(
+        ge=1,
+        default=1,
+        description="Number of times this memory was stored, including merged near-duplicates"
+    )
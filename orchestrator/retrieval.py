@@ -0,0 +1,432 @@
+"""
+Text retrieval primitives for the orchestrator memory system.
+
+This module provides the tokenizer and the two incrementally maintained
+indexes used to rank memories against a project type or a raw user
+request: a BM25 inverted index, and a sparse matrix of hashed TF-IDF
+vectors (terms plus character n-grams) searched with NumPy when it is
+installed.
+"""
+
+import hashlib
+import heapq
+import math
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+# Hashed vector space: columns per vector, character n-gram size, share
+# of a term's weight given to its n-grams, and the smallest cosine
+# similarity reported as a match. Rows are sparse, so columns are cheap;
+# with fewer, unrelated memories collide into matches at 50k entries
+VECTOR_DIMENSIONS = 2 ** 14
+NGRAM_SIZE = 3
+NGRAM_WEIGHT = 0.5
+MIN_SIMILARITY = 0.15
+
+TOKEN_PATTERN = re.compile(r"[^\W_]+", re.UNICODE)
+
+# Common English and Spanish function words (user requests come in both)
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have in is it of on or that the this
+to was were will with use using
+al con de del el en es la las lo los para por que se su un una y
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase terms, dropping stopwords.
+
+    Underscores and punctuation separate terms, so ``"api_automation"``
+    yields ``["api", "automation"]``. A trailing plural "s" is stripped
+    so that "APIs" and "API" match.
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        List of terms in order of appearance
+    """
+    terms = []
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        if token in STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        terms.append(token)
+    return terms
+
+
+def term_frequencies(terms: Iterable[str]) -> Dict[str, int]:
+    """Count occurrences of each term."""
+    counts: Dict[str, int] = {}
+    for term in terms:
+        counts[term] = counts.get(term, 0) + 1
+    return counts
+
+
+class BM25Index:
+    """
+    Inverted index with Okapi BM25 scoring.
+
+    Documents can be added, replaced and removed one at a time. A query
+    only visits the postings of its own terms, so its cost depends on
+    how common those terms are rather than on the number of documents.
+
+    Example:
+        >>> index = BM25Index()
+        >>> index.add("pattern_api", "Prefer FastAPI for REST APIs")
+        >>> index.search("rest api automation", top_k=3)[0][0]
+        'pattern_api'
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        """
+        Initialize an empty index.
+
+        Args:
+            k1: Term frequency saturation
+            b: Document length normalization
+        """
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._doc_terms: Dict[str, Dict[str, int]] = {}
+        self._doc_lengths: Dict[str, int] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._doc_lengths)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._doc_lengths
+
+    def add(self, key: str, text: str) -> None:
+        """Index a document, replacing any previous version."""
+        self.add_terms(key, term_frequencies(tokenize(text)))
+
+    def add_terms(
+        self,
+        key: str,
+        frequencies: Dict[str, int],
+        length: Optional[int] = None
+    ) -> None:
+        """
+        Index a document from precomputed term frequencies.
+
+        Args:
+            key: Document key
+            frequencies: Term -> occurrence count
+            length: Document length in terms (default: sum of frequencies)
+        """
+        if key in self._doc_lengths:
+            self.remove(key)
+
+        length = sum(frequencies.values()) if length is None else length
+        self._doc_terms[key] = frequencies
+        self._doc_lengths[key] = length
+        self._total_length += length
+        for term, tf in frequencies.items():
+            self._postings.setdefault(term, {})[key] = tf
+
+    def remove(self, key: str) -> None:
+        """Remove a document if present."""
+        frequencies = self._doc_terms.pop(key, None)
+        if frequencies is None:
+            return
+
+        self._total_length -= self._doc_lengths.pop(key)
+        for term in frequencies:
+            postings = self._postings[term]
+            del postings[key]
+            if not postings:
+                del self._postings[term]
+
+    def score(self, query: str, limit: Optional[int] = None) -> Dict[str, float]:
+        """
+        Score every document that shares at least one term with the query.
+
+        Args:
+            query: Free text
+            limit: Keep only the best scoring documents (None = all)
+
+        Returns:
+            Mapping of document key to BM25 score
+        """
+        doc_count = len(self._doc_lengths)
+        if not doc_count:
+            return {}
+
+        avg_length = self._total_length / doc_count or 1.0
+        scores: Dict[str, float] = {}
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+
+            df = len(postings)
+            idf = math.log(1.0 + (doc_count - df + 0.5) / (df + 0.5))
+            for key, tf in postings.items():
+                norm = self.k1 * (1.0 - self.b + self.b * self._doc_lengths[key] / avg_length)
+                scores[key] = scores.get(key, 0.0) + idf * tf * (self.k1 + 1.0) / (tf + norm)
+        if limit is not None and len(scores) > limit:
+            scores = dict(heapq.nlargest(limit, scores.items(), key=lambda item: item[1]))
+        return scores
+
+    def search(self, query: str, top_k: int = 10) -> List[Tuple[str, float]]:
+        """
+        Get the best matching documents.
+
+        Returns:
+            Up to top_k (key, score) pairs, best first
+        """
+        scores = self.score(query)
+        return heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
+
+
+@lru_cache(maxsize=65536)
+def hashed_features(term: str, dimensions: int) -> Tuple[Tuple[int, float], ...]:
+    """
+    Hash a term and its character n-grams into signed vector columns.
+
+    The n-grams of ``"<term>"`` share ``NGRAM_WEIGHT`` of the term's
+    weight, so "invoice" and "invoices" stay close even if the plural
+    rule in ``tokenize`` does not apply.
+
+    Args:
+        term: Tokenized term
+        dimensions: Number of vector columns
+
+    Returns:
+        (column, weight) pairs for a term occurring once
+    """
+    padded = f"<{term}>"
+    grams = [padded[i:i + NGRAM_SIZE] for i in range(len(padded) - NGRAM_SIZE + 1)]
+    gram_weight = NGRAM_WEIGHT / math.sqrt(len(grams)) if grams else 0.0
+
+    features = []
+    for feature, weight in [(f"w:{term}", 1.0)] + [(f"g:{gram}", gram_weight) for gram in grams]:
+        digest = int.from_bytes(
+            hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), "little"
+        )
+        sign = 1.0 if digest >> 63 else -1.0
+        features.append((digest % dimensions, sign * weight))
+    return tuple(features)
+
+
+class VectorIndex:
+    """
+    Hashed TF-IDF vectors with cosine similarity search.
+
+    Each document is a unit-length row holding its log-scaled term
+    frequencies, hashed together with character n-grams into a fixed
+    number of columns. Rows only use a few columns, so the matrix is
+    stored sparse, by column: a query visits the columns of its own
+    features and adds their rows' weighted values in one vectorized
+    step per column. Rows are added and removed one at a time; a query
+    is weighted by inverse document frequency per column.
+
+    Has the same interface as ``BM25Index``; requires NumPy.
+
+    Example:
+        >>> index = VectorIndex()
+        >>> index.add("pattern_invoices", "Extract invoice fields from PDF files")
+        >>> index.search("parse invoices", top_k=1)[0][0]
+        'pattern_invoices'
+    """
+
+    def __init__(
+        self,
+        dimensions: int = VECTOR_DIMENSIONS,
+        min_similarity: float = MIN_SIMILARITY
+    ):
+        """
+        Initialize an empty index.
+
+        Args:
+            dimensions: Number of hashed columns per vector
+            min_similarity: Smallest cosine similarity ``score()`` reports
+
+        Raises:
+            ImportError: If NumPy is not installed
+        """
+        if not NUMPY_AVAILABLE:
+            raise ImportError("VectorIndex requires NumPy (pip install numpy)")
+        self.dimensions = dimensions
+        self.min_similarity = min_similarity
+        self._slots: Dict[str, int] = {}
+        self._keys: List[str] = []
+        self._rows: List[List[int]] = []  # Slot -> columns the row uses
+
+        # Per column: slots of the rows using it and their values, valid
+        # up to the column's size (which is also its document frequency)
+        empty_slots = np.zeros(0, dtype=np.int32)
+        empty_values = np.zeros(0, dtype=np.float32)
+        self._column_slots: List["np.ndarray"] = [empty_slots] * dimensions
+        self._column_values: List["np.ndarray"] = [empty_values] * dimensions
+        self._column_sizes = [0] * dimensions
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._slots
+
+    def _features(self, frequencies: Dict[str, int]) -> Dict[int, float]:
+        """Hash term frequencies into the nonzero columns of a vector."""
+        columns: Dict[int, float] = {}
+        for term, count in frequencies.items():
+            weight = 1.0 + math.log(count) if count > 1 else 1.0
+            for column, value in hashed_features(term, self.dimensions):
+                columns[column] = columns.get(column, 0.0) + weight * value
+        return {column: value for column, value in columns.items() if value}
+
+    def vectorize(self, frequencies: Dict[str, int]) -> "np.ndarray":
+        """Hash term frequencies into an unnormalized dense vector."""
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for column, value in self._features(frequencies).items():
+            vector[column] = value
+        return vector
+
+    def add(self, key: str, text: str) -> None:
+        """Index a document, replacing any previous version."""
+        self.add_terms(key, term_frequencies(tokenize(text)))
+
+    def add_terms(
+        self,
+        key: str,
+        frequencies: Dict[str, int],
+        length: Optional[int] = None
+    ) -> None:
+        """
+        Index a document from precomputed term frequencies.
+
+        Args:
+            key: Document key
+            frequencies: Term -> occurrence count
+            length: Unused; accepted for compatibility with ``BM25Index``
+        """
+        if key in self._slots:
+            self.remove(key)
+
+        features = self._features(frequencies)
+        norm = math.sqrt(sum(value * value for value in features.values())) or 1.0
+
+        slot = len(self._keys)
+        for column, value in features.items():
+            self._append(column, slot, value / norm)
+        self._rows.append(list(features))
+        self._slots[key] = slot
+        self._keys.append(key)
+
+    def _append(self, column: int, slot: int, value: float) -> None:
+        """Add a row's value to a column, growing its arrays if full."""
+        size = self._column_sizes[column]
+        slots = self._column_slots[column]
+        values = self._column_values[column]
+        if size == len(slots):
+            capacity = max(8, 2 * size)
+            slots = np.resize(slots, capacity)
+            values = np.resize(values, capacity)
+            self._column_slots[column] = slots
+            self._column_values[column] = values
+        slots[size] = slot
+        values[size] = value
+        self._column_sizes[column] = size + 1
+
+    def _position(self, column: int, slot: int) -> int:
+        """Index of a row's value within a column."""
+        size = self._column_sizes[column]
+        return int(np.flatnonzero(self._column_slots[column][:size] == slot)[0])
+
+    def remove(self, key: str) -> None:
+        """Remove a document if present (the last row takes its slot)."""
+        slot = self._slots.pop(key, None)
+        if slot is None:
+            return
+
+        for column in self._rows[slot]:
+            position = self._position(column, slot)
+            last_value = self._column_sizes[column] - 1
+            self._column_slots[column][position] = self._column_slots[column][last_value]
+            self._column_values[column][position] = self._column_values[column][last_value]
+            self._column_sizes[column] = last_value
+
+        last = len(self._keys) - 1
+        if slot != last:
+            for column in self._rows[last]:
+                self._column_slots[column][self._position(column, last)] = slot
+            self._rows[slot] = self._rows[last]
+            self._keys[slot] = self._keys[last]
+            self._slots[self._keys[slot]] = slot
+        self._rows.pop()
+        self._keys.pop()
+
+    def similarities(self, query: str) -> "np.ndarray":
+        """
+        Cosine similarity of the query to every document.
+
+        Returns:
+            Similarities aligned with insertion slots (empty if the
+            query has no terms)
+        """
+        count = len(self._keys)
+        features = self._features(term_frequencies(tokenize(query)))
+        if not count or not features:
+            return np.zeros(0, dtype=np.float32)
+
+        columns = list(features)
+        sizes = np.array([self._column_sizes[column] for column in columns], dtype=np.float64)
+        weights = np.array(list(features.values())) * (np.log((1.0 + count) / (1.0 + sizes)) + 1.0)
+        weights /= np.linalg.norm(weights)
+
+        # Sum the weighted postings of every query column in one pass
+        slots = np.concatenate([
+            self._column_slots[column][:self._column_sizes[column]] for column in columns
+        ])
+        values = np.concatenate([
+            weight * self._column_values[column][:self._column_sizes[column]]
+            for column, weight in zip(columns, weights.tolist())
+        ])
+        return np.bincount(slots, weights=values, minlength=count).astype(np.float32)
+
+    def _matches(self, query: str, limit: Optional[int]) -> Tuple["np.ndarray", "np.ndarray"]:
+        """Slots of the (best ``limit``) matching documents and all similarities."""
+        similarities = self.similarities(query)
+        slots = np.flatnonzero(similarities >= self.min_similarity)
+        if limit is not None and len(slots) > limit:
+            slots = slots[np.argpartition(-similarities[slots], limit - 1)[:limit]]
+        return slots, similarities
+
+    def score(self, query: str, limit: Optional[int] = None) -> Dict[str, float]:
+        """
+        Score every document at least ``min_similarity`` similar to the query.
+
+        Args:
+            query: Free text
+            limit: Keep only the most similar documents (None = all)
+
+        Returns:
+            Mapping of document key to cosine similarity
+        """
+        slots, similarities = self._matches(query, limit)
+        return {self._keys[slot]: float(similarities[slot]) for slot in slots}
+
+    def search(self, query: str, top_k: int = 10) -> List[Tuple[str, float]]:
+        """
+        Get the most similar documents.
+
+        Returns:
+            Up to top_k (key, similarity) pairs, best first
+        """
+        slots, similarities = self._matches(query, top_k)
+        ranked = sorted(slots, key=lambda slot: -similarities[slot])
+        return [(self._keys[slot], float(similarities[slot])) for slot in ranked]
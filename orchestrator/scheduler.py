@@ -0,0 +1,279 @@
+"""
+Dependency-graph scheduler for orchestration phases.
+
+Work is declared as named tasks with the tasks they depend on; the
+scheduler starts each task as soon as all of its dependencies have
+finished, running at most ``max_concurrency`` at once. After a run,
+``report()`` gives per-task queue and run times and the critical path:
+the chain of dependent tasks with the longest total run time, which
+bounds the wall-clock time no matter how much concurrency is allowed.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+DEFAULT_MAX_CONCURRENCY = 3
+
+
+class Task(NamedTuple):
+    """A unit of work in the graph."""
+
+    name: str
+    # Receives the results of every finished task (including all of its
+    # dependencies) by name
+    run: Callable[[Dict[str, Any]], Awaitable[Any]]
+    after: Tuple[str, ...]
+
+
+class DAGScheduler:
+    """
+    Runs tasks in dependency order with bounded concurrency.
+
+    Example:
+        >>> scheduler = DAGScheduler(max_concurrency=2)
+        >>> scheduler.add("spec", lambda r: write_spec())
+        >>> scheduler.add("code", lambda r: write_code(r["spec"]), after=["spec"])
+        >>> scheduler.add("tests", lambda r: write_tests(r["spec"]), after=["spec"])
+        >>> results = await scheduler.run()
+        >>> scheduler.report()["critical_path"]
+        ['spec', 'code']
+    """
+
+    def __init__(self, max_concurrency: int = DEFAULT_MAX_CONCURRENCY):
+        """
+        Initialize an empty graph.
+
+        Args:
+            max_concurrency: Maximum number of tasks running at once
+
+        Raises:
+            ValueError: If max_concurrency is less than 1
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+        self._tasks: Dict[str, Task] = {}
+        self._ready: Dict[str, float] = {}
+        self._started: Dict[str, float] = {}
+        self._finished: Dict[str, float] = {}
+        self._skipped: List[str] = []
+        self._wall = 0.0
+
+    def add(
+        self,
+        name: str,
+        run: Callable[[Dict[str, Any]], Awaitable[Any]],
+        after: Iterable[str] = ()
+    ) -> None:
+        """
+        Declare a task.
+
+        Args:
+            name: Unique task name; its result is stored under it
+            run: Called with the results so far once the dependencies
+                finished; returns an awaitable producing the result
+            after: Names of the tasks (or initial results) it needs
+
+        Raises:
+            ValueError: If a task with that name was already added
+        """
+        if name in self._tasks:
+            raise ValueError(f"Task '{name}' is already declared")
+        self._tasks[name] = Task(name, run, tuple(after))
+
+    def _check(self, known: Iterable[str]) -> None:
+        """
+        Reject unknown dependencies and cycles.
+
+        Raises:
+            ValueError: If the graph cannot be run
+        """
+        known = set(known)
+        for task in self._tasks.values():
+            missing = [d for d in task.after if d not in self._tasks and d not in known]
+            if missing:
+                raise ValueError(
+                    f"Task '{task.name}' depends on unknown tasks: {', '.join(missing)}"
+                )
+
+        waiting = {
+            name: {d for d in task.after if d in self._tasks}
+            for name, task in self._tasks.items()
+        }
+        ready = [name for name, deps in waiting.items() if not deps]
+        while ready:
+            done = ready.pop()
+            for name, deps in waiting.items():
+                if done in deps:
+                    deps.discard(done)
+                    if not deps:
+                        ready.append(name)
+        cyclic = sorted(name for name, deps in waiting.items() if deps)
+        if cyclic:
+            raise ValueError(f"Dependency cycle between tasks: {', '.join(cyclic)}")
+
+    async def _run_task(
+        self,
+        task: Task,
+        results: Dict[str, Any],
+        slots: asyncio.Semaphore,
+        on_start: Optional[Callable[[str], None]] = None
+    ) -> Any:
+        """Run one task once a concurrency slot is free."""
+        async with slots:
+            self._started[task.name] = time.perf_counter()
+            if on_start is not None:
+                on_start(task.name)
+            try:
+                return await task.run(results)
+            finally:
+                self._finished[task.name] = time.perf_counter()
+
+    async def run(
+        self,
+        results: Optional[Dict[str, Any]] = None,
+        on_result: Optional[Callable[[str, Any], None]] = None,
+        on_start: Optional[Callable[[str], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Run every task.
+
+        Tasks whose name is already in ``results`` count as finished and
+        are not run again, which lets a caller resume a partial run. If a
+        task raises, the tasks still running are cancelled and the
+        exception propagates.
+
+        Args:
+            results: Initial results that tasks may depend on by name
+            on_result: Called with each task's name and result as soon
+                as it finishes
+            on_start: Called with each task's name when it starts running
+                (after waiting for a slot)
+
+        Returns:
+            Results by name, including the initial ones
+
+        Raises:
+            ValueError: If a dependency is unknown or the graph has a cycle
+        """
+        results = dict(results or {})
+        self._check(results)
+        self._ready.clear()
+        self._started.clear()
+        self._finished.clear()
+        self._skipped = [name for name in self._tasks if name in results]
+
+        slots = asyncio.Semaphore(self.max_concurrency)
+        waiting = {
+            name: {d for d in task.after if d not in results}
+            for name, task in self._tasks.items()
+            if name not in results
+        }
+        running: Dict[asyncio.Task, str] = {}
+        begin = time.perf_counter()
+
+        def launch(name: str) -> None:
+            del waiting[name]
+            self._ready[name] = time.perf_counter()
+            future = asyncio.ensure_future(
+                self._run_task(self._tasks[name], dict(results), slots, on_start)
+            )
+            running[future] = name
+
+        for name in [n for n, deps in waiting.items() if not deps]:
+            launch(name)
+
+        try:
+            while running:
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    results[name] = future.result()
+                    if on_result is not None:
+                        on_result(name, results[name])
+                    for other in [n for n, deps in waiting.items() if name in deps]:
+                        waiting[other].discard(name)
+                        if not waiting[other]:
+                            launch(other)
+        finally:
+            for future in running:
+                future.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+            self._wall = time.perf_counter() - begin
+
+        return results
+
+    def critical_path(self) -> Tuple[List[str], float]:
+        """
+        Find the dependency chain with the longest total run time.
+
+        Returns:
+            (task names in run order, total run seconds) for the last run
+        """
+        durations = {
+            name: self._finished[name] - self._started[name]
+            for name in self._finished
+            if name in self._started
+        }
+        best: Dict[str, Tuple[float, Optional[str]]] = {}
+
+        def longest(name: str) -> Tuple[float, Optional[str]]:
+            if name not in best:
+                previous = None
+                length = 0.0
+                for dep in self._tasks[name].after:
+                    if dep in durations and longest(dep)[0] > length:
+                        length, previous = longest(dep)[0], dep
+                best[name] = (length + durations[name], previous)
+            return best[name]
+
+        if not durations:
+            return [], 0.0
+        end = max(durations, key=lambda name: longest(name)[0])
+        path = []
+        node: Optional[str] = end
+        while node is not None:
+            path.append(node)
+            node = best[node][1]
+        return list(reversed(path)), best[end][0]
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Get timings of the last run.
+
+        Returns:
+            Dictionary with the wall-clock time, the critical path and its
+            length, the tasks skipped because their result was given, and
+            per task the seconds spent queued (ready but waiting for a
+            slot) and running, plus start and finish times relative to the
+            first task becoming ready
+
+        Example:
+            >>> report = scheduler.report()
+            >>> print(report["critical_path_seconds"], report["wall_seconds"])
+        """
+        path, length = self.critical_path()
+        origin = min(self._ready.values(), default=0.0)
+        tasks = {}
+        for name, ready in self._ready.items():
+            started = self._started.get(name)
+            finished = self._finished.get(name)
+            tasks[name] = {
+                "after": list(self._tasks[name].after),
+                "queued_seconds": (started - ready) if started is not None else None,
+                "run_seconds": (
+                    finished - started if started is not None and finished is not None else None
+                ),
+                "started_at": started - origin if started is not None else None,
+                "finished_at": finished - origin if finished is not None else None
+            }
+        return {
+            "max_concurrency": self.max_concurrency,
+            "wall_seconds": self._wall,
+            "critical_path": path,
+            "critical_path_seconds": length,
+            "skipped": list(self._skipped),
+            "tasks": tasks
+        }
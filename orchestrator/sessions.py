@@ -0,0 +1,146 @@
+"""
+Pool of independent Claude SDK client sessions.
+
+A ``ClaudeSDKClient`` is one conversation: a ``query()`` and the
+``receive_response()`` that follows must not overlap with another
+caller's. ``ClientPool`` hands each concurrent caller a session of its
+own, so delegated subagents really run in parallel instead of
+interleaving on (or queueing for) a single client.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, List
+
+# Sessions opened at most by default: one per parallel subagent
+# (code generator, test writer, documentation writer)
+DEFAULT_POOL_SIZE = 3
+
+
+class ClientPool:
+    """
+    Bounded pool of SDK client sessions, opened on demand.
+
+    Sessions are created with ``factory`` (e.g. ``lambda:
+    ClaudeSDKClient(options=options)``) and entered as async context
+    managers the first time they are needed, up to ``size`` at once.
+    A released session is reused by the next caller; callers beyond
+    ``size`` wait for one to be released.
+
+    Example:
+        >>> async with ClientPool(lambda: ClaudeSDKClient(options=options)) as pool:
+        ...     async with pool.session() as client:
+        ...         await client.query("@test_writer Write the tests")
+        ...         async for message in client.receive_response():
+        ...             pass
+    """
+
+    def __init__(self, factory: Callable[[], Any], size: int = DEFAULT_POOL_SIZE):
+        """
+        Initialize an empty pool.
+
+        Args:
+            factory: Creates a new (not yet entered) client
+            size: Maximum number of open sessions
+
+        Raises:
+            ValueError: If size is less than 1
+        """
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self.factory = factory
+        self.size = size
+        self._idle: List[Any] = []
+        self._open: List[Any] = []
+        self._slots = asyncio.Semaphore(size)
+        self._lock = asyncio.Lock()
+        self._closed = False
+
+        # Statistics
+        self._acquisitions = 0
+        self._waits = 0
+
+    async def _acquire(self) -> Any:
+        """Take an idle session or open a new one."""
+        if self._closed:
+            raise RuntimeError("Client pool is closed")
+        if self._slots.locked():
+            self._waits += 1
+        await self._slots.acquire()
+        try:
+            async with self._lock:
+                if self._idle:
+                    client = self._idle.pop()
+                else:
+                    client = self.factory()
+                    await client.__aenter__()
+                    self._open.append(client)
+        except BaseException:
+            self._slots.release()
+            raise
+        self._acquisitions += 1
+        return client
+
+    def _release(self, client: Any) -> None:
+        """Return a session to the pool."""
+        self._idle.append(client)
+        self._slots.release()
+
+    async def _discard(self, client: Any) -> None:
+        """Close a session that may be in an unknown state."""
+        async with self._lock:
+            if client in self._open:
+                self._open.remove(client)
+        try:
+            await client.__aexit__(None, None, None)
+        finally:
+            self._slots.release()
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[Any]:
+        """
+        Borrow a session for exclusive use.
+
+        If the block raises, the session is closed instead of reused,
+        since its conversation may hold an unfinished response.
+
+        Yields:
+            An entered SDK client
+        """
+        client = await self._acquire()
+        try:
+            yield client
+        except BaseException:
+            await self._discard(client)
+            raise
+        self._release(client)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get pool statistics.
+
+        Returns:
+            Dictionary with the pool size, open and idle sessions,
+            acquisitions and acquisitions that had to wait
+        """
+        return {
+            "size": self.size,
+            "open": len(self._open),
+            "idle": len(self._idle),
+            "acquisitions": self._acquisitions,
+            "waits": self._waits
+        }
+
+    async def aclose(self) -> None:
+        """Close every open session."""
+        self._closed = True
+        async with self._lock:
+            clients, self._open, self._idle = self._open, [], []
+        for client in clients:
+            await client.__aexit__(None, None, None)
+
+    async def __aenter__(self) -> "ClientPool":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
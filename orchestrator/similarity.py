@@ -0,0 +1,169 @@
+"""
+Near-duplicate detection for memory values.
+
+Memories are fingerprinted with a 64-bit SimHash of their terms and
+word pairs (see ``shingles`` and ``orchestrator.retrieval.tokenize``):
+values that differ only in case, punctuation, stopwords or a few terms
+get fingerprints a few bits apart, while the same words in a different
+order ("Flask over FastAPI" / "FastAPI over Flask") do not. ``SimHashIndex`` finds fingerprints
+within a Hamming distance without comparing against every memory, by
+splitting fingerprints into bands and looking up exact band matches.
+"""
+
+import hashlib
+from functools import lru_cache
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+FINGERPRINT_BITS = 64
+
+# Default maximum Hamming distance for two values to count as duplicates
+NEAR_DUPLICATE_DISTANCE = 3
+
+
+def shingles(terms: Sequence[str]) -> Dict[str, int]:
+    """
+    Count a text's terms and its pairs of adjacent terms.
+
+    The pairs make fingerprints sensitive to word order.
+
+    Args:
+        terms: Tokenized terms, in order
+
+    Returns:
+        Term or "term term" pair -> number of occurrences
+
+    Example:
+        >>> shingles(["prefer", "flask", "over", "fastapi"])["flask over"]
+        1
+    """
+    counts: Dict[str, int] = {}
+    for term in terms:
+        counts[term] = counts.get(term, 0) + 1
+    for first, second in zip(terms, terms[1:]):
+        pair = f"{first} {second}"
+        counts[pair] = counts.get(pair, 0) + 1
+    return counts
+
+
+@lru_cache(maxsize=65536)
+def _term_signs(term: str) -> Tuple[int, ...]:
+    """+1/-1 per bit of a term's 64-bit hash, lowest bit first."""
+    bits = int.from_bytes(hashlib.blake2b(term.encode('utf-8'), digest_size=8).digest(), "big")
+    return tuple(1 if bits >> bit & 1 else -1 for bit in range(FINGERPRINT_BITS))
+
+
+def simhash(frequencies: Mapping[str, int]) -> int:
+    """
+    Compute the SimHash fingerprint of a bag of terms.
+
+    Args:
+        frequencies: Term -> number of occurrences
+
+    Returns:
+        64-bit fingerprint (0 for no terms)
+
+    Example:
+        >>> a = simhash(shingles(tokenize("Use FastAPI for REST APIs")))
+        >>> b = simhash(shingles(tokenize("use fastapi for REST API.")))
+        >>> hamming(a, b)
+        0
+    """
+    weights = [0] * FINGERPRINT_BITS
+    for term, count in frequencies.items():
+        signs = _term_signs(term)
+        if count == 1:
+            weights = [w + s for w, s in zip(weights, signs)]
+        else:
+            weights = [w + count * s for w, s in zip(weights, signs)]
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming(a: int, b: int) -> int:
+    """Number of differing bits between two fingerprints."""
+    return bin(a ^ b).count("1")
+
+
+class SimHashIndex:
+    """
+    Fingerprints searchable by Hamming distance.
+
+    Fingerprints are split into ``max_distance + 1`` bands; two
+    fingerprints within ``max_distance`` bits share at least one band
+    exactly (pigeonhole), so a lookup only compares the fingerprints in
+    its bands' buckets.
+    """
+
+    def __init__(self, max_distance: int = NEAR_DUPLICATE_DISTANCE):
+        """
+        Initialize an empty index.
+
+        Args:
+            max_distance: Largest Hamming distance ``near()`` can find
+        """
+        self.max_distance = max_distance
+        bands = max_distance + 1
+        width = -(-FINGERPRINT_BITS // bands)
+        self._bands = [
+            (start, (1 << min(width, FINGERPRINT_BITS - start)) - 1)
+            for start in range(0, FINGERPRINT_BITS, width)
+        ]
+        self._fingerprints: Dict[str, int] = {}
+        self._buckets: List[Dict[int, Dict[str, None]]] = [{} for _ in self._bands]
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+    def fingerprint(self, key: str) -> Optional[int]:
+        """Get a key's fingerprint (None if unknown)."""
+        return self._fingerprints.get(key)
+
+    def add(self, key: str, fingerprint: int) -> None:
+        """Add or replace a key's fingerprint."""
+        self.remove(key)
+        self._fingerprints[key] = fingerprint
+        for (start, mask), buckets in zip(self._bands, self._buckets):
+            buckets.setdefault(fingerprint >> start & mask, {})[key] = None
+
+    def remove(self, key: str) -> None:
+        """Remove a key if present."""
+        fingerprint = self._fingerprints.pop(key, None)
+        if fingerprint is None:
+            return
+        for (start, mask), buckets in zip(self._bands, self._buckets):
+            band = fingerprint >> start & mask
+            keys = buckets[band]
+            del keys[key]
+            if not keys:
+                del buckets[band]
+
+    def near(self, fingerprint: int, max_distance: Optional[int] = None) -> List[Tuple[str, int]]:
+        """
+        Find keys whose fingerprint is within a Hamming distance.
+
+        Args:
+            fingerprint: Fingerprint to look up
+            max_distance: Largest distance (default and cap: the index's)
+
+        Returns:
+            (key, distance) pairs, closest first
+        """
+        if max_distance is None or max_distance > self.max_distance:
+            max_distance = self.max_distance
+
+        seen = set()
+        matches = []
+        for (start, mask), buckets in zip(self._bands, self._buckets):
+            for key in buckets.get(fingerprint >> start & mask, ()):
+                if key in seen:
+                    continue
+                seen.add(key)
+                distance = hamming(fingerprint, self._fingerprints[key])
+                if distance <= max_distance:
+                    matches.append((key, distance))
+        matches.sort(key=lambda match: (match[1], match[0]))
+        return matches
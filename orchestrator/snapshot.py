@@ -0,0 +1,381 @@
+"""
+Read-only, memory-mapped snapshots of a memory store.
+
+A snapshot is a single binary file that worker processes open with
+``mmap`` instead of loading the store itself: opening it reads only a
+fixed-size header, and each lookup is a binary search over an offset
+table followed by decoding just the requested record. Nothing is
+parsed up front, and pages are shared between every process that maps
+the same file.
+
+Layout (little-endian):
+
+- header: magic ``OMEMSNAP``, format version, record count, version of
+  the store the snapshot was built from, build time
+- offset table: one row per record, sorted by key, holding the record's
+  offset and the lengths of its three parts
+- records: UTF-8 key, compact JSON index metadata, compact JSON entry
+
+A writer regenerates the snapshot with ``write_snapshot()`` (see
+``MemoryManager.write_snapshot``); it replaces the file atomically, and
+readers remap it on their next index load.
+"""
+
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+from collections.abc import ItemsView, Mapping
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .storage import MemoryBackend, write_atomic
+
+SNAPSHOT_FILE = "memories.snap"
+SNAPSHOT_MAGIC = b"OMEMSNAP"
+SNAPSHOT_FORMAT = 1
+
+# magic, format, reserved, record count, store version, built at (epoch s)
+HEADER = struct.Struct("<8sHHIQd")
+# record offset, key length, metadata length, entry length
+ROW = struct.Struct("<QIII")
+
+
+def encode_snapshot(
+    records: List[Tuple[str, Dict[str, Any], Dict[str, Any]]],
+    version: int = 0
+) -> bytes:
+    """
+    Pack records into the snapshot format.
+
+    Args:
+        records: (key, index metadata, entry) tuples, in any order
+        version: Version of the store the records were read at
+
+    Returns:
+        Snapshot file content
+    """
+    encoded = sorted(
+        (
+            key.encode('utf-8'),
+            json.dumps(metadata, ensure_ascii=False, separators=(",", ":")).encode('utf-8'),
+            json.dumps(entry, ensure_ascii=False, separators=(",", ":")).encode('utf-8')
+        )
+        for key, metadata, entry in records
+    )
+
+    table = bytearray()
+    offset = HEADER.size + ROW.size * len(encoded)
+    for key, metadata, entry in encoded:
+        table += ROW.pack(offset, len(key), len(metadata), len(entry))
+        offset += len(key) + len(metadata) + len(entry)
+
+    header = HEADER.pack(
+        SNAPSHOT_MAGIC, SNAPSHOT_FORMAT, 0, len(encoded), version, time.time()
+    )
+    return b"".join([header, bytes(table), *(b"".join(parts) for parts in encoded)])
+
+
+def write_snapshot(
+    backend: MemoryBackend,
+    path: Path,
+    version: Optional[int] = None,
+    fsync: bool = True
+) -> int:
+    """
+    Write a snapshot of every entry in a backend.
+
+    Args:
+        backend: Backend to read from
+        path: Snapshot file to replace
+        version: Store version to record (default: ``backend.version()``
+            read before the index, so a concurrent write makes the
+            snapshot look stale rather than current)
+        fsync: Flush the snapshot to stable storage
+
+    Returns:
+        Number of records written
+
+    Example:
+        >>> write_snapshot(manager.backend, Path(".claude/memories/memories.snap"))
+        1250
+    """
+    if version is None:
+        version = backend.version()
+    index = backend.load_index()
+
+    records = []
+    for key, metadata in list(index.items()):
+        entry = backend.read_entry(key, metadata)
+        if entry is not None:
+            metadata = {k: v for k, v in metadata.items() if k != "file"}
+            records.append((key, metadata, entry))
+
+    write_atomic(path, encode_snapshot(records, version), fsync=fsync)
+    return len(records)
+
+
+def snapshot_version(path: Path) -> Optional[int]:
+    """
+    Read the store version recorded in a snapshot's header.
+
+    Returns:
+        The version, or None if the file is missing or not a snapshot
+    """
+    try:
+        with open(path, 'rb') as f:
+            header = f.read(HEADER.size)
+    except FileNotFoundError:
+        return None
+    if len(header) < HEADER.size:
+        return None
+    magic, fmt, _, _, version, _ = HEADER.unpack(header)
+    if magic != SNAPSHOT_MAGIC or fmt != SNAPSHOT_FORMAT:
+        return None
+    return version
+
+
+class SnapshotIndex(Mapping):
+    """
+    Lazy key -> metadata mapping over a mapped snapshot.
+
+    Metadata is decoded on first access and then reused, so repeated
+    lookups return the same dictionary (which ``MemoryManager`` relies on
+    to tell unchanged rows apart).
+    """
+
+    def __init__(self, data: mmap.mmap):
+        """
+        Wrap a mapped snapshot.
+
+        Args:
+            data: Mapped snapshot file
+
+        Raises:
+            ValueError: If the file is not a snapshot of a known format
+        """
+        if len(data) < HEADER.size:
+            raise ValueError("Not a memory snapshot: file too short")
+        magic, fmt, _, count, version, built_at = HEADER.unpack_from(data, 0)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError("Not a memory snapshot: bad magic")
+        if fmt != SNAPSHOT_FORMAT:
+            raise ValueError(f"Unsupported memory snapshot format {fmt}")
+
+        self._data = data
+        self._count = count
+        self.version = version
+        self.built_at = built_at
+        self._metadata: Dict[str, Dict[str, Any]] = {}
+
+    def _rows(self) -> Iterator[Tuple[int, int, int, int]]:
+        """Offset table rows in key order."""
+        end = HEADER.size + ROW.size * self._count
+        return ROW.iter_unpack(self._data[HEADER.size:end])
+
+    def _row(self, position: int) -> Tuple[int, int, int, int]:
+        """Offset table row at a position."""
+        return ROW.unpack_from(self._data, HEADER.size + ROW.size * position)
+
+    def _key_at(self, position: int) -> bytes:
+        offset, key_length, _, _ = self._row(position)
+        return self._data[offset:offset + key_length]
+
+    def find(self, key: str) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Binary-search the offset table.
+
+        Returns:
+            The key's (offset, key length, metadata length, entry length)
+            row, or None if absent
+        """
+        target = key.encode('utf-8')
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key_at(middle) < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self._count and self._key_at(low) == target:
+            return self._row(low)
+        return None
+
+    def entry(self, key: str) -> Optional[Dict[str, Any]]:
+        """Decode a key's entry, or None if absent."""
+        row = self.find(key)
+        if row is None:
+            return None
+        offset, key_length, metadata_length, entry_length = row
+        start = offset + key_length + metadata_length
+        return json.loads(self._data[start:start + entry_length])
+
+    def _decode(self, key: str, row: Tuple[int, int, int, int]) -> Dict[str, Any]:
+        """Decode (once) the metadata of a key's row."""
+        metadata = self._metadata.get(key)
+        if metadata is None:
+            offset, key_length, metadata_length, _ = row
+            start = offset + key_length
+            metadata = json.loads(self._data[start:start + metadata_length])
+            metadata = self._metadata.setdefault(key, metadata)
+        return metadata
+
+    def __getitem__(self, key: str) -> Dict[str, Any]:
+        metadata = self._metadata.get(key)
+        if metadata is not None:
+            return metadata
+        row = self.find(key)
+        if row is None:
+            raise KeyError(key)
+        return self._decode(key, row)
+
+    def items(self) -> "SnapshotItems":
+        """(key, metadata) pairs, read in one pass over the table."""
+        return SnapshotItems(self)
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and (key in self._metadata or self.find(key) is not None)
+
+    def __iter__(self) -> Iterator[str]:
+        data = self._data
+        for offset, key_length, _, _ in self._rows():
+            yield data[offset:offset + key_length].decode('utf-8')
+
+    def __len__(self) -> int:
+        return self._count
+
+
+class SnapshotItems(ItemsView):
+    """
+    Items view that walks the offset table instead of searching it.
+
+    Metadata not decoded yet is parsed ``DECODE_CHUNK`` rows at a time
+    with a single ``json.loads``, which is much faster than one call per
+    row.
+    """
+
+    DECODE_CHUNK = 4096
+
+    def __iter__(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        index = self._mapping
+        data = index._data
+        decoded = index._metadata
+        rows = list(index._rows())
+        for start in range(0, len(rows), self.DECODE_CHUNK):
+            keys = []
+            pending = []
+            for offset, key_length, metadata_length, _ in rows[start:start + self.DECODE_CHUNK]:
+                key = data[offset:offset + key_length].decode('utf-8')
+                keys.append(key)
+                if key not in decoded:
+                    begin = offset + key_length
+                    pending.append((key, data[begin:begin + metadata_length]))
+            if pending:
+                values = json.loads(b"[" + b",".join(raw for _, raw in pending) + b"]")
+                for (key, _), metadata in zip(pending, values):
+                    decoded.setdefault(key, metadata)
+            for key in keys:
+                yield key, decoded[key]
+
+
+class SnapshotBackend(MemoryBackend):
+    """
+    Read-only backend serving a memory-mapped snapshot.
+
+    Opening the backend maps the file and reads its header; the index is
+    a lazy ``SnapshotIndex``, so a ``retrieve_memory`` right after start
+    decodes a single record. ``load_index()`` stats the file and remaps
+    it when a writer has replaced it. Every mutation raises
+    ``RuntimeError``.
+    """
+
+    name = "snapshot"
+    read_only = True
+
+    def __init__(self, path: Path):
+        """
+        Open a snapshot.
+
+        Args:
+            path: Snapshot file
+
+        Raises:
+            FileNotFoundError: If the snapshot does not exist
+            ValueError: If the file is not a snapshot of a known format
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._index: Optional[SnapshotIndex] = None
+        self._signature: Optional[Tuple[int, int, int]] = None
+        self._remaps = 0
+        self._map()
+
+    def _map(self) -> None:
+        """Map the current snapshot file (caller holds the lock or is __init__)."""
+        with open(self.path, 'rb') as f:
+            st = os.fstat(f.fileno())
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            index = SnapshotIndex(data)
+        except ValueError:
+            data.close()
+            raise
+        # The previous map is released once no index refers to it
+        self._index = index
+        self._signature = (st.st_ino, st.st_size, st.st_mtime_ns)
+        self.generation += 1
+        self._reset_changes()
+
+    def version(self) -> int:
+        """Version of the store the current snapshot was built from."""
+        return self.load_index().version
+
+    def load_index(self) -> SnapshotIndex:
+        """Get the snapshot index, remapping the file if it was replaced."""
+        with self._lock:
+            try:
+                st = os.stat(self.path)
+                signature = (st.st_ino, st.st_size, st.st_mtime_ns)
+            except FileNotFoundError:
+                signature = self._signature  # Keep serving the mapped copy
+            if signature != self._signature:
+                self._map()
+                self._remaps += 1
+            return self._index
+
+    def read_entry(
+        self,
+        key: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Decode an entry from the mapped snapshot."""
+        index = self._index if metadata is not None else self.load_index()
+        return index.entry(key)
+
+    def write_entry(self, entry: Dict[str, Any], metadata: Dict[str, Any]) -> None:
+        """Snapshots are read-only."""
+        raise RuntimeError(f"Memory snapshot {self.path} is read-only")
+
+    def delete_entry(self, key: str) -> bool:
+        """Snapshots are read-only."""
+        raise RuntimeError(f"Memory snapshot {self.path} is read-only")
+
+    def apply_batch(self, operations: List[Dict[str, Any]]) -> None:
+        """Snapshots are read-only."""
+        raise RuntimeError(f"Memory snapshot {self.path} is read-only")
+
+    def stats(self) -> Dict[str, Any]:
+        """Get snapshot statistics."""
+        return {
+            "backend": self.name,
+            "entries": len(self._index),
+            "version": self._index.version,
+            "built_at": self._index.built_at,
+            "remaps": self._remaps
+        }
+
+    def close(self) -> None:
+        """Drop the mapped snapshot; it is unmapped once unreferenced."""
+        self._index = None
@@ -0,0 +1,1425 @@
+"""
+Storage backends for the orchestrator memory system.
+
+A backend owns the on-disk layout of memory entries and their index.
+MemoryManager delegates all persistence to a backend, so the layout can
+be swapped without changing the public memory API.
+
+Available backends:
+- JSONFileBackend: one JSON file per entry plus index.json (default)
+- SQLiteBackend: single SQLite database in WAL mode
+- SnapshotBackend (``orchestrator.snapshot``): read-only memory-mapped
+  snapshot for worker processes
+"""
+
+import bisect
+import hashlib
+import json
+import os
+import sqlite3
+import struct
+import tempfile
+import threading
+import heapq
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+# Orderings accepted by MemoryBackend.query(): name -> index field
+ORDER_FIELDS = {
+    "relevance": "relevance_score",
+    "timestamp": "timestamp",
+    "key": "key",
+}
+
+
+class FileLock:
+    """
+    Cross-process reader/writer lock backed by ``fcntl.flock``.
+
+    Any number of processes can hold the lock shared while exclusive
+    holders are serialized. Within a process the lock is reentrant and
+    also serializes threads; a shared request made while holding the
+    lock exclusively is granted, but upgrading a shared lock to an
+    exclusive one is not supported. Where ``fcntl`` is unavailable only
+    the in-process serialization remains.
+
+    Example:
+        >>> lock = FileLock(Path(".claude/memories/.lock"))
+        >>> with lock.shared():
+        ...     index = read_index()
+    """
+
+    def __init__(self, path: Path):
+        """
+        Initialize the lock.
+
+        Args:
+            path: Lock file (created on first use, never removed)
+        """
+        self.path = path
+        self._thread_lock = threading.RLock()
+        self._fd: Optional[int] = None
+        self._exclusive = False
+        self._depth = 0
+
+    def acquire(self, exclusive: bool = False, blocking: bool = True) -> bool:
+        """
+        Acquire the lock.
+
+        Args:
+            exclusive: Take the lock exclusively instead of shared
+            blocking: Wait for the lock (otherwise return False if busy)
+
+        Returns:
+            True if the lock was acquired
+
+        Raises:
+            RuntimeError: If a held shared lock would need an upgrade
+        """
+        if not self._thread_lock.acquire(blocking):
+            return False
+
+        if self._depth:
+            if exclusive and not self._exclusive:
+                self._thread_lock.release()
+                raise RuntimeError("Cannot upgrade a shared lock to exclusive")
+            self._depth += 1
+            return True
+
+        if fcntl is not None:
+            if self._fd is None:
+                self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            operation = fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH
+            try:
+                fcntl.flock(self._fd, operation if blocking else operation | fcntl.LOCK_NB)
+            except BlockingIOError:
+                self._thread_lock.release()
+                return False
+            except BaseException:
+                self._thread_lock.release()
+                raise
+
+        self._exclusive = exclusive
+        self._depth = 1
+        return True
+
+    def release(self) -> None:
+        """Release one level of the lock."""
+        self._depth -= 1
+        if self._depth == 0 and fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._thread_lock.release()
+
+    @contextmanager
+    def shared(self) -> Iterator[None]:
+        """Hold the lock shared (readers)."""
+        self.acquire(exclusive=False)
+        try:
+            yield
+        finally:
+            self.release()
+
+    @contextmanager
+    def exclusive(self) -> Iterator[None]:
+        """Hold the lock exclusively (writers)."""
+        self.acquire(exclusive=True)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def close(self) -> None:
+        """Close the lock file descriptor."""
+        with self._thread_lock:
+            if self._fd is not None and not self._depth:
+                os.close(self._fd)
+                self._fd = None
+
+
+def write_atomic(path: Path, payload: bytes, fsync: bool = True) -> int:
+    """
+    Replace a file so readers see either the old or the new content.
+
+    The payload goes to a uniquely named temporary file in the same
+    directory, which is flushed to disk and then renamed over the
+    target. Concurrent writers never share a temporary file, and a crash
+    at any point leaves the previous file intact.
+
+    Args:
+        path: File to replace
+        payload: New file content
+        fsync: Flush the file and its directory to stable storage
+
+    Returns:
+        Number of bytes written
+    """
+    fd, tmp_name = tempfile.mkstemp(
+        dir=str(path.parent), prefix=f".{path.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+
+    if fsync:
+        fsync_dir(path.parent)
+    return len(payload)
+
+
+class VersionCounter:
+    """
+    Store version persisted as an 8-byte counter in a sidecar file.
+
+    Writers bump it while holding the store's exclusive lock, so other
+    processes can tell whether the store changed by reading 8 bytes
+    instead of statting or re-reading the index. The sidecar is not
+    fsynced: after an OS crash it may lag behind the journal, which only
+    costs watchers a refresh.
+    """
+
+    FORMAT = struct.Struct("<Q")
+
+    def __init__(self, path: Path):
+        """
+        Initialize the counter.
+
+        Args:
+            path: Sidecar file (created on first use, never removed)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._fd: Optional[int] = None
+
+    def _read(self) -> int:
+        """Read the counter (caller holds ``_lock``)."""
+        if self._fd is None:
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        os.lseek(self._fd, 0, os.SEEK_SET)
+        data = os.read(self._fd, self.FORMAT.size)
+        return self.FORMAT.unpack(data)[0] if len(data) == self.FORMAT.size else 0
+
+    def read(self) -> int:
+        """Get the current version (0 for a new store)."""
+        with self._lock:
+            return self._read()
+
+    def bump(self) -> int:
+        """
+        Increment the version. Call with the store's exclusive lock held.
+
+        Returns:
+            The new version
+        """
+        with self._lock:
+            version = self._read() + 1
+            os.lseek(self._fd, 0, os.SEEK_SET)
+            os.write(self._fd, self.FORMAT.pack(version))
+            return version
+
+    def close(self) -> None:
+        """Close the sidecar file descriptor."""
+        with self._lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+
+def fsync_dir(directory: Path) -> None:
+    """Flush a directory entry (renames, unlinks) to stable storage."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:  # pragma: no cover - directories cannot be opened on Windows
+        return
+    try:
+        os.fsync(fd)
+    except OSError:  # pragma: no cover - not supported by every filesystem
+        pass
+    finally:
+        os.close(fd)
+
+
+class MemoryBackend(ABC):
+    """
+    Base class for memory storage backends.
+
+    Entries are exchanged as plain dictionaries (``MemoryEntry.model_dump()``)
+    and index metadata as dictionaries holding at least ``category``,
+    ``timestamp`` and ``relevance_score``.
+    """
+
+    name = "base"
+
+    # Whether every mutation raises (e.g. a mapped snapshot)
+    read_only = False
+
+    # Incremented whenever the loaded index changes, so callers can keep
+    # derived structures in sync without diffing the index on every call
+    generation = 0
+
+    # Recent (generation, key) changes kept for changes_since()
+    CHANGE_LOG_LIMIT = 10000
+    _change_log: Optional[List[Tuple[int, str]]] = None
+    _change_base = 0
+
+    def _record_change(self, key: str) -> None:
+        """Log that the current generation changed ``key``."""
+        if self._change_log is None:
+            self._reset_changes()
+        self._change_log.append((self.generation, key))
+        if len(self._change_log) > self.CHANGE_LOG_LIMIT:
+            dropped = self.CHANGE_LOG_LIMIT // 2
+            self._change_base = self._change_log[dropped - 1][0]
+            self._change_log = self._change_log[dropped:]
+
+    def _reset_changes(self) -> None:
+        """Start a new change log after the whole index was (re)loaded."""
+        self._change_log = []
+        self._change_base = self.generation
+
+    def changes_since(self, generation: int) -> Optional[List[str]]:
+        """
+        Get the keys changed after a generation.
+
+        Returns:
+            Changed keys (possibly repeated), or None if the log does not
+            reach back that far and the whole index must be rescanned
+        """
+        log = self._change_log
+        if log is None or generation < self._change_base:
+            return None
+        start = bisect.bisect_right(log, generation, key=lambda item: item[0])
+        return [key for _, key in log[start:]]
+
+    @abstractmethod
+    def load_index(self) -> Dict[str, Dict[str, Any]]:
+        """Get the index as a mapping of key to metadata."""
+
+    def version(self) -> int:
+        """
+        Get the store version, which increases with every committed
+        mutation by any process sharing the store.
+
+        The default only tracks changes this process has loaded;
+        backends override it with a persisted counter.
+        """
+        self.load_index()
+        return self.generation
+
+    @abstractmethod
+    def read_entry(
+        self,
+        key: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Read a full entry.
+
+        Args:
+            key: Memory key
+            metadata: Index metadata for the key, if already known
+
+        Returns:
+            Entry data or None if not found
+        """
+
+    @abstractmethod
+    def write_entry(
+        self,
+        entry: Dict[str, Any],
+        metadata: Dict[str, Any]
+    ) -> None:
+        """Insert or replace an entry and its index metadata."""
+
+    @abstractmethod
+    def delete_entry(self, key: str) -> bool:
+        """Delete an entry. Returns True if it existed."""
+
+    def apply_batch(self, operations: List[Dict[str, Any]]) -> None:
+        """
+        Apply several mutations with a single flush.
+
+        Args:
+            operations: ``{"op": "put", "entry": ..., "metadata": ...}`` or
+                ``{"op": "delete", "key": ...}`` dictionaries, in order
+        """
+        for operation in operations:
+            if operation["op"] == "put":
+                self.write_entry(operation["entry"], operation["metadata"])
+            else:
+                self.delete_entry(operation["key"])
+
+    def query(
+        self,
+        category: Optional[str] = None,
+        min_relevance: float = 0.0,
+        order_by: str = "relevance",
+        descending: bool = True,
+        limit: Optional[int] = None,
+        offset: int = 0
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Find index rows by category and relevance.
+
+        Only index metadata is inspected. When a limit is given, the
+        first ``offset + limit`` rows are picked with a heap instead of
+        sorting every match.
+
+        Args:
+            category: Filter by category (None = all categories)
+            min_relevance: Minimum relevance score
+            order_by: "relevance", "timestamp" or "key"
+            descending: Sort order
+            limit: Maximum number of rows (None = all)
+            offset: Number of leading rows to skip
+
+        Returns:
+            List of (key, metadata), ties broken by key
+        """
+        field = ORDER_FIELDS[order_by]
+        # Copy the rows first: the index may be the backend's live dict,
+        # which writers on other threads change while we filter it
+        rows = [
+            (key, metadata)
+            for key, metadata in list(self.load_index().items())
+            if (not category or metadata["category"] == category)
+            and metadata["relevance_score"] >= min_relevance
+        ]
+
+        def sort_key(row: Tuple[str, Dict[str, Any]]) -> Tuple:
+            return (row[0] if field == "key" else row[1][field], row[0])
+
+        if limit is None:
+            ordered = sorted(rows, key=sort_key, reverse=descending)
+            return ordered[offset:]
+
+        pick = heapq.nlargest if descending else heapq.nsmallest
+        return pick(offset + limit, rows, key=sort_key)[offset:]
+
+    def iter_entries(self) -> Iterator[Dict[str, Any]]:
+        """Iterate over all stored entries."""
+        for key, metadata in list(self.load_index().items()):
+            entry = self.read_entry(key, metadata)
+            if entry:
+                yield entry
+
+    def stats(self) -> Dict[str, Any]:
+        """Get backend statistics."""
+        return {"backend": self.name}
+
+    def close(self) -> None:
+        """Release any resources held by the backend."""
+
+
+class JSONFileBackend(MemoryBackend):
+    """
+    Stores each entry as ``<key>.json`` next to a shared ``index.json``.
+
+    Mutations are not written to the entry files and index directly.
+    Each one is a single line appended to ``journal.jsonl``, which is
+    replayed on top of the ``index.json`` snapshot when the index is
+    loaded. Once the journal grows past ``compact_threshold`` records, a
+    background thread compacts it: the journal is rotated aside, pending
+    entry files are written, a new snapshot replaces ``index.json`` and
+    the rotated journal is removed. Replaying a record twice is harmless,
+    so a crash at any point during compaction loses nothing.
+
+    The parsed index is kept in memory. It is only re-read when the
+    snapshot changes on disk, and only the new tail of the journal is
+    replayed when another process appends to it.
+
+    Entry files live directly in the directory, or with a sharded layout
+    (``shard_width`` > 0) in subdirectories named after the first hex
+    digits of a hash of the key, e.g. ``3f/<key>.json``. The layout is
+    recorded in ``layout.json``; ``migrate_layout()`` moves an existing
+    store online. Index rows hold each entry's relative path, so a store
+    with mixed layouts stays readable.
+
+    Several processes may share the directory. Index loads hold
+    ``.lock`` shared and appends hold it exclusively, so readers run in
+    parallel while writers are serialized; only one process compacts at
+    a time (``.compact.lock``). Appends and snapshots are fsynced, and a
+    torn journal line left by a crash is truncated by the next writer.
+    Each append also bumps the store version in ``.version`` (see
+    ``VersionCounter``).
+    """
+
+    name = "json"
+
+    LAYOUT_FILE = "layout.json"
+    VERSION_FILE = ".version"
+
+    def __init__(
+        self,
+        memory_dir: Path,
+        compact_threshold: Optional[int] = 1000,
+        fsync: bool = True,
+        shard_width: Optional[int] = None
+    ):
+        """
+        Initialize the JSON file backend.
+
+        Args:
+            memory_dir: Directory for storing memory files
+            compact_threshold: Journal records that trigger a background
+                compaction (None disables automatic compaction)
+            fsync: Flush journal appends and snapshots to stable storage
+            shard_width: Hex digits of the key hash used as subdirectory
+                for new entry files (0 = flat; None = as recorded in
+                layout.json). Existing files are moved by migrate_layout()
+        """
+        self.memory_dir = memory_dir
+        self.memory_dir.mkdir(parents=True, exist_ok=True)
+        self.index_file = self.memory_dir / "index.json"
+        self.journal_file = self.memory_dir / "journal.jsonl"
+        self.compacting_file = self.memory_dir / "journal.jsonl.compacting"
+        self.layout_file = self.memory_dir / self.LAYOUT_FILE
+        self._version = VersionCounter(self.memory_dir / self.VERSION_FILE)
+        self.compact_threshold = compact_threshold
+        self.fsync = fsync
+
+        self._lock = threading.RLock()
+        self._file_lock = FileLock(self.memory_dir / ".lock")
+        self._compaction_file_lock = FileLock(self.memory_dir / ".compact.lock")
+        self._compact_lock = threading.Lock()
+        self._compaction_thread: Optional[threading.Thread] = None
+
+        # In-memory state: snapshot + replayed journal
+        self._index: Optional[Dict[str, Dict[str, Any]]] = None
+        self._pending: Dict[str, Dict[str, Any]] = {}  # Bodies only in the journal
+        self._tombstones: Dict[str, str] = {}  # Deleted key -> stale entry file
+        self._signature: Optional[Tuple] = None
+        self._journal_offset = 0
+        self._journal_records = 0
+
+        # Statistics
+        self._index_hits = 0
+        self._index_misses = 0
+        self._tail_replays = 0
+        self._compactions = 0
+        self._flushes = 0
+        self._bytes_written = 0
+        self._compaction_bytes = 0
+
+        if not self.index_file.exists():
+            with self._file_lock.exclusive():
+                if not self.index_file.exists():
+                    self._write_json(self.index_file, {})
+
+        self.shard_width = 0
+        self._shard_dirs: set = set()
+        if shard_width is None:
+            self._read_layout()
+        else:
+            with self._file_lock.exclusive():
+                self._set_layout(shard_width)
+
+    @staticmethod
+    def _stat(path: Path) -> Optional[Tuple[int, int, int]]:
+        """Get the (inode, size, mtime_ns) signature of a file."""
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+    def _current_signature(self) -> Tuple:
+        """Signature of the snapshot, rotated journal and live journal."""
+        return (
+            self._stat(self.index_file),
+            self._stat(self.compacting_file),
+            self._stat(self.journal_file)
+        )
+
+    @staticmethod
+    def _encode(data: Any) -> bytes:
+        """Serialize data the way entry files and snapshots are stored."""
+        return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+    def _write_json(self, path: Path, data: Any) -> int:
+        """
+        Atomically write a JSON file (see ``write_atomic``).
+
+        Returns:
+            Number of bytes written
+        """
+        return write_atomic(path, self._encode(data), fsync=self.fsync)
+
+    def _entry_file_name(self, key: str) -> str:
+        """Relative path of the entry file for a key in the current layout."""
+        if not self.shard_width:
+            return f"{key}.json"
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=8).hexdigest()
+        return f"{digest[:self.shard_width]}/{key}.json"
+
+    def _read_layout(self) -> None:
+        """Load the shard width recorded in layout.json (flat if missing)."""
+        try:
+            with open(self.layout_file, 'r', encoding='utf-8') as f:
+                self.shard_width = int(json.load(f).get("shard_width", 0))
+        except FileNotFoundError:
+            self.shard_width = 0
+
+    def _set_layout(self, shard_width: int) -> None:
+        """Record the layout for every process (caller holds the lock)."""
+        if shard_width < 0 or shard_width > 16:
+            raise ValueError("shard_width must be between 0 and 16")
+        self._read_layout()
+        if shard_width != self.shard_width or not self.layout_file.exists():
+            self._write_json(self.layout_file, {"shard_width": shard_width})
+        self.shard_width = shard_width
+
+    def _entry_path(self, file_name: str) -> Path:
+        """Absolute path of an entry file, creating its shard directory."""
+        path = self.memory_dir / file_name
+        parent = path.parent
+        if parent != self.memory_dir and parent not in self._shard_dirs:
+            parent.mkdir(exist_ok=True)
+            self._shard_dirs.add(parent)
+        return path
+
+    def _apply(self, record: Dict[str, Any]) -> None:
+        """Apply one journal record to the in-memory state."""
+        self.generation += 1
+        key = record["key"]
+        self._record_change(key)
+        if record["op"] == "put":
+            self._index[key] = record["metadata"]
+            self._pending[key] = record["entry"]
+            self._tombstones.pop(key, None)
+        elif record["op"] == "delete":
+            metadata = self._index.pop(key, None)
+            self._pending.pop(key, None)
+            if metadata is not None:
+                self._tombstones[key] = metadata["file"]
+        elif record["op"] == "move" and key in self._index:
+            # Entry file relinked to another path by a layout migration
+            self._index[key] = {**self._index[key], "file": record["file"]}
+
+    def _replay(self, path: Path, offset: int = 0) -> int:
+        """
+        Replay journal records starting at a byte offset.
+
+        A trailing line without a newline (torn append) is left for a
+        later replay.
+
+        Returns:
+            Offset just past the last complete record
+        """
+        try:
+            with open(path, 'rb') as f:
+                f.seek(offset)
+                data = f.read()
+        except FileNotFoundError:
+            return offset
+
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            if line.strip():
+                self._apply(json.loads(line))
+                self._journal_records += 1
+        return offset + end
+
+    def _reload(self, signature: Tuple) -> None:
+        """Rebuild the in-memory state from the snapshot and journals."""
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                self._index = json.load(f)
+        except FileNotFoundError:
+            self._index = {}
+
+        self._pending = {}
+        self._tombstones = {}
+        self._journal_records = 0
+        self._read_layout()
+        self.generation += 1
+        self._reset_changes()
+        self._replay(self.compacting_file)
+        self._journal_offset = self._replay(self.journal_file)
+        self._signature = signature
+
+    def load_index(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Load the memory index.
+
+        Returns the cached index unless the files changed on disk since
+        they were last read. Disk reads hold the directory lock shared.
+        """
+        with self._lock, self._file_lock.shared():
+            signature = self._current_signature()
+            journal = signature[2]
+
+            if self._index is not None:
+                caught_up = journal is None or journal[1] == self._journal_offset
+                if signature == self._signature and caught_up:
+                    self._index_hits += 1
+                    return self._index
+
+                # Another writer appended to the journal: replay the tail only
+                previous_journal = self._signature[2]
+                if (
+                    signature[:2] == self._signature[:2]
+                    and journal is not None
+                    and (previous_journal is None or journal[0] == previous_journal[0])
+                    and journal[1] >= self._journal_offset
+                ):
+                    self._journal_offset = self._replay(
+                        self.journal_file, self._journal_offset
+                    )
+                    self._signature = signature
+                    self._tail_replays += 1
+                    return self._index
+
+            self._index_misses += 1
+            self._reload(signature)
+            return self._index
+
+    def _append(self, records: List[Dict[str, Any]]) -> None:
+        """Append records to the journal and apply them in memory."""
+        payload = "".join(
+            json.dumps(record, ensure_ascii=False) + "\n" for record in records
+        ).encode('utf-8')
+
+        with self._lock, self._file_lock.exclusive():
+            # Catch up with other writers; the lock keeps them out until
+            # our records are on disk
+            self.load_index()
+            with open(self.journal_file, 'ab') as f:
+                if f.tell() > self._journal_offset:
+                    # Torn record from a writer that crashed mid-append
+                    f.truncate(self._journal_offset)
+                f.write(payload)
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+                self._journal_offset = f.tell()
+
+            for record in records:
+                self._apply(record)
+            self._version.bump()
+            self._journal_records += len(records)
+            self._flushes += 1
+            self._bytes_written += len(payload)
+            self._signature = self._current_signature()
+
+        self._maybe_compact()
+
+    def read_entry(
+        self,
+        key: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Read a full entry from the journal state or its file."""
+        with self._lock:
+            if metadata is None:
+                metadata = self.load_index().get(key)
+                if metadata is None:
+                    return None
+            pending = self._pending.get(key)
+
+        if pending is not None:
+            return dict(pending)
+
+        try:
+            with open(self.memory_dir / metadata["file"], 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            pass
+
+        # The file may have been moved by a layout migration since the
+        # caller's metadata was read
+        current = self.load_index().get(key)
+        if current is None or current.get("file") == metadata["file"]:
+            return None
+        return self.read_entry(key, current)
+
+    def _put_record(
+        self,
+        entry: Dict[str, Any],
+        metadata: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Build the journal record for an insert or replace."""
+        key = entry["key"]
+        return {
+            "op": "put",
+            "key": key,
+            "metadata": {**metadata, "file": self._entry_file_name(key)},
+            "entry": entry
+        }
+
+    def write_entry(
+        self,
+        entry: Dict[str, Any],
+        metadata: Dict[str, Any]
+    ) -> None:
+        """Journal an insert or replace."""
+        self._append([self._put_record(entry, metadata)])
+
+    def delete_entry(self, key: str) -> bool:
+        """Journal a delete."""
+        with self._lock:
+            if key not in self.load_index():
+                return False
+            self._append([{"op": "delete", "key": key}])
+        return True
+
+    def apply_batch(self, operations: List[Dict[str, Any]]) -> None:
+        """Journal several mutations with a single append."""
+        records = [
+            self._put_record(op["entry"], op["metadata"])
+            if op["op"] == "put"
+            else {"op": "delete", "key": op["key"]}
+            for op in operations
+        ]
+        if records:
+            self._append(records)
+
+    def _maybe_compact(self) -> None:
+        """Start a background compaction once the journal is large enough."""
+        if self.compact_threshold is None:
+            return
+        if self._journal_records < self.compact_threshold:
+            return
+        if self._compaction_thread and self._compaction_thread.is_alive():
+            return
+
+        self._compaction_thread = threading.Thread(
+            target=self.compact,
+            name="memory-journal-compaction",
+            daemon=True
+        )
+        self._compaction_thread.start()
+
+    def compact(self) -> bool:
+        """
+        Fold the journal into entry files and a new index snapshot.
+
+        Writers are only blocked while the journal is rotated and while
+        the new snapshot is swapped in; entry files are written outside
+        the directory lock. Returns immediately if another process is
+        already compacting.
+
+        Returns:
+            True if anything was compacted
+        """
+        with self._compact_lock:
+            if not self._compaction_file_lock.acquire(exclusive=True, blocking=False):
+                return False
+            try:
+                return self._compact()
+            finally:
+                self._compaction_file_lock.release()
+
+    def _compact(self) -> bool:
+        """Compact while holding the compaction locks."""
+        with self._lock, self._file_lock.exclusive():
+            self.load_index()
+            if self._journal_records == 0:
+                return False
+
+            if self.compacting_file.exists():
+                # Leftover from an interrupted compaction: everything
+                # is folded in while holding the lock
+                index = dict(self._index)
+                self._write_entry_files(index, dict(self._pending), dict(self._tombstones))
+                self._compaction_bytes += self._write_json(self.index_file, index)
+                if self.journal_file.exists():
+                    self.journal_file.unlink()
+                self.compacting_file.unlink()
+                self._reload(self._current_signature())
+                self._compactions += 1
+                return True
+
+            os.replace(self.journal_file, self.compacting_file)
+            index = dict(self._index)
+            pending = dict(self._pending)
+            tombstones = self._tombstones
+            self._tombstones = {}
+            self._journal_offset = 0
+            self._journal_records = 0
+            self._signature = self._current_signature()
+
+        self._write_entry_files(index, pending, tombstones)
+        payload = self._encode(index)
+
+        with self._lock, self._file_lock.exclusive():
+            # Readers never see the old snapshot without the rotated
+            # journal, so swap both while holding the lock
+            write_atomic(self.index_file, payload, fsync=self.fsync)
+            self.compacting_file.unlink()
+            if self.fsync:
+                fsync_dir(self.memory_dir)
+            self._compaction_bytes += len(payload)
+            for key, entry in pending.items():
+                if self._pending.get(key) is entry:
+                    del self._pending[key]
+            self._signature = (
+                self._current_signature()[:2] + (self._signature[2],)
+            )
+            self._compactions += 1
+        return True
+
+    def _write_entry_files(
+        self,
+        index: Dict[str, Dict[str, Any]],
+        pending: Dict[str, Dict[str, Any]],
+        tombstones: Dict[str, str]
+    ) -> None:
+        """Write pending entry files and drop deleted ones."""
+        written = 0
+        for key, entry in pending.items():
+            if key in index:
+                written += self._write_json(self._entry_path(index[key]["file"]), entry)
+
+        for key, file_name in tombstones.items():
+            if key not in index:
+                stale_file = self.memory_dir / file_name
+                if stale_file.exists():
+                    stale_file.unlink()
+
+        self._compaction_bytes += written
+
+    def migrate_layout(self, shard_width: int = 2, chunk_size: int = 1000) -> int:
+        """
+        Move entry files to another layout while the store stays in use.
+
+        The new layout is recorded first, so every process writes new
+        entries to it after its next reload. Existing files are then
+        hard-linked to their new paths (entries whose body is still only
+        in the journal are written there) and the change is journaled, one
+        chunk of keys per exclusive lock, so readers and writers in other
+        processes interleave with the migration. Old paths are removed
+        once no index row references them; readers holding a stale path
+        fall back to the current index. Running it again resumes an
+        interrupted migration.
+
+        Args:
+            shard_width: Target shard width (0 = flat layout)
+            chunk_size: Keys moved per lock acquisition
+
+        Returns:
+            Number of moved entries
+
+        Example:
+            >>> backend = JSONFileBackend(Path(".claude/memories"))
+            >>> backend.migrate_layout(shard_width=2)
+            48213
+        """
+        with self._lock, self._file_lock.exclusive():
+            self._set_layout(shard_width)
+            to_move = [
+                key for key, metadata in self.load_index().items()
+                if metadata["file"] != self._entry_file_name(key)
+            ]
+            sources = {metadata["file"] for metadata in self._index.values()}
+
+        moved = 0
+        for start in range(0, len(to_move), chunk_size):
+            with self._lock, self._file_lock.exclusive():
+                index = self.load_index()
+                records = []
+                for key in to_move[start:start + chunk_size]:
+                    metadata = index.get(key)
+                    target = self._entry_file_name(key)
+                    if metadata is None or metadata["file"] == target:
+                        continue
+                    pending = self._pending.get(key)
+                    if pending is not None:
+                        # The body may only exist in a journal another
+                        # process is compacting to the old path right now
+                        self._write_json(self._entry_path(target), pending)
+                    else:
+                        self._link(self.memory_dir / metadata["file"], self._entry_path(target))
+                    records.append({"op": "move", "key": key, "file": target})
+                if records:
+                    self._append(records)
+                    moved += len(records)
+
+        self.compact()
+
+        with self._lock, self._file_lock.exclusive():
+            referenced = {metadata["file"] for metadata in self.load_index().values()}
+            for file_name in sources - referenced:
+                try:
+                    (self.memory_dir / file_name).unlink()
+                except FileNotFoundError:
+                    pass
+            if self.fsync:
+                fsync_dir(self.memory_dir)
+        return moved
+
+    @staticmethod
+    def _link(source: Path, target: Path) -> None:
+        """Hard-link (or copy where links are unsupported) an entry file."""
+        try:
+            os.link(source, target)
+            return
+        except FileNotFoundError:
+            return
+        except FileExistsError:
+            pass
+        except OSError:
+            write_atomic(target, source.read_bytes(), fsync=False)
+            return
+
+        # Replace a leftover from an interrupted run
+        tmp_path = target.with_name(f".{target.name}.link")
+        if os.path.lexists(tmp_path):
+            os.unlink(tmp_path)
+        os.link(source, tmp_path)
+        os.replace(tmp_path, target)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get index cache and journal statistics."""
+        total = self._index_hits + self._index_misses
+        return {
+            "backend": self.name,
+            "hits": self._index_hits,
+            "misses": self._index_misses,
+            "hit_rate": self._index_hits / total if total else 0.0,
+            "tail_replays": self._tail_replays,
+            "entries": len(self._index or {}),
+            "journal_records": self._journal_records,
+            "compactions": self._compactions,
+            "shard_width": self.shard_width,
+            "flushes": self._flushes,
+            "bytes_written": self._bytes_written,
+            "compaction_bytes": self._compaction_bytes
+        }
+
+    def version(self) -> int:
+        """Get the store version from the ``.version`` sidecar."""
+        return self._version.read()
+
+    def close(self) -> None:
+        """Wait for a running background compaction to finish."""
+        thread = self._compaction_thread
+        if thread is not None:
+            thread.join()
+        self._file_lock.close()
+        self._compaction_file_lock.close()
+        self._version.close()
+
+
+class SQLiteBackend(MemoryBackend):
+    """
+    Stores all entries in a single SQLite database.
+
+    The database runs in WAL mode so readers never block the writer,
+    and every mutation is a single transaction, so processes sharing the
+    database rely on SQLite's own locking. The index is served from
+    the ``category``, ``relevance_score`` and ``timestamp`` columns,
+    each of which has its own B-tree index. Every transaction bumps
+    ``PRAGMA user_version``, which serves as the store version.
+    """
+
+    name = "sqlite"
+
+    # Seconds a writer waits for another process's transaction to commit
+    BUSY_TIMEOUT = 30.0
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS memories (
+            key TEXT PRIMARY KEY,
+            category TEXT NOT NULL,
+            timestamp TEXT NOT NULL,
+            relevance_score REAL NOT NULL,
+            metadata TEXT NOT NULL DEFAULT '{}',
+            entry TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_memories_category
+            ON memories(category);
+        CREATE INDEX IF NOT EXISTS idx_memories_relevance
+            ON memories(relevance_score);
+        CREATE INDEX IF NOT EXISTS idx_memories_timestamp
+            ON memories(timestamp);
+    """
+
+    def __init__(self, db_path: Path):
+        """
+        Initialize the SQLite backend.
+
+        Args:
+            db_path: Path to the database file (created if missing)
+        """
+        self.db_path = db_path
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            str(self.db_path),
+            check_same_thread=False,
+            isolation_level=None,  # Transactions are managed explicitly
+            timeout=self.BUSY_TIMEOUT
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+
+        # In-process index cache, invalidated by PRAGMA data_version
+        # (changes on commits from other connections) and local writes
+        self._index_cache: Optional[Dict[str, Dict[str, Any]]] = None
+        self._index_signature: Optional[Tuple[int, int]] = None
+        self._local_writes = 0
+        self._index_hits = 0
+        self._index_misses = 0
+        self._flushes = 0
+        self._bytes_written = 0
+
+    def _signature(self) -> Tuple[int, int]:
+        """Get the current (data_version, local writes) signature."""
+        data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        return (data_version, self._local_writes)
+
+    @staticmethod
+    def _row_metadata(row: Tuple) -> Dict[str, Any]:
+        """Build index metadata from a (category, timestamp, score, extra) row."""
+        category, timestamp, relevance_score, extra = row
+        return {
+            **json.loads(extra),
+            "category": category,
+            "timestamp": timestamp,
+            "relevance_score": relevance_score
+        }
+
+    def load_index(self) -> Dict[str, Dict[str, Any]]:
+        """Load the index, reusing the cached copy when nothing changed."""
+        with self._lock:
+            signature = self._signature()
+            if self._index_cache is not None and signature == self._index_signature:
+                self._index_hits += 1
+                return self._index_cache
+
+            self._index_misses += 1
+            rows = self._conn.execute(
+                "SELECT key, category, timestamp, relevance_score, metadata "
+                "FROM memories"
+            )
+            index = {row[0]: self._row_metadata(row[1:]) for row in rows}
+
+            self.generation += 1
+            self._reset_changes()
+            self._index_cache = index
+            self._index_signature = signature
+            return index
+
+    def query(
+        self,
+        category: Optional[str] = None,
+        min_relevance: float = 0.0,
+        order_by: str = "relevance",
+        descending: bool = True,
+        limit: Optional[int] = None,
+        offset: int = 0
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        """Find index rows using the category, relevance and timestamp indexes."""
+        column = ORDER_FIELDS[order_by]
+        direction = "DESC" if descending else "ASC"
+        sql = (
+            "SELECT key, category, timestamp, relevance_score, metadata "
+            "FROM memories WHERE relevance_score >= ?"
+        )
+        params: List[Any] = [min_relevance]
+        if category:
+            sql += " AND category = ?"
+            params.append(category)
+        sql += f" ORDER BY {column} {direction}, key {direction}"
+        if limit is not None or offset:
+            sql += " LIMIT ? OFFSET ?"
+            params.extend([-1 if limit is None else limit, offset])
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [(row[0], self._row_metadata(row[1:])) for row in rows]
+
+    def read_entry(
+        self,
+        key: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Read a full entry by primary key."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT entry FROM memories WHERE key = ?", (key,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def write_entry(
+        self,
+        entry: Dict[str, Any],
+        metadata: Dict[str, Any]
+    ) -> None:
+        """Insert or replace an entry in one transaction."""
+        self.apply_batch([{"op": "put", "entry": entry, "metadata": metadata}])
+
+    def delete_entry(self, key: str) -> bool:
+        """Delete an entry in one transaction."""
+        with self._lock:
+            fresh = self._cache_is_fresh()
+            with self._transaction():
+                cursor = self._conn.execute(
+                    "DELETE FROM memories WHERE key = ?", (key,)
+                )
+            self._flushes += 1
+            self._update_cache(fresh, [{"op": "delete", "key": key}])
+            return cursor.rowcount > 0
+
+    def apply_batch(self, operations: List[Dict[str, Any]]) -> None:
+        """Apply several mutations in one transaction."""
+        if not operations:
+            return
+
+        written = 0
+        with self._lock:
+            fresh = self._cache_is_fresh()
+            with self._transaction() as conn:
+                for op in operations:
+                    if op["op"] == "delete":
+                        conn.execute("DELETE FROM memories WHERE key = ?", (op["key"],))
+                        continue
+
+                    entry, metadata = op["entry"], op["metadata"]
+                    extra = json.dumps({
+                        k: v for k, v in metadata.items()
+                        if k not in ("category", "timestamp", "relevance_score")
+                    }, ensure_ascii=False)
+                    data = json.dumps(entry, ensure_ascii=False)
+                    conn.execute(
+                        "INSERT OR REPLACE INTO memories "
+                        "(key, category, timestamp, relevance_score, metadata, entry) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (
+                            entry["key"],
+                            metadata["category"],
+                            metadata["timestamp"],
+                            metadata["relevance_score"],
+                            extra,
+                            data
+                        )
+                    )
+                    written += len(extra.encode('utf-8')) + len(data.encode('utf-8'))
+            self._flushes += 1
+            self._bytes_written += written
+            self._update_cache(fresh, operations)
+
+    def version(self) -> int:
+        """Get the store version (``PRAGMA user_version``)."""
+        with self._lock:
+            return self._conn.execute("PRAGMA user_version").fetchone()[0]
+
+    def _cache_is_fresh(self) -> bool:
+        """Whether the cached index reflects every committed change."""
+        return (
+            self._index_cache is not None
+            and self._signature() == self._index_signature
+        )
+
+    def _update_cache(self, fresh: bool, operations: List[Dict[str, Any]]) -> None:
+        """Apply our own committed operations to the cached index."""
+        self.generation += 1
+        if not fresh:
+            self._index_cache = None
+            self._reset_changes()
+            return
+
+        for op in operations:
+            key = op["key"] if op["op"] == "delete" else op["entry"]["key"]
+            self._record_change(key)
+            if op["op"] == "delete":
+                self._index_cache.pop(key, None)
+            else:
+                self._index_cache[key] = dict(op["metadata"])
+        self._index_signature = self._signature()
+
+    def iter_entries(self, chunk_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """
+        Stream all entries straight from the table.
+
+        Rows are fetched in key order, ``chunk_size`` at a time, so the
+        connection is never held while the caller consumes entries.
+        """
+        last_key = ""
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT key, entry FROM memories WHERE key > ? "
+                    "ORDER BY key LIMIT ?",
+                    (last_key, chunk_size)
+                ).fetchall()
+            if not rows:
+                return
+            for _, data in rows:
+                yield json.loads(data)
+            last_key = rows[-1][0]
+
+    def _transaction(self) -> "_Transaction":
+        """Open an IMMEDIATE transaction (use as a context manager)."""
+        return _Transaction(self)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get index cache statistics."""
+        total = self._index_hits + self._index_misses
+        return {
+            "backend": self.name,
+            "hits": self._index_hits,
+            "misses": self._index_misses,
+            "hit_rate": self._index_hits / total if total else 0.0,
+            "entries": len(self._index_cache or {}),
+            "flushes": self._flushes,
+            "bytes_written": self._bytes_written
+        }
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+class _Transaction:
+    """Context manager wrapping BEGIN IMMEDIATE / COMMIT / ROLLBACK."""
+
+    def __init__(self, backend: SQLiteBackend):
+        self.backend = backend
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.backend._conn.execute("BEGIN IMMEDIATE")
+        return self.backend._conn
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            conn = self.backend._conn
+            # Bumped inside the transaction, so it commits with the change
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            conn.execute(f"PRAGMA user_version = {version + 1}")
+            conn.execute("COMMIT")
+            self.backend._local_writes += 1
+        else:
+            self.backend._conn.execute("ROLLBACK")
+
+
+def create_backend(name: str, memory_dir: Path) -> MemoryBackend:
+    """
+    Create a storage backend by name.
+
+    Args:
+        name: Backend name ("json" or "sqlite")
+        memory_dir: Memory directory the backend should live in
+
+    Returns:
+        Initialized backend
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    if name == SQLiteBackend.name:
+        return SQLiteBackend(memory_dir / "memories.db")
+    if name == JSONFileBackend.name:
+        return JSONFileBackend(memory_dir)
+    raise ValueError(
+        f"Unknown memory backend '{name}'. Available backends: json, sqlite"
+    )
+
+
+def migrate_to_sharded_layout(
+    memory_dir: Path,
+    shard_width: int = 2,
+    chunk_size: int = 1000
+) -> int:
+    """
+    Move a JSON memory store to the hash-sharded layout.
+
+    Safe to run while other processes use the store; see
+    ``JSONFileBackend.migrate_layout()``.
+
+    Args:
+        memory_dir: Directory holding ``index.json`` and the entry files
+        shard_width: Hex digits of the key hash per subdirectory name
+            (2 = 256 subdirectories)
+        chunk_size: Keys moved per lock acquisition
+
+    Returns:
+        Number of moved entries
+
+    Example:
+        >>> migrate_to_sharded_layout(Path(".claude/memories"))
+        >>> manager = MemoryManager(Path(".claude/memories"))  # Keeps the layout
+    """
+    backend = JSONFileBackend(memory_dir)
+    try:
+        return backend.migrate_layout(shard_width, chunk_size)
+    finally:
+        backend.close()
+
+
+def migrate_json_to_sqlite(
+    memory_dir: Path,
+    db_path: Optional[Path] = None
+) -> int:
+    """
+    One-shot migration from the JSON file layout to SQLite.
+
+    Reads ``index.json`` and every entry file in ``memory_dir`` and
+    inserts them into the database in a single transaction. The JSON
+    files are left untouched so the migration can be verified before
+    removing them. Running it again simply replaces existing rows.
+
+    Args:
+        memory_dir: Directory holding ``index.json`` and ``<key>.json`` files
+        db_path: Target database (default: ``memory_dir / "memories.db"``)
+
+    Returns:
+        Number of migrated entries
+
+    Example:
+        >>> migrated = migrate_json_to_sqlite(Path(".claude/memories"))
+        >>> manager = MemoryManager(Path(".claude/memories"), backend="sqlite")
+    """
+    source = JSONFileBackend(memory_dir)
+    target = SQLiteBackend(db_path or memory_dir / "memories.db")
+
+    migrated = 0
+    try:
+        with target._lock:
+            with target._transaction() as conn:
+                for key, metadata in source.load_index().items():
+                    entry = source.read_entry(key, metadata)
+                    if entry is None:
+                        continue
+
+                    extra = {
+                        k: v for k, v in metadata.items()
+                        if k not in ("category", "timestamp", "relevance_score", "file")
+                    }
+                    conn.execute(
+                        "INSERT OR REPLACE INTO memories "
+                        "(key, category, timestamp, relevance_score, metadata, entry) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (
+                            key,
+                            entry["category"],
+                            entry["timestamp"],
+                            entry["relevance_score"],
+                            json.dumps(extra, ensure_ascii=False),
+                            json.dumps(entry, ensure_ascii=False)
+                        )
+                    )
+                    migrated += 1
+    finally:
+        target.close()
+
+    return migrated
@@ -338,14 +338,14 @@ Your role:
 5. Ensure coding standards are met
 
 Validation checklist:
- Code passes linting (ruff/pylint)
- Type checking passes (mypy)
- All tests pass
- Test coverage >80%
- No security vulnerabilities
- Documentation is complete
- Required files exist
- Code follows project conventions
+□ Code passes linting (ruff/pylint)
+□ Type checking passes (mypy)
+□ All tests pass
+□ Test coverage >80%
+□ No security vulnerabilities
+□ Documentation is complete
+□ Required files exist
+□ Code follows project conventions
 
 Tools to use:
 - ruff: For linting and formatting
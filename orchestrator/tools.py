@@ -10,27 +10,34 @@ This module defines custom tools that the orchestrator uses to:
 
 import json
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Union
 from claude_agent_sdk import tool, create_sdk_mcp_server
 
-from .memory import MemoryManager
+from .memory import AsyncMemoryManager, MemoryManager
 from .models import ProjectStructure, FileDefinition, AgentConfig
 
 
 def create_orchestrator_tools(
     working_dir: Path,
-    memory: MemoryManager
+    memory: Union[AsyncMemoryManager, MemoryManager]
 ):
     """
     Create the orchestrator MCP server with custom tools.
 
+    Memory I/O is awaited through ``AsyncMemoryManager`` so tool handlers
+    never block the event loop. Memories stored by concurrent tool calls
+    are group-committed: each call returns once its memory is flushed,
+    sharing the flush with the calls queued alongside it.
+
     Args:
         working_dir: Base directory for project generation
-        memory: Memory manager instance
+        memory: Async memory manager (a MemoryManager is wrapped)
 
     Returns:
         MCP server with orchestrator tools
     """
+    if isinstance(memory, MemoryManager):
+        memory = AsyncMemoryManager(memory)
 
     @tool(
         "create_project_structure",
@@ -98,7 +105,7 @@ def create_orchestrator_tools(
                 created_files.append(file_def["path"])
 
             # Store in memory
-            memory.store_architectural_decision(
+            await memory.store_architectural_decision(
                 decision=f"Created {project_type} project: {project_name}",
                 context=f"Directories: {', '.join(created_dirs)}"
             )
@@ -210,7 +217,7 @@ This agent should be used when you need to:
                 f.write(agent_content)
 
             # Store pattern in memory
-            memory.store_pattern(
+            await memory.store_pattern(
                 pattern_name=f"agent_{agent_name}",
                 pattern_description=f"Use {agent_name} agent for: {agent_purpose}"
             )
@@ -276,23 +283,23 @@ This agent should be used when you need to:
 
 > {description}
 
-## = Project Type
+## 📋 Project Type
 
 **{project_type}**
 
-## ( Features
+## ✨ Features
 
 {chr(10).join(f'- {feature}' for feature in features)}
 
-## = Setup
+## 🚀 Setup
 
 {setup_instructions}
 
-## = Usage
+## 📖 Usage
 
 {usage_examples}
 
-## > Testing
+## 🧪 Testing
 
 ```bash
 # Run tests
@@ -302,19 +309,19 @@ pytest tests/
 pytest --cov=src tests/
 ```
 
-## = Project Structure
+## 📁 Project Structure
 
 ```
 {project_name}/
-   src/              # Source code
-   tests/            # Test files
-   docs/             # Documentation
-   .claude/          # Claude Code configuration
-      agents/       # Specialized agents
-   README.md
+├── src/              # Source code
+├── tests/            # Test files
+├── docs/             # Documentation
+├── .claude/          # Claude Code configuration
+│   └── agents/       # Specialized agents
+└── README.md
 ```
 
-## > Claude Code Integration
+## 🤖 Claude Code Integration
 
 This project is configured to work with Claude Code. Available agents:
 
@@ -322,7 +329,7 @@ This project is configured to work with Claude Code. Available agents:
 - Use `/prp-execute` for structured implementation
 - Check `PLANNING.md` for architecture details
 
-## = License
+## 📝 License
 
 [Add license information]
 
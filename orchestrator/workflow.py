@@ -7,8 +7,9 @@ and generating automation projects through coordinated subagent execution.
 
 import asyncio
 import json
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Union, AsyncIterator, Callable, List
 from datetime import datetime
 
 from .models import (
@@ -17,9 +18,31 @@ from .models import (
     ValidationResult,
     OrchestrationResult,
     FileDefinition,
-    AgentConfig
+    AgentConfig,
+    WorkflowEvent
 )
-from .memory import MemoryManager
+from .checkpoints import CheckpointStore
+from .events import ProgressReporter
+from .intent_cache import IntentCache
+from .memory import AsyncMemoryManager, MemoryManager, strip_occurrences
+from .scheduler import DEFAULT_MAX_CONCURRENCY, DAGScheduler
+from .sessions import ClientPool
+
+# Token budget for learned memories in the intent-analysis prompt
+MEMORY_CONTEXT_TOKENS = 600
+
+# Subagent tasks: result name -> (agent, delegate method, tasks it needs
+# besides the project structure)
+SUBAGENT_TASKS = {
+    "requirements": ("requirements_analyst", "_delegate_to_requirements_analyst", ()),
+    "code": ("code_generator", "_delegate_to_code_generator", ("requirements",)),
+    "tests": ("test_writer", "_delegate_to_test_writer", ("requirements",)),
+    "docs": ("documentation_writer", "_delegate_to_documentation_writer", ()),
+}
+
+# Phases persisted for resume. Validation only reads the generated files,
+# so it always runs again.
+CHECKPOINTED_PHASES = ("intent", "structure", *SUBAGENT_TASKS)
 
 
 class OrchestrationWorkflow:
@@ -32,30 +55,83 @@ class OrchestrationWorkflow:
     3. Parallel subagent execution
     4. Project validation
     5. Documentation generation
+
+    Phases and subagent delegations are declared as a dependency graph
+    and run by a ``DAGScheduler``, so each starts as soon as its inputs
+    are ready: the test writer and code generator start from the
+    requirements spec, and the documentation writer from the project
+    structure, without waiting for each other.
+
+    Subagents are delegated through ``pool`` when one is set, each on a
+    session of its own, so they really run at the same time. Without a
+    pool they share ``client`` one at a time.
+
+    With an ``intent_cache``, a request analyzed before with the same
+    model and memory context reuses the stored intent instead of
+    querying the model.
+
+    ``execute_stream()`` runs the same workflow while yielding progress
+    events (``WorkflowEvent``), ending with the result.
     """
 
     def __init__(
         self,
-        memory: MemoryManager,
+        memory: Union[AsyncMemoryManager, MemoryManager],
         working_dir: Path,
-        client=None
+        client=None,
+        pool: Optional[ClientPool] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        intent_cache: Optional[IntentCache] = None,
+        model: Optional[str] = None
     ):
         """
         Initialize orchestration workflow.
 
         Args:
-            memory: Memory manager instance
+            memory: Async memory manager (a MemoryManager is wrapped)
             working_dir: Base directory for project generation
             client: ClaudeSDKClient instance (set after initialization)
+            pool: Sessions for delegated subagents (default: share client)
+            max_concurrency: Maximum number of phases or subagents running
+                at once
+            intent_cache: Cache of earlier intent analyses (default: none)
+            model: Model analyzing requests, part of the intent cache key
         """
+        if isinstance(memory, MemoryManager):
+            memory = AsyncMemoryManager(memory)
         self.memory = memory
         self.working_dir = working_dir
         self.client = client  # Will be set by OrchestratorAgent
+        self.pool = pool
+        self.max_concurrency = max_concurrency
+        self.intent_cache = intent_cache
+        self.model = model
+        self._client_lock = asyncio.Lock()
+        self._progress: Optional[ProgressReporter] = None  # Set while streaming
+
+    @asynccontextmanager
+    async def _session(self) -> AsyncIterator[Any]:
+        """
+        Get a client for one subagent delegation.
+
+        Yields:
+            A pooled session, or the shared client held exclusively so
+            that concurrent delegations do not interleave on it
+        """
+        if self.pool is not None:
+            async with self.pool.session() as client:
+                yield client
+        else:
+            async with self._client_lock:
+                yield self.client
 
     async def execute(
         self,
         user_request: str,
-        additional_context: Optional[str] = None
+        additional_context: Optional[str] = None,
+        checkpoints: Optional[CheckpointStore] = None,
+        bypass_cache: bool = False,
+        on_event: Optional[Callable[[WorkflowEvent], None]] = None
     ) -> OrchestrationResult:
         """
         Execute the complete orchestration workflow.
@@ -63,40 +139,92 @@ class OrchestrationWorkflow:
         Args:
             user_request: User's automation request
             additional_context: Optional additional context
+            checkpoints: Run store; each completed phase is saved to it,
+                and phases it already holds are not run again
+            bypass_cache: Analyze the intent even if a cached analysis
+                exists (the cache entry is refreshed)
+            on_event: Receives progress events as they happen, the
+                result event last (see ``execute_stream()``)
 
         Returns:
             OrchestrationResult with complete project details
 
-        Workflow:
-        1. Analyze intent  AutomationIntent
-        2. Generate project structure  ProjectStructure
-        3. Delegate to subagents (parallel):
-           - requirements_analyst: Create specs
-           - code_generator: Write code
-           - test_writer: Write tests
-           - documentation_writer: Create docs
-        4. Validate project  ValidationResult
-        5. Return OrchestrationResult
+        Workflow (each step starts once the steps it needs are done):
+        1. Analyze intent → AutomationIntent
+        2. Generate project structure → ProjectStructure
+        3. Delegate to subagents:
+           - requirements_analyst: Create specs (after 2)
+           - code_generator: Write code (after the specs)
+           - test_writer: Write tests (after the specs)
+           - documentation_writer: Create docs (after 2)
+        4. Validate project → ValidationResult (after 3)
+        5. Return OrchestrationResult, with the schedule's critical path
+           and per-step queue/run times in ``artifacts["schedule"]``
+           (resumed phases are listed under ``skipped``)
         """
-        try:
-            # Phase 1: Analyze intent
-            intent = await self._analyze_intent(user_request, additional_context)
+        scheduler = DAGScheduler(max_concurrency=self.max_concurrency)
+        scheduler.add(
+            "intent",
+            lambda results: self._analyze_intent(
+                user_request, additional_context, bypass_cache=bypass_cache
+            )
+        )
+        scheduler.add(
+            "structure",
+            lambda results: self._generate_project_structure(results["intent"]),
+            after=["intent"]
+        )
+        self._add_subagent_tasks(scheduler, after=["structure"])
+        scheduler.add(
+            "validation",
+            lambda results: self.validate_project(
+                Path(self.working_dir) / results["intent"].project_name
+            ),
+            after=list(SUBAGENT_TASKS)
+        )
 
-            # Phase 2: Generate project structure
-            project = await self._generate_project_structure(intent)
+        progress = ProgressReporter(on_event) if on_event is not None else None
+        self._progress = progress
+        started: Dict[str, float] = {}
+
+        def phase_started(phase: str) -> None:
+            started[phase] = progress.elapsed()
+            progress.emit("phase_started", phase=phase)
+
+        def phase_finished(phase: str, value: Any) -> None:
+            if checkpoints is not None and phase in CHECKPOINTED_PHASES:
+                checkpoints.save(phase, value)
+            if progress is not None:
+                progress.emit(
+                    "phase_finished",
+                    phase=phase,
+                    data={"run_seconds": progress.elapsed() - started[phase]}
+                )
 
-            # Phase 3: Parallel subagent execution
-            subagent_results = await self._execute_subagents_parallel(
-                intent, project
+        try:
+            completed = {}
+            if checkpoints is not None:
+                completed = {
+                    phase: value
+                    for phase, value in checkpoints.load().items()
+                    if phase in CHECKPOINTED_PHASES
+                }
+            if progress is not None:
+                for phase in completed:
+                    progress.emit("phase_finished", phase=phase, data={"resumed": True})
+
+            results = await scheduler.run(
+                completed,
+                on_result=phase_finished,
+                on_start=phase_started if progress is not None else None
             )
 
-            # Phase 4: Validate project
-            validation = await self.validate_project(
-                Path(self.working_dir) / intent.project_name
-            )
+            intent = results["intent"]
+            project = results["structure"]
+            validation = results["validation"]
+            subagent_results = self._subagent_results(results)
 
-            # Phase 5: Return result
-            return OrchestrationResult(
+            result = OrchestrationResult(
                 success=validation.is_valid,
                 project_path=str(Path(self.working_dir) / intent.project_name),
                 intent=intent,
@@ -105,23 +233,96 @@ class OrchestrationWorkflow:
                 execution_time_seconds=0.0,  # Will be set by OrchestratorAgent
                 artifacts={
                     "subagent_results": subagent_results,
-                    "memory_entries": len(self.memory._load_index())
+                    "schedule": scheduler.report(),
+                    "intent_cache": (
+                        self.intent_cache.stats() if self.intent_cache is not None else None
+                    ),
+                    "memory_entries": await self.memory.count_memories(),
+                    "memory_writes": self.memory.write_stats()
                 }
             )
 
         except Exception as e:
-            return OrchestrationResult(
+            result = OrchestrationResult(
                 success=False,
                 intent=None,
                 error=str(e),
                 execution_time_seconds=0.0,
-                artifacts={"error_type": type(e).__name__}
+                artifacts={
+                    "error_type": type(e).__name__,
+                    "schedule": scheduler.report()
+                }
             )
 
+        finally:
+            self._progress = None
+
+        if progress is not None:
+            progress.emit("result", result=result)
+        return result
+
+    async def execute_stream(
+        self,
+        user_request: str,
+        additional_context: Optional[str] = None,
+        checkpoints: Optional[CheckpointStore] = None,
+        bypass_cache: bool = False
+    ) -> AsyncIterator[WorkflowEvent]:
+        """
+        Execute the workflow, yielding progress events as they happen.
+
+        The last event has kind "result" and carries the
+        OrchestrationResult. Closing the iterator early (``aclose()``,
+        leaving a ``contextlib.aclosing`` block, or cancelling the
+        consuming task) cancels the workflow.
+
+        Args:
+            user_request: User's automation request
+            additional_context: Optional additional context
+            checkpoints: Run store (see ``execute()``)
+            bypass_cache: Skip the intent cache lookup
+
+        Yields:
+            WorkflowEvent objects: phase_started, phase_finished,
+            subagent_message, tool_call, files_written and finally result
+
+        Example:
+            >>> async with aclosing(workflow.execute_stream(request)) as events:
+            ...     async for event in events:
+            ...         print(f"{event.elapsed_seconds:6.1f}s {event.kind} {event.phase}")
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        runner = asyncio.ensure_future(self.execute(
+            user_request,
+            additional_context,
+            checkpoints=checkpoints,
+            bypass_cache=bypass_cache,
+            on_event=queue.put_nowait
+        ))
+        runner.add_done_callback(lambda _: queue.put_nowait(None))
+
+        try:
+            while True:
+                event = await queue.get()
+                if event is None:
+                    runner.result()  # Raises if the run died without a result
+                    return
+                yield event
+        finally:
+            if not runner.done():
+                runner.cancel()
+                await asyncio.gather(runner, return_exceptions=True)
+
+    def _observe(self, message: Any, phase: str, agent: Optional[str] = None) -> None:
+        """Report a received SDK message when the run is streamed."""
+        if self._progress is not None:
+            self._progress.observe(message, phase, agent)
+
     async def _analyze_intent(
         self,
         user_request: str,
-        additional_context: Optional[str] = None
+        additional_context: Optional[str] = None,
+        bypass_cache: bool = False
     ) -> AutomationIntent:
         """
         Analyze user intent using structured output.
@@ -129,12 +330,31 @@ class OrchestrationWorkflow:
         Args:
             user_request: User's request
             additional_context: Optional additional context
+            bypass_cache: Query the model even if the intent cache holds
+                an analysis of this request
 
         Returns:
             Structured AutomationIntent
         """
         # Get relevant memory context
-        memory_context = self.memory.get_relevant_context("general_automation")
+        memory_context = await self.memory.get_relevant_context(
+            "general_automation",
+            query=user_request,
+            max_tokens=MEMORY_CONTEXT_TOKENS
+        )
+
+        cache_key = None
+        if self.intent_cache is not None:
+            # Occurrence counts change on every run that stores the same
+            # pattern again; they do not change the analysis
+            cache_key = self.intent_cache.key(
+                user_request, additional_context, self.model,
+                strip_occurrences(memory_context)
+            )
+            if not bypass_cache:
+                cached = self.intent_cache.get(cache_key)
+                if cached is not None:
+                    return cached
 
         # Construct analysis prompt
         analysis_prompt = f"""Analyze this automation request and extract structured information:
@@ -170,6 +390,7 @@ Think step by step:
         # Get structured response
         intent_data = None
         async for message in self.client.receive_response():
+            self._observe(message, "intent")
             # In real implementation, would extract structured output
             # For now, we'll parse from the response
             if hasattr(message, 'content'):
@@ -203,6 +424,9 @@ Think step by step:
             additional_notes=additional_context
         )
 
+        if cache_key is not None:
+            self.intent_cache.put(cache_key, intent)
+
         return intent
 
     async def _generate_project_structure(
@@ -232,7 +456,8 @@ Then generate agent definitions for each required agent: {', '.join(intent.requi
 
         # Process tool calls
         async for message in self.client.receive_response():
-            pass  # Tools are executed automatically
+            # Tools are executed automatically
+            self._observe(message, "structure")
 
         # Build ProjectStructure from created project
         structure = ProjectStructure(
@@ -272,13 +497,42 @@ Then generate agent definitions for each required agent: {', '.join(intent.requi
 
         return structure
 
+    def _add_subagent_tasks(self, scheduler: DAGScheduler, after: List[str]) -> None:
+        """
+        Declare the subagent delegations in a schedule.
+
+        Each task reads ``intent`` and ``structure`` from the results and
+        is skipped (result None) if the intent does not require its agent.
+
+        Args:
+            scheduler: Schedule to add the tasks to
+            after: Tasks that produce ``intent`` and ``structure``
+        """
+        for name, (agent, method, needs) in SUBAGENT_TASKS.items():
+            async def run(results, agent=agent, delegate=getattr(self, method)):
+                intent = results["intent"]
+                if agent not in intent.required_agents:
+                    return None
+                return await delegate(intent, results["structure"])
+
+            scheduler.add(name, run, after=[*after, *needs])
+
+    @staticmethod
+    def _subagent_results(results: Dict[str, Any]) -> Dict[str, Any]:
+        """Collect the results of the subagents that ran."""
+        collected = {"requirements": results.get("requirements")}
+        for name in SUBAGENT_TASKS:
+            if name != "requirements" and results.get(name) is not None:
+                collected[name] = results[name]
+        return collected
+
     async def _execute_subagents_parallel(
         self,
         intent: AutomationIntent,
         project: ProjectStructure
     ) -> Dict[str, Any]:
         """
-        Execute specialized subagents in parallel.
+        Execute specialized subagents, each as soon as its inputs are ready.
 
         Args:
             intent: Automation intent
@@ -287,44 +541,10 @@ Then generate agent definitions for each required agent: {', '.join(intent.requi
         Returns:
             Dictionary of subagent execution results
         """
-        # Define subagent tasks
-        tasks = []
-
-        # Requirements analysis (must complete first)
-        if "requirements_analyst" in intent.required_agents:
-            req_task = self._delegate_to_requirements_analyst(intent, project)
-            tasks.append(("requirements", req_task))
-
-        # Wait for requirements
-        if tasks:
-            req_results = await asyncio.gather(*[t[1] for t in tasks])
-
-        # Parallel tasks (can run simultaneously)
-        parallel_tasks = []
-
-        if "code_generator" in intent.required_agents:
-            code_task = self._delegate_to_code_generator(intent, project)
-            parallel_tasks.append(("code", code_task))
-
-        if "test_writer" in intent.required_agents:
-            test_task = self._delegate_to_test_writer(intent, project)
-            parallel_tasks.append(("tests", test_task))
-
-        if "documentation_writer" in intent.required_agents:
-            doc_task = self._delegate_to_documentation_writer(intent, project)
-            parallel_tasks.append(("docs", doc_task))
-
-        # Execute parallel tasks
-        parallel_results = await asyncio.gather(*[t[1] for t in parallel_tasks])
-
-        # Combine results
-        results = {
-            "requirements": req_results[0] if tasks else None
-        }
-        for i, (name, _) in enumerate(parallel_tasks):
-            results[name] = parallel_results[i]
-
-        return results
+        scheduler = DAGScheduler(max_concurrency=self.max_concurrency)
+        self._add_subagent_tasks(scheduler, after=["intent", "structure"])
+        results = await scheduler.run({"intent": intent, "structure": project})
+        return self._subagent_results(results)
 
     async def _delegate_to_requirements_analyst(
         self,
@@ -332,7 +552,8 @@ Then generate agent definitions for each required agent: {', '.join(intent.requi
         project: ProjectStructure
     ) -> Dict[str, Any]:
         """Delegate to requirements analyst agent."""
-        await self.client.query(f"""@requirements_analyst
+        async with self._session() as client:
+            await client.query(f"""@requirements_analyst
 
 Analyze the requirements for this automation project:
 
@@ -343,9 +564,9 @@ REQUIREMENTS: {', '.join(intent.key_requirements)}
 Create a detailed technical specification document in docs/requirements.md
 """)
 
-        # Collect response
-        async for message in self.client.receive_response():
-            pass
+            # Collect response
+            async for message in client.receive_response():
+                self._observe(message, "requirements", "requirements_analyst")
 
         return {"status": "completed", "agent": "requirements_analyst"}
 
@@ -355,7 +576,8 @@ Create a detailed technical specification document in docs/requirements.md
         project: ProjectStructure
     ) -> Dict[str, Any]:
         """Delegate to code generator agent."""
-        await self.client.query(f"""@code_generator
+        async with self._session() as client:
+            await client.query(f"""@code_generator
 
 Generate the core automation code for:
 
@@ -366,8 +588,8 @@ OBJECTIVE: {intent.main_objective}
 Create all necessary Python modules in src/ following best practices.
 """)
 
-        async for message in self.client.receive_response():
-            pass
+            async for message in client.receive_response():
+                self._observe(message, "code", "code_generator")
 
         return {"status": "completed", "agent": "code_generator"}
 
@@ -377,7 +599,8 @@ Create all necessary Python modules in src/ following best practices.
         project: ProjectStructure
     ) -> Dict[str, Any]:
         """Delegate to test writer agent."""
-        await self.client.query(f"""@test_writer
+        async with self._session() as client:
+            await client.query(f"""@test_writer
 
 Create comprehensive tests for the {intent.project_name} project.
 
@@ -385,8 +608,8 @@ Write unit tests in tests/ for all core functionality.
 Ensure >80% code coverage.
 """)
 
-        async for message in self.client.receive_response():
-            pass
+            async for message in client.receive_response():
+                self._observe(message, "tests", "test_writer")
 
         return {"status": "completed", "agent": "test_writer"}
 
@@ -396,7 +619,8 @@ Ensure >80% code coverage.
         project: ProjectStructure
     ) -> Dict[str, Any]:
         """Delegate to documentation writer agent."""
-        await self.client.query(f"""@documentation_writer
+        async with self._session() as client:
+            await client.query(f"""@documentation_writer
 
 Create comprehensive documentation for {intent.project_name}.
 
@@ -404,8 +628,8 @@ Use the generate_documentation tool to create README.md and PLANNING.md.
 Include setup instructions, usage examples, and API documentation.
 """)
 
-        async for message in self.client.receive_response():
-            pass
+            async for message in client.receive_response():
+                self._observe(message, "docs", "documentation_writer")
 
         return {"status": "completed", "agent": "documentation_writer"}
 
@@ -436,7 +660,7 @@ Provide a comprehensive validation report.
 """)
 
             async for message in self.client.receive_response():
-                pass
+                self._observe(message, "validation", "validator")
 
         # Build validation result
         # In production, this would parse validator output
@@ -0,0 +1,243 @@
+"""
+Integration Tests for concurrent access to a shared memory directory.
+
+Several orchestrator processes may share one ``.claude/memories``
+directory. These tests start 16 processes that store, update and read
+memories at the same time and check that no write is lost and that the
+directory is left readable.
+"""
+
+import asyncio
+import multiprocessing
+import threading
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from orchestrator.memory import AsyncMemoryManager, MemoryManager
+from orchestrator.models import MemoryEntry
+from orchestrator.storage import JSONFileBackend, migrate_to_sharded_layout
+
+PROCESSES = 16
+WRITES_PER_PROCESS = 40
+COROUTINES = 20
+DECISIONS_PER_COROUTINE = 10
+
+
+def hammer(memory_dir: str, backend: str, worker: int, barrier) -> None:
+    """Store, update and read back memories from one worker process."""
+    path = Path(memory_dir)
+    if backend == "json":
+        # Low threshold so compactions race with appends from other workers
+        store = JSONFileBackend(path, compact_threshold=50)
+    else:
+        store = backend
+    manager = MemoryManager(path, backend=store)
+    barrier.wait()
+
+    for i in range(WRITES_PER_PROCESS):
+        manager.store_memory(MemoryEntry(
+            key=f"worker_{worker:02d}_{i:03d}",
+            value=f"Pattern {i} learned by worker {worker}",
+            category="pattern",
+            timestamp=datetime.now().isoformat(),
+            relevance_score=0.5
+        ))
+        # Shared key updated by everyone: last writer wins, but the
+        # entry must always be readable
+        manager.store_memory(MemoryEntry(
+            key="shared_counter",
+            value=f"worker {worker} write {i}",
+            category="learned_preference",
+            timestamp=datetime.now().isoformat(),
+            relevance_score=1.0
+        ))
+        assert manager.retrieve_memory(f"worker_{worker:02d}_{i:03d}") is not None
+        assert manager.retrieve_memory("shared_counter") is not None
+
+    manager.update_relevance(f"worker_{worker:02d}_000", 0.9)
+    manager.close()
+
+
+def ingest(memory_dir: str, backend: str, worker: int, barrier) -> None:
+    """Store decisions from many coroutines at once in one worker process."""
+    async def produce(memory: AsyncMemoryManager, coroutine: int) -> None:
+        for i in range(DECISIONS_PER_COROUTINE):
+            await memory.store_architectural_decision(
+                f"Decision {i} of coroutine {coroutine} in worker {worker}"
+            )
+
+    async def main() -> None:
+        memory = AsyncMemoryManager(MemoryManager(Path(memory_dir), backend=backend))
+        barrier.wait()
+        await asyncio.gather(*(produce(memory, c) for c in range(COROUTINES)))
+        await memory.aclose()
+
+    asyncio.run(main())
+
+
+def run_workers(memory_dir: Path, backend: str, during=None, target=hammer) -> None:
+    """
+    Run all workers to completion and fail on any worker error.
+
+    ``during`` is called in this process once all workers are running.
+    """
+    context = multiprocessing.get_context("fork")
+    barrier = context.Barrier(PROCESSES + 1)
+    workers = [
+        context.Process(target=target, args=(str(memory_dir), backend, worker, barrier))
+        for worker in range(PROCESSES)
+    ]
+    for process in workers:
+        process.start()
+    barrier.wait()
+    if during:
+        during()
+    for process in workers:
+        process.join(timeout=120)
+
+    assert [process.exitcode for process in workers] == [0] * PROCESSES
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(),
+    reason="Requires the fork start method"
+)
+@pytest.mark.parametrize("backend", ["json", "sqlite"])
+class TestConcurrentWriters:
+    """Test 16 processes writing to one memory directory."""
+
+    def test_no_writes_lost(self, tmp_path, backend):
+        memory_dir = tmp_path / "memories"
+        MemoryManager(memory_dir, backend=backend).close()
+
+        run_workers(memory_dir, backend)
+
+        manager = MemoryManager(memory_dir, backend=backend)
+        keys = {entry.key for entry in manager.search_memories(category="pattern")}
+        assert keys == {
+            f"worker_{worker:02d}_{i:03d}"
+            for worker in range(PROCESSES)
+            for i in range(WRITES_PER_PROCESS)
+        }
+        assert manager.retrieve_memory("shared_counter").value.startswith("worker ")
+        assert len(manager.search_memories(category="pattern", min_relevance=0.9)) == PROCESSES
+
+    def test_directory_readable_after_compaction(self, tmp_path, backend):
+        memory_dir = tmp_path / "memories"
+        MemoryManager(memory_dir, backend=backend).close()
+
+        run_workers(memory_dir, backend)
+
+        manager = MemoryManager(memory_dir, backend=backend)
+        if backend == "json":
+            manager.backend.compact()
+            assert not manager.backend.compacting_file.exists()
+            assert not list(memory_dir.glob(".*.tmp"))
+
+        fresh = MemoryManager(memory_dir, backend=backend)
+        assert len(fresh.search_memories()) == PROCESSES * WRITES_PER_PROCESS + 1
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(),
+    reason="Requires the fork start method"
+)
+class TestOnlineLayoutMigration:
+    """Test migrating to the sharded layout while 16 processes write."""
+
+    def test_migration_during_writes(self, tmp_path):
+        memory_dir = tmp_path / "memories"
+        manager = MemoryManager(memory_dir)
+        for i in range(200):
+            manager.store_memory(MemoryEntry(
+                key=f"seed_{i:03d}",
+                value=f"Seed pattern {i}",
+                category="pattern",
+                timestamp=datetime.now().isoformat()
+            ))
+        manager.backend.compact()
+
+        run_workers(
+            memory_dir, "json",
+            during=lambda: migrate_to_sharded_layout(memory_dir, chunk_size=25)
+        )
+        migrate_to_sharded_layout(memory_dir)  # Entries written by stale workers
+
+        backend = JSONFileBackend(memory_dir)
+        index = backend.load_index()
+        assert len(index) == 200 + PROCESSES * WRITES_PER_PROCESS + 1
+        assert all(backend.read_entry(key, metadata) for key, metadata in index.items())
+        assert all("/" in metadata["file"] for metadata in index.values())
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(),
+    reason="Requires the fork start method"
+)
+@pytest.mark.parametrize("backend", ["json", "sqlite"])
+class TestHighRateIngestion:
+    """Test 16 processes storing decisions from 20 coroutines each."""
+
+    def test_no_decisions_lost(self, tmp_path, backend):
+        memory_dir = tmp_path / "memories"
+        MemoryManager(memory_dir, backend=backend).close()
+
+        run_workers(memory_dir, backend, target=ingest)
+
+        manager = MemoryManager(memory_dir, backend=backend)
+        decisions = manager.search_memories(category="architectural_decision")
+        assert len(decisions) == PROCESSES * COROUTINES * DECISIONS_PER_COROUTINE
+        assert len({entry.value for entry in decisions}) == len(decisions)
+
+
+@pytest.mark.parametrize("backend", ["json", "sqlite"])
+class TestThreadedSearches:
+    """Test searches on pool threads while another thread writes."""
+
+    def test_search_during_writes(self, tmp_path, backend):
+        manager = MemoryManager(tmp_path / "memories", backend=backend)
+        with manager.batch():
+            for i in range(3000):
+                manager.store_memory(MemoryEntry(
+                    key=f"seed_{i:04d}",
+                    value=f"Seed pattern {i}",
+                    category="pattern",
+                    timestamp=datetime.now().isoformat()
+                ))
+
+        done = threading.Event()
+        errors = []
+
+        def write():
+            try:
+                for i in range(300):
+                    manager.store_memory(MemoryEntry(
+                        key=f"new_{i:04d}",
+                        value=f"New pattern {i}",
+                        category="pattern",
+                        timestamp=datetime.now().isoformat()
+                    ))
+            finally:
+                done.set()
+
+        def search():
+            while not done.is_set():
+                try:
+                    manager.search_memories(category="pattern", limit=5)
+                    manager.search_memories(min_relevance=0.5, order_by="key")
+                except Exception as e:  # pragma: no cover - the regression
+                    errors.append(e)
+                    return
+
+        threads = [threading.Thread(target=write)] + [
+            threading.Thread(target=search) for _ in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=120)
+        manager.close()
+
+        assert errors == []
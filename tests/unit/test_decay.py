@@ -0,0 +1,83 @@
+"""
+Unit tests for time decay of memory relevance.
+"""
+
+from datetime import datetime
+
+import pytest
+
+import orchestrator.decay as decay
+from orchestrator.decay import SECONDS_PER_DAY, DecayIndex, DecayModel
+
+NOW = 1_700_000_000.0
+
+
+def iso(days_ago: float) -> str:
+    """ISO timestamp `days_ago` days before NOW (local time)."""
+    return datetime.fromtimestamp(NOW - days_ago * SECONDS_PER_DAY).isoformat()
+
+
+@pytest.fixture(params=[True, False], ids=["numpy", "arrays"])
+def vectorized(request, monkeypatch):
+    """Run a test with and without NumPy."""
+    if request.param and not decay.NUMPY_AVAILABLE:
+        pytest.skip("NumPy is not installed")
+    monkeypatch.setattr(decay, "NUMPY_AVAILABLE", request.param)
+
+
+class TestDecayModel:
+    """Test per-category half-lives."""
+
+    def test_half_life(self):
+        model = DecayModel({"pattern": 30.0})
+        assert model.decay(1.0, "pattern", age_days=30.0) == pytest.approx(0.5)
+        assert model.decay(0.8, "pattern", age_days=60.0) == pytest.approx(0.2)
+
+    def test_categories_without_half_life_never_decay(self):
+        model = DecayModel()
+        assert model.decay(1.0, "architectural_decision", age_days=3650.0) == 1.0
+        assert model.decay(1.0, "unknown", age_days=3650.0) == 1.0
+        assert DecayModel(default_half_life=10.0).decay(1.0, "unknown", 10.0) == 0.5
+
+    def test_future_timestamps_do_not_boost(self):
+        assert DecayModel().decay(0.5, "pattern", age_days=-30.0) == 0.5
+
+
+class TestDecayIndex:
+    """Test vectorized decay over index rows."""
+
+    def test_decays_all_rows(self, vectorized):
+        index = DecayIndex(DecayModel({"pattern": 10.0}))
+        index.add("fresh", "pattern", 1.0, iso(0))
+        index.add("old", "pattern", 1.0, iso(10))
+        index.add("decision", "architectural_decision", 0.9, iso(100))
+
+        decayed = dict(zip(index.keys, index.decayed(NOW)))
+        assert decayed["fresh"] == pytest.approx(1.0)
+        assert decayed["old"] == pytest.approx(0.5)
+        assert decayed["decision"] == pytest.approx(0.9)
+        assert index.score("old", NOW) == pytest.approx(0.5)
+
+    def test_remove_keeps_columns_aligned(self, vectorized):
+        index = DecayIndex(DecayModel({"pattern": 10.0}))
+        for i in range(5):
+            index.add(f"k{i}", "pattern", 1.0, iso(i * 10))
+        index.remove("k1")
+        index.add("k3", "pattern", 1.0, iso(0))  # Replace
+
+        decayed = dict(zip(index.keys, index.decayed(NOW)))
+        assert sorted(decayed) == ["k0", "k2", "k3", "k4"]
+        assert decayed["k3"] == pytest.approx(1.0)
+        assert decayed["k4"] == pytest.approx(1 / 16)
+
+    def test_top_and_changed(self, vectorized):
+        index = DecayIndex(DecayModel({"pattern": 10.0, "architectural_decision": 10.0}))
+        index.add("a", "architectural_decision", 1.0, iso(10))
+        index.add("b", "architectural_decision", 0.9, iso(0))
+        index.add("c", "pattern", 1.0, iso(0))
+
+        assert [key for key, _ in index.top(2, now=NOW)] == ["c", "b"]
+        assert index.top(5, category="architectural_decision", min_relevance=0.6, now=NOW) == [
+            ("b", pytest.approx(0.9))
+        ]
+        assert index.changed(0.1, now=NOW) == [("a", pytest.approx(0.5))]
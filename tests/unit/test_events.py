@@ -0,0 +1,209 @@
+"""
+Unit tests for streamed workflow progress events.
+"""
+
+import asyncio
+import time
+from contextlib import aclosing
+from types import SimpleNamespace
+
+import pytest
+
+from orchestrator.checkpoints import CheckpointStore
+from orchestrator.events import MESSAGE_PREVIEW_CHARS, ProgressReporter
+from orchestrator.memory import MemoryManager
+from orchestrator.workflow import OrchestrationWorkflow
+
+
+def text(value):
+    return SimpleNamespace(text=value)
+
+
+def tool(name, **tool_input):
+    return SimpleNamespace(name=name, input=tool_input)
+
+
+class TestProgressReporter:
+    """Test how SDK messages become events."""
+
+    def test_messages_tools_and_tokens(self):
+        events = []
+        reporter = ProgressReporter(events.append)
+        reporter.observe(
+            SimpleNamespace(content=[
+                text("Writing the parser"),
+                tool("Write", file_path="src/parser.py", content="..."),
+                tool("Bash", command="pytest")
+            ]),
+            phase="code",
+            agent="code_generator"
+        )
+        reporter.observe(SimpleNamespace(usage={"input_tokens": 120, "output_tokens": 30}))
+
+        assert [e.kind for e in events] == [
+            "tool_call", "files_written", "tool_call", "subagent_message"
+        ]
+        assert events[0].message == "Write"
+        assert events[1].files == ["src/parser.py"]
+        assert events[2].data == {"command": "pytest"}
+        assert events[3].message == "Writing the parser"
+        assert all(e.agent == "code_generator" and e.phase == "code" for e in events)
+        assert reporter.tokens == 150
+        assert reporter.emit("phase_finished", phase="code").tokens == 150
+
+    def test_long_and_unknown_messages(self):
+        events = []
+        reporter = ProgressReporter(events.append)
+        reporter.observe(SimpleNamespace(content="x" * (MESSAGE_PREVIEW_CHARS + 10)))
+        reporter.observe("plain string without content")
+        reporter.observe(SimpleNamespace(content=[SimpleNamespace(tool_use_id="1")]))
+
+        assert len(events) == 1
+        assert len(events[0].message) == MESSAGE_PREVIEW_CHARS
+        assert events[0].data["chars"] == MESSAGE_PREVIEW_CHARS + 10
+
+
+class ScriptedClient:
+    """SDK client stub answering every query like a subagent would."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.queries = 0
+        self.responses = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        pass
+
+    async def query(self, prompt):
+        self.queries += 1
+        self.agent = prompt.split()[0]
+
+    async def receive_response(self):
+        await asyncio.sleep(self.delay)
+        self.responses += 1
+        yield SimpleNamespace(content=[
+            text(f"{self.agent} working"),
+            tool("Write", file_path=f"out/{self.queries}.txt", content="...")
+        ])
+        yield SimpleNamespace(usage={"input_tokens": 10, "output_tokens": 5})
+
+
+class TestExecuteStream:
+    """Test the event stream of a workflow run."""
+
+    @pytest.mark.asyncio
+    async def test_events_end_with_result(self, tmp_path):
+        memory = MemoryManager(tmp_path / "memories")
+        client = ScriptedClient()
+        workflow = OrchestrationWorkflow(memory=memory, working_dir=tmp_path, client=client)
+        events = [event async for event in workflow.execute_stream("Process PDF invoices")]
+        memory.close()
+
+        assert events[0].kind == "phase_started" and events[0].phase == "intent"
+        assert events[-1].kind == "result"
+        assert events[-1].result.success
+        assert [e for e in events if e.kind == "result"] == [events[-1]]
+
+        phases = {"intent", "structure", "requirements", "code", "tests", "docs", "validation"}
+        assert {e.phase for e in events if e.kind == "phase_started"} == phases
+        assert {e.phase for e in events if e.kind == "phase_finished"} == phases
+        assert {e.agent for e in events if e.kind == "subagent_message"} == {
+            None, "requirements_analyst", "code_generator", "test_writer",
+            "documentation_writer", "validator"
+        }
+        written = [f for e in events if e.kind == "files_written" for f in e.files]
+        assert len(written) == client.queries
+
+        elapsed = [e.elapsed_seconds for e in events]
+        assert elapsed == sorted(elapsed)
+        assert events[-1].tokens == 15 * client.queries
+
+    @pytest.mark.asyncio
+    async def test_closing_early_cancels_the_run(self, tmp_path):
+        memory = MemoryManager(tmp_path / "memories")
+        client = ScriptedClient(delay=10)
+        workflow = OrchestrationWorkflow(memory=memory, working_dir=tmp_path, client=client)
+
+        start = time.perf_counter()
+        async with aclosing(workflow.execute_stream("Process PDF invoices")) as events:
+            async for event in events:
+                assert event.kind == "phase_started"
+                break
+        await asyncio.sleep(0.05)
+        memory.close()
+
+        assert time.perf_counter() - start < 5
+        assert client.queries <= 1
+        assert client.responses == 0
+        assert workflow._progress is None
+
+    @pytest.mark.asyncio
+    async def test_resumed_phases_reported(self, tmp_path):
+        memory = MemoryManager(tmp_path / "memories")
+        store = CheckpointStore.create(tmp_path / "runs", "Process PDF invoices")
+        workflow = OrchestrationWorkflow(memory=memory, working_dir=tmp_path, client=ScriptedClient())
+        await workflow.execute("Process PDF invoices", checkpoints=store)
+
+        events = [
+            event async for event in workflow.execute_stream(
+                "Process PDF invoices", checkpoints=store
+            )
+        ]
+        memory.close()
+
+        resumed = {e.phase for e in events if e.data.get("resumed")}
+        assert resumed == {"intent", "structure", "requirements", "code", "tests", "docs"}
+        assert [e.phase for e in events if e.kind == "phase_started"] == ["validation"]
+        assert events[-1].result.success
+
+
+class TestCreateAutomationStream:
+    """Test the agent's event stream with a stubbed SDK client."""
+
+    @pytest.mark.asyncio
+    async def test_stream_and_result(self, tmp_path, monkeypatch):
+        import orchestrator.agent as agent_module
+
+        monkeypatch.setattr(agent_module, "ClaudeSDKClient", lambda options=None: ScriptedClient())
+        orchestrator = agent_module.OrchestratorAgent(
+            working_dir=tmp_path, memory_dir=tmp_path / ".claude" / "memories", max_runs=1
+        )
+
+        events = [e async for e in orchestrator.create_automation_stream("Process PDF invoices")]
+        result = events[-1].result
+        assert events[-1].kind == "result"
+        assert result.success
+        assert result.execution_time_seconds == events[-1].elapsed_seconds
+        run = CheckpointStore.open(tmp_path / ".claude" / "runs", result.artifacts["run_id"])
+        assert run.run_info()["status"] == "completed"
+        assert run.load() == {}  # Nothing left to resume
+
+        # The non-streaming entry point returns the same kind of result
+        again = await orchestrator.create_automation("Process PDF invoices")
+        assert again.success
+        assert again.artifacts["intent_cache"]["hits"] == 1
+        runs = [p.name for p in (tmp_path / ".claude" / "runs").iterdir()]
+        assert runs == [again.artifacts["run_id"]]
+        orchestrator.memory.close()
+
+    @pytest.mark.asyncio
+    async def test_completed_run_is_not_resumed(self, tmp_path, monkeypatch):
+        import orchestrator.agent as agent_module
+
+        client = ScriptedClient()
+        monkeypatch.setattr(agent_module, "ClaudeSDKClient", lambda options=None: client)
+        orchestrator = agent_module.OrchestratorAgent(
+            working_dir=tmp_path, memory_dir=tmp_path / ".claude" / "memories"
+        )
+        result = await orchestrator.create_automation("Process PDF invoices")
+        queries = client.queries
+
+        with pytest.raises(ValueError, match="already completed"):
+            await orchestrator.resume(result.artifacts["run_id"])
+        orchestrator.memory.close()
+
+        assert result.success
+        assert client.queries == queries
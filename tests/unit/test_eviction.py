@@ -0,0 +1,61 @@
+"""
+Unit tests for memory eviction policies.
+"""
+
+import pytest
+
+from orchestrator.decay import SECONDS_PER_DAY
+from orchestrator.eviction import (
+    Candidate,
+    EvictionPolicy,
+    LRUPolicy,
+    RelevancePolicy,
+    TTLPolicy,
+    create_policy
+)
+
+NOW = 1_700_000_000.0
+
+
+def candidate(key: str, age_days: float = 0.0, idle_days: float = 0.0,
+              relevance: float = 1.0) -> Candidate:
+    """Build an eviction candidate relative to NOW."""
+    return Candidate(
+        key=key,
+        created=NOW - age_days * SECONDS_PER_DAY,
+        last_access=NOW - idle_days * SECONDS_PER_DAY,
+        relevance=relevance,
+        size=100
+    )
+
+
+class TestPolicies:
+    """Test victim selection."""
+
+    def test_lru_picks_least_recently_accessed(self):
+        candidates = [candidate("a", idle_days=1), candidate("b", idle_days=5),
+                      candidate("c", idle_days=3)]
+        assert LRUPolicy().victims(candidates, 2, NOW) == ["b", "c"]
+
+    def test_relevance_picks_lowest_then_least_recent(self):
+        candidates = [candidate("a", relevance=0.9), candidate("b", relevance=0.2, idle_days=1),
+                      candidate("c", relevance=0.2, idle_days=4)]
+        assert RelevancePolicy().victims(candidates, 2, NOW) == ["c", "b"]
+
+    def test_ttl_expires_per_category(self):
+        policy = TTLPolicy({"error_solution": 30})
+        candidates = [candidate("old", age_days=31), candidate("new", age_days=29)]
+
+        assert policy.expires
+        assert policy.expired("error_solution", candidates, NOW) == ["old"]
+        assert policy.expired("pattern", candidates, NOW) == []
+        assert policy.victims(candidates, 1, NOW) == ["old"]
+
+    def test_create_policy(self):
+        assert isinstance(create_policy("lru"), LRUPolicy)
+        ttl = TTLPolicy(7)
+        assert create_policy(ttl) is ttl
+        assert not isinstance(create_policy("relevance"), TTLPolicy)
+        assert isinstance(create_policy("relevance"), EvictionPolicy)
+        with pytest.raises(ValueError, match="Unknown eviction policy"):
+            create_policy("fifo")
@@ -0,0 +1,202 @@
+"""
+Unit tests for the persistent intent analysis cache.
+"""
+
+import os
+import time
+from datetime import datetime
+
+import pytest
+
+from orchestrator.intent_cache import IntentCache, normalize_request
+from orchestrator.memory import MemoryManager
+from orchestrator.models import AutomationIntent, MemoryEntry
+from orchestrator.workflow import OrchestrationWorkflow
+
+
+def make_intent(name: str = "invoice-processor") -> AutomationIntent:
+    return AutomationIntent(
+        project_name=name,
+        project_type="data_processing",
+        main_objective="Extract totals from PDF invoices",
+        key_requirements=["Parse PDFs"],
+        required_agents=["requirements_analyst"],
+        complexity_level="medium",
+        estimated_duration="2 days"
+    )
+
+
+class TestIntentCacheKey:
+    """Test what the cache key depends on."""
+
+    def test_normalization(self):
+        assert normalize_request("  Process PDF\n invoices. ") == "process pdf invoices"
+        assert normalize_request(None) == ""
+        assert IntentCache.key("Process PDF invoices") == IntentCache.key(
+            "process  pdf invoices!"
+        )
+
+    def test_inputs_change_the_key(self):
+        base = IntentCache.key("Process invoices", "Nightly", "sonnet", "## Memories")
+        assert base != IntentCache.key("Process receipts", "Nightly", "sonnet", "## Memories")
+        assert base != IntentCache.key("Process invoices", "Hourly", "sonnet", "## Memories")
+        assert base != IntentCache.key("Process invoices", "Nightly", "opus", "## Memories")
+        assert base != IntentCache.key("Process invoices", "Nightly", "sonnet", "## Other")
+
+
+class TestIntentCache:
+    """Test lookups, eviction and statistics."""
+
+    def test_miss_then_hit(self, tmp_path):
+        cache = IntentCache(tmp_path)
+        key = cache.key("Process invoices")
+        assert cache.get(key) is None
+
+        cache.put(key, make_intent())
+        assert cache.get(key) == make_intent()
+        # Persistent: a new instance (or process) sees the entry
+        assert IntentCache(tmp_path).get(key) == make_intent()
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+        assert stats["stores"] == 1
+        assert stats["entries"] == 1
+
+    def test_ttl_expiry(self, tmp_path):
+        cache = IntentCache(tmp_path, ttl_seconds=0.05)
+        key = cache.key("Process invoices")
+        cache.put(key, make_intent())
+        time.sleep(0.1)
+
+        assert cache.get(key) is None
+        assert cache.stats()["expired"] == 1
+        assert cache.stats()["entries"] == 0
+
+    def test_lru_eviction(self, tmp_path):
+        cache = IntentCache(tmp_path, max_entries=2)
+        first, second, third = (cache.key(f"Request {i}") for i in range(3))
+        cache.put(first, make_intent("first"))
+        cache.put(second, make_intent("second"))
+        now = time.time()
+        os.utime(tmp_path / f"{first}.json", (now - 100, now - 100))
+        os.utime(tmp_path / f"{second}.json", (now - 50, now - 50))
+
+        assert cache.get(first) is not None  # Now the most recently used
+        cache.put(third, make_intent("third"))
+
+        assert cache.get(second) is None
+        assert cache.get(first).project_name == "first"
+        assert cache.get(third).project_name == "third"
+        assert cache.stats()["evictions"] == 1
+
+    def test_clear(self, tmp_path):
+        cache = IntentCache(tmp_path)
+        cache.put(cache.key("Process invoices"), make_intent())
+        assert cache.clear() == 1
+        assert cache.stats()["entries"] == 0
+
+    def test_invalid_size(self, tmp_path):
+        with pytest.raises(ValueError):
+            IntentCache(tmp_path, max_entries=0)
+
+
+class CountingClient:
+    """SDK client stub counting intent-analysis queries."""
+
+    def __init__(self):
+        self.analyses = 0
+
+    async def query(self, prompt):
+        if prompt.startswith("Analyze this automation request"):
+            self.analyses += 1
+
+    async def receive_response(self):
+        yield "done"
+
+
+class TestWorkflowIntentCache:
+    """Test that the workflow skips repeated intent analyses."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_request_uses_cache(self, tmp_path):
+        memory = MemoryManager(tmp_path / "memories")
+        client = CountingClient()
+        workflow = OrchestrationWorkflow(
+            memory=memory,
+            working_dir=tmp_path,
+            client=client,
+            intent_cache=IntentCache(tmp_path / "intent_cache"),
+            model="sonnet"
+        )
+
+        first = await workflow._analyze_intent("Process PDF invoices")
+        second = await workflow._analyze_intent("process PDF invoices.")
+        assert client.analyses == 1
+        assert second == first
+
+        await workflow._analyze_intent("Process PDF invoices", bypass_cache=True)
+        assert client.analyses == 2
+
+        # New learned memories change the prompt, so the request is analyzed again
+        memory.store_memory(MemoryEntry(
+            key="pdf_tip",
+            value="Use pdfplumber to process PDF invoices",
+            category="pattern",
+            timestamp=datetime.now().isoformat(),
+            relevance_score=1.0
+        ))
+        await workflow._analyze_intent("Process PDF invoices")
+        memory.close()
+
+        assert client.analyses == 3
+        assert workflow.intent_cache.stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_merged_memories_keep_the_key(self, tmp_path):
+        memory = MemoryManager(tmp_path / "memories", merge_distance=3)
+        client = CountingClient()
+        workflow = OrchestrationWorkflow(
+            memory=memory,
+            working_dir=tmp_path,
+            client=client,
+            intent_cache=IntentCache(tmp_path / "intent_cache")
+        )
+
+        def learn(run):
+            # Every run stores the same pattern again; it is merged
+            memory.store_memory(MemoryEntry(
+                key=f"pdf_tip_{run}",
+                value="Use pdfplumber to process PDF invoices",
+                category="pattern",
+                timestamp=datetime.now().isoformat(),
+                relevance_score=1.0
+            ))
+
+        learn(1)
+        await workflow.execute("Process PDF invoices")
+        learn(2)
+        result = await workflow.execute("Process PDF invoices")
+        context = memory.get_relevant_context("general_automation", query="Process PDF invoices")
+        memory.close()
+
+        assert "(seen 2x)" in context
+        assert client.analyses == 1
+        assert result.artifacts["intent_cache"]["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_execute_reports_cache_stats(self, tmp_path):
+        memory = MemoryManager(tmp_path / "memories")
+        workflow = OrchestrationWorkflow(
+            memory=memory,
+            working_dir=tmp_path,
+            client=CountingClient(),
+            intent_cache=IntentCache(tmp_path / "intent_cache")
+        )
+        await workflow.execute("Process PDF invoices")
+        result = await workflow.execute("Process PDF invoices")
+        memory.close()
+
+        assert result.artifacts["intent_cache"]["hits"] == 1
+        assert workflow.client.analyses == 1
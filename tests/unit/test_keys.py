@@ -0,0 +1,55 @@
+"""
+Unit tests for time-ordered memory keys.
+"""
+
+import os
+import time
+
+import pytest
+
+import orchestrator.keys as keys
+from orchestrator.keys import (
+    ULID_LENGTH,
+    ULIDGenerator,
+    encode_ulid,
+    monotonic_key,
+    ulid_timestamp
+)
+
+
+class TestULID:
+    """Test ULID encoding and ordering."""
+
+    def test_encoding(self):
+        assert encode_ulid(0) == "0" * ULID_LENGTH
+        assert encode_ulid(2 ** 128 - 1) == "7" + "Z" * (ULID_LENGTH - 1)
+
+    def test_keys_are_strictly_increasing(self):
+        generator = ULIDGenerator()
+        ulids = [generator.new() for _ in range(10000)]
+        assert ulids == sorted(ulids)
+        assert len(set(ulids)) == len(ulids)
+
+    def test_timestamp_roundtrip(self):
+        before = time.time()
+        key = monotonic_key("arch")
+        assert key.startswith("arch_")
+        assert before - 0.001 <= ulid_timestamp(key) <= time.time()
+
+    def test_clock_going_back_keeps_order(self, monkeypatch):
+        generator = ULIDGenerator()
+        first = generator.new()
+        monkeypatch.setattr(keys.time, "time_ns", lambda: 0)
+        assert generator.new() > first
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="Requires fork")
+    def test_forked_child_starts_a_new_sequence(self):
+        generator = ULIDGenerator()
+        generator.new()
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.write(write_fd, str(generator._last_ms).encode())
+            os._exit(0)
+        os.waitpid(pid, 0)
+        assert os.read(read_fd, 64) == b"-1"
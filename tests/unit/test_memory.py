@@ -0,0 +1,1304 @@
+"""
+Unit tests for the orchestrator MemoryManager.
+
+Covers persistence of memory entries and the in-process caches that
+keep repeated lookups from re-reading the memory directory.
+"""
+
+import asyncio
+import gzip
+import json
+import time
+import pytest
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from orchestrator.eviction import TTLPolicy
+import orchestrator.memory as memory_module
+from orchestrator.memory import AsyncMemoryManager, MemoryManager, estimate_tokens
+from orchestrator.models import MemoryEntry
+from orchestrator.storage import (
+    FileLock,
+    JSONFileBackend,
+    SQLiteBackend,
+    migrate_json_to_sqlite,
+    migrate_to_sharded_layout,
+    write_atomic
+)
+
+
+def make_entry(key: str, value: str = "Prefer FastAPI for REST APIs",
+               category: str = "pattern", relevance: float = 1.0) -> MemoryEntry:
+    """Build a memory entry for tests."""
+    return MemoryEntry(
+        key=key,
+        value=value,
+        category=category,
+        timestamp=datetime.now().isoformat(),
+        relevance_score=relevance
+    )
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def manager(request, tmp_path: Path) -> MemoryManager:
+    """Memory manager backed by a temporary directory."""
+    manager = MemoryManager(tmp_path / "memories", backend=request.param)
+    yield manager
+    manager.close()
+
+
+class TestMemoryPersistence:
+    """Test basic store/retrieve/delete behavior."""
+
+    def test_store_and_retrieve(self, manager):
+        manager.store_memory(make_entry("api_pattern"))
+
+        entry = manager.retrieve_memory("api_pattern")
+        assert entry is not None
+        assert entry.value == "Prefer FastAPI for REST APIs"
+
+    def test_retrieve_missing_returns_none(self, manager):
+        assert manager.retrieve_memory("missing") is None
+
+    def test_delete(self, manager):
+        manager.store_memory(make_entry("api_pattern"))
+
+        assert manager.delete_memory("api_pattern") is True
+        assert manager.retrieve_memory("api_pattern") is None
+        assert manager.delete_memory("api_pattern") is False
+
+    def test_search_sorted_by_relevance(self, manager):
+        manager.store_memory(make_entry("low", relevance=0.2))
+        manager.store_memory(make_entry("high", relevance=0.9))
+        manager.store_memory(make_entry("mid", relevance=0.5))
+
+        keys = [e.key for e in manager.search_memories(min_relevance=0.3)]
+        assert keys == ["high", "mid"]
+
+    def test_update_relevance_clamps(self, manager):
+        manager.store_memory(make_entry("api_pattern"))
+
+        assert manager.update_relevance("api_pattern", 1.7) is True
+        assert manager.retrieve_memory("api_pattern").relevance_score == 1.0
+        assert manager.update_relevance("missing", 0.5) is False
+
+    def test_search_by_category(self, manager):
+        manager.store_memory(make_entry("decision", category="architectural_decision"))
+        manager.store_memory(make_entry("pattern"))
+
+        results = manager.search_memories(category="architectural_decision")
+        assert [e.key for e in results] == ["decision"]
+
+    def test_relevant_context_includes_decisions(self, manager):
+        manager.store_memory(make_entry(
+            "decision", "Use asyncio for all I/O", category="architectural_decision"
+        ))
+        manager.store_memory(make_entry("stale", "Unrelated pattern", relevance=0.3))
+
+        context = manager.get_relevant_context("api_automation")
+        assert context.startswith("RELEVANT PATTERNS FROM PREVIOUS PROJECTS:")
+        assert "Use asyncio for all I/O" in context
+        assert "Unrelated pattern" not in context
+
+    def test_export(self, manager, tmp_path):
+        manager.store_memory(make_entry("a"))
+        manager.store_memory(make_entry("b"))
+
+        output = tmp_path / "export.json"
+        manager.export_memories(output)
+
+        exported = json.loads(output.read_text(encoding='utf-8'))
+        assert sorted(m["key"] for m in exported) == ["a", "b"]
+
+
+class TestIndexCache:
+    """Test that the parsed index is reused until the store changes."""
+
+    def test_repeated_reads_hit_cache(self, manager):
+        for i in range(10):
+            manager.store_memory(make_entry(f"pattern_{i}"))
+        manager._load_index()
+
+        before = manager.cache_stats()
+        manager._load_index()
+        manager._load_index()
+        after = manager.cache_stats()
+
+        assert after["misses"] == before["misses"]
+        assert after["hits"] == before["hits"] + 2
+        assert after["entries"] == 10
+
+    @pytest.mark.parametrize("backend", ["json", "sqlite"])
+    def test_external_write_invalidates_cache(self, tmp_path, backend):
+        memory_dir = tmp_path / "memories"
+        writer = MemoryManager(memory_dir, backend=backend)
+        reader = MemoryManager(memory_dir, backend=backend)
+
+        writer.store_memory(make_entry("first"))
+        assert reader.retrieve_memory("first") is not None
+
+        writer.store_memory(make_entry("second"))
+        assert "second" in reader._load_index()
+        assert reader.retrieve_memory("second") is not None
+
+    def test_index_file_replaced_on_disk(self, tmp_path):
+        manager = MemoryManager(tmp_path / "memories")
+        manager.store_memory(make_entry("first"))
+        manager.retrieve_memory("first")
+
+        # Simulate another process compacting away every entry
+        with open(manager.backend.index_file, 'w', encoding='utf-8') as f:
+            json.dump({}, f)
+        manager.backend.journal_file.unlink()
+
+        assert "first" not in manager._load_index()
+
+
+class TestEntryCache:
+    """Test the LRU cache of parsed entries."""
+
+    LONG_VALUE = "Retry webhooks with exponential backoff. " * 20  # Longer than the preview
+
+    @staticmethod
+    def forbid_reads(manager, monkeypatch):
+        def read_entry(*args):
+            raise AssertionError("entry should come from the cache")
+
+        monkeypatch.setattr(manager.backend, "read_entry", read_entry)
+
+    def test_repeated_retrieve_skips_storage(self, manager, monkeypatch):
+        manager.store_memory(make_entry("hot", self.LONG_VALUE))
+        manager.retrieve_memory("hot")
+
+        with monkeypatch.context() as patch:
+            self.forbid_reads(manager, patch)
+            first = manager.retrieve_memory("hot")
+            second = manager.retrieve_memory("hot")
+
+        assert first.value == self.LONG_VALUE
+        assert first is not second  # Private copies
+        first.relevance_score = 0.1
+        assert manager.retrieve_memory("hot").relevance_score == 1.0
+        stats = manager.cache_stats()
+        assert stats["entry_hits"] == 3
+        assert stats["entry_misses"] == 1
+        assert stats["entry_hit_rate"] == 0.75
+
+    def test_writes_invalidate(self, manager):
+        manager.store_memory(make_entry("a", self.LONG_VALUE))
+        manager.retrieve_memory("a")
+
+        manager.store_memory(make_entry("a", "Changed"))
+        assert manager.retrieve_memory("a").value == "Changed"
+
+        manager.update_relevance("a", 0.4)
+        assert manager.retrieve_memory("a").relevance_score == 0.4
+
+        manager.delete_memory("a")
+        assert manager.retrieve_memory("a") is None
+        assert manager.cache_stats()["cached_entries"] == 0
+
+    def test_write_by_another_manager_invalidates(self, manager):
+        manager.store_memory(make_entry("shared", self.LONG_VALUE))
+        manager.retrieve_memory("shared")
+
+        backend = "sqlite" if isinstance(manager.backend, SQLiteBackend) else "json"
+        other = MemoryManager(manager.memory_dir, backend=backend)
+        other.update_relevance("shared", 0.3)
+        other.close()
+
+        assert manager.retrieve_memory("shared").relevance_score == 0.3
+
+    def test_repeated_search_hits_cache(self, manager, monkeypatch):
+        for i in range(5):
+            manager.store_memory(make_entry(f"p{i}", self.LONG_VALUE))
+        manager.search_memories(category="pattern")
+        misses = manager.cache_stats()["entry_misses"]
+
+        with monkeypatch.context() as patch:
+            self.forbid_reads(manager, patch)
+            results = manager.search_memories(category="pattern")
+
+        assert len(results) == 5
+        stats = manager.cache_stats()
+        assert stats["entry_misses"] == misses
+        assert stats["entry_hits"] == 5
+
+    def test_bounded_lru(self, tmp_path):
+        manager = MemoryManager(tmp_path / "memories", entry_cache_size=2)
+        for key in ("a", "b", "c"):
+            manager.store_memory(make_entry(key))
+        manager.retrieve_memory("a")
+        manager.retrieve_memory("b")
+        manager.retrieve_memory("a")
+        manager.retrieve_memory("c")
+
+        assert list(manager._entry_cache) == ["a", "c"]
+
+    def test_disabled(self, tmp_path):
+        manager = MemoryManager(tmp_path / "memories", entry_cache_size=0)
+        manager.store_memory(make_entry("a"))
+        manager.retrieve_memory("a")
+        manager.retrieve_memory("a")
+
+        assert manager.cache_stats()["cached_entries"] == 0
+        assert manager.cache_stats()["entry_hits"] == 0
+
+    def test_scans_do_not_fill_cache(self, manager):
+        for i in range(5):
+            manager.store_memory(make_entry(f"p{i}"))
+
+        list(manager.iter_memories(category="pattern"))
+        assert manager.cache_stats()["cached_entries"] == 0
+
+
+class TestStoreVersion:
+    """Test the persisted store version and watch()."""
+
+    def test_bumped_by_every_mutation(self, manager):
+        assert manager.version() == 0
+        manager.store_memory(make_entry("a"))
+        manager.update_relevance("a", 0.5)
+        manager.retrieve_memory("a")
+        manager.search_memories()
+        assert manager.version() == 2
+
+        manager.delete_memory("a")
+        assert manager.version() == 3
+
+    def test_batch_bumps_once(self, manager):
+        with manager.batch():
+            for i in range(10):
+                manager.store_memory(make_entry(f"p{i}"))
+            assert manager.version() == 0
+        assert manager.version() == 1
+
+    def test_shared_between_processes(self, manager):
+        backend = "sqlite" if isinstance(manager.backend, SQLiteBackend) else "json"
+        manager.store_memory(make_entry("a"))
+
+        other = MemoryManager(manager.memory_dir, backend=backend)
+        assert other.version() == 1
+        other.store_memory(make_entry("b"))
+        other.close()
+
+        assert manager.version() == 2
+
+    def test_context_cache_hit_skips_index_load(self, manager, monkeypatch):
+        manager.store_memory(make_entry("pdf", "Extract invoice fields from PDF"))
+        block = manager.get_relevant_context("invoice")
+
+        def no_load():
+            raise AssertionError("index should not be loaded")
+
+        monkeypatch.setattr(manager.backend, "load_index", no_load)
+        assert manager.get_relevant_context("invoice") == block
+
+    @pytest.mark.asyncio
+    async def test_watch_yields_new_versions(self, manager):
+        backend = "sqlite" if isinstance(manager.backend, SQLiteBackend) else "json"
+        other = MemoryManager(manager.memory_dir, backend=backend)
+
+        async def write_later():
+            await asyncio.sleep(0.05)
+            other.store_memory(make_entry("a"))
+
+        writer = asyncio.ensure_future(write_later())
+        versions = manager.watch(interval=0.01)
+        assert await asyncio.wait_for(versions.__anext__(), timeout=5) == 1
+        await writer
+        await versions.aclose()
+        other.close()
+
+    @pytest.mark.asyncio
+    async def test_async_manager_watch(self, manager):
+        memory = AsyncMemoryManager(manager)
+        versions = memory.watch(interval=0.01)
+        next_version = asyncio.ensure_future(versions.__anext__())
+        await memory.store_memory(make_entry("a"))
+
+        assert await asyncio.wait_for(next_version, timeout=5) == memory.version() == 1
+        await versions.aclose()
+        await memory.aclose()
+
+
+class TestSearchPaging:
+    """Test limit/offset/order support and lazy iteration."""
+
+    @pytest.fixture
+    def populated(self, manager):
+        for i in range(20):
+            entry = make_entry(f"pattern_{i:02d}", relevance=i / 20)
+            entry.timestamp = f"2025-01-{i + 1:02d}T00:00:00"
+            manager.store_memory(entry)
+        return manager
+
+    def test_limit_and_offset(self, populated):
+        first_page = populated.search_memories(limit=3)
+        second_page = populated.search_memories(limit=3, offset=3)
+
+        assert [e.key for e in first_page] == ["pattern_19", "pattern_18", "pattern_17"]
+        assert [e.key for e in second_page] == ["pattern_16", "pattern_15", "pattern_14"]
+
+    def test_order_by_timestamp_ascending(self, populated):
+        oldest = populated.search_memories(limit=2, order_by="timestamp", descending=False)
+        assert [e.key for e in oldest] == ["pattern_00", "pattern_01"]
+
+    def test_min_relevance_with_limit(self, populated):
+        results = populated.search_memories(min_relevance=0.9, limit=10)
+        assert [e.key for e in results] == ["pattern_19", "pattern_18"]
+
+    def test_only_requested_page_is_loaded(self, manager, monkeypatch):
+        for i in range(20):
+            manager.store_memory(make_entry(f"long_{i:02d}", "x" * 1000, relevance=i / 20))
+
+        reads = []
+        original = manager.backend.read_entry
+
+        def counting_read(key, metadata=None):
+            reads.append(key)
+            return original(key, metadata)
+
+        monkeypatch.setattr(manager.backend, "read_entry", counting_read)
+        results = manager.search_memories(limit=2)
+
+        assert reads == ["long_19", "long_18"]
+        assert results[0].value == "x" * 1000
+
+    def test_unknown_order_rejected(self, populated):
+        with pytest.raises(ValueError):
+            populated.search_memories(order_by="size")
+
+    def test_iter_memories_is_lazy(self, populated):
+        iterator = populated.iter_memories()
+        assert next(iterator).key.startswith("pattern_")
+        assert len(list(populated.iter_memories())) == 20
+        assert len(list(populated.iter_memories(min_relevance=0.5))) == 10
+
+
+class TestIndexMetadata:
+    """Test that searches and dedup checks are served from the index."""
+
+    def test_metadata_fields(self, manager):
+        manager.store_memory(make_entry("api", "Prefer FastAPI for REST APIs. FastAPI is fast."))
+
+        metadata = manager._load_index()["api"]
+        assert metadata["preview"].startswith("Prefer FastAPI")
+        assert metadata["chars"] == 46
+        assert metadata["tokens"] == 12
+        assert metadata["keywords"]["fastapi"] == 2
+        assert len(metadata["content_hash"]) == 32
+
+    def test_short_values_never_open_entries(self, manager, monkeypatch):
+        manager.store_memory(make_entry("api", "Prefer FastAPI for REST APIs"))
+        manager.store_memory(make_entry(
+            "decision", "Use asyncio for all I/O", category="architectural_decision"
+        ))
+
+        def fail(*args, **kwargs):
+            raise AssertionError("entry body read")
+
+        monkeypatch.setattr(manager.backend, "read_entry", fail)
+        assert len(manager.search_memories()) == 2
+        assert manager.retrieve_memory("api").value == "Prefer FastAPI for REST APIs"
+        assert "FastAPI" in manager.get_relevant_context("api_automation", query="REST API")
+        assert manager.find_by_content("Use asyncio for all I/O") == ["decision"]
+
+    def test_find_by_content(self, manager):
+        manager.store_memory(make_entry("a", "Retry with backoff"))
+        manager.store_memory(make_entry("b", "Retry with backoff"))
+        manager.store_memory(make_entry("c", "Retry with backoff", category="error_solution"))
+
+        assert sorted(manager.find_by_content("Retry with backoff")) == ["a", "b", "c"]
+        assert manager.find_by_content("Retry with backoff", category="error_solution") == ["c"]
+
+        manager.store_memory(make_entry("b", "Log and continue"))
+        assert sorted(manager.find_by_content("Retry with backoff")) == ["a", "c"]
+        assert manager.find_by_content("unknown") == []
+
+    def test_reindex_upgrades_legacy_rows(self, tmp_path):
+        memory_dir = tmp_path / "memories"
+        memory_dir.mkdir()
+        entry = make_entry("legacy", "Prefer FastAPI for REST APIs")
+        (memory_dir / "legacy.json").write_text(json.dumps(entry.model_dump()), encoding='utf-8')
+        (memory_dir / "index.json").write_text(json.dumps({"legacy": {
+            "category": entry.category,
+            "timestamp": entry.timestamp,
+            "relevance_score": entry.relevance_score,
+            "file": "legacy.json"
+        }}), encoding='utf-8')
+
+        manager = MemoryManager(memory_dir)
+        assert manager.find_by_content("Prefer FastAPI for REST APIs") == ["legacy"]
+        assert manager.reindex_metadata() == 1
+        assert "keywords" in manager._load_index()["legacy"]
+
+
+class TestRelevantContext:
+    """Test ranking of memories for prompt context."""
+
+    def test_ranks_by_user_request(self, manager):
+        manager.store_memory(make_entry("pdf", "Extract invoice fields from PDF with pdfplumber"))
+        manager.store_memory(make_entry("slack", "Send Slack notifications through webhooks"))
+        manager.store_memory(make_entry("csv", "Validate CSV files with pandera"))
+
+        context = manager.get_relevant_context(
+            "general_automation",
+            top_k=1,
+            query="Quiero procesar facturas PDF (invoice extraction)"
+        )
+        assert "pdfplumber" in context
+        assert "Slack" not in context
+
+    def test_blends_stored_relevance(self, manager):
+        manager.store_memory(make_entry("old", "REST API pattern", relevance=0.75))
+        manager.store_memory(make_entry("new", "REST API pattern", relevance=1.0))
+
+        ranked = manager.rank_memories("REST API", top_k=2)
+        assert [e.key for e in ranked] == ["new", "old"]
+
+    def test_fills_with_architectural_decisions(self, manager):
+        manager.store_memory(make_entry(
+            "decision", "Use asyncio for all I/O", category="architectural_decision"
+        ))
+        manager.store_memory(make_entry("pdf", "Extract invoice fields from PDF"))
+
+        ranked = manager.rank_memories("invoice", top_k=2)
+        assert [e.key for e in ranked] == ["pdf", "decision"]
+
+    def test_index_follows_writes(self, manager):
+        manager.store_memory(make_entry("pdf", "Extract invoice fields from PDF"))
+        assert [e.key for e in manager.rank_memories("invoice")] == ["pdf"]
+
+        manager.store_memory(make_entry("pdf", "Send Slack notifications"))
+        manager.store_memory(make_entry("ocr", "OCR scanned invoice images"))
+        assert [e.key for e in manager.rank_memories("invoice")] == ["ocr"]
+
+        manager.delete_memory("ocr")
+        assert manager.rank_memories("invoice") == []
+
+    def test_context_respects_token_budget(self, manager):
+        manager.store_memory(make_entry("long", "Invoice PDF pipeline: " + "extract fields " * 60))
+        manager.store_memory(make_entry("short", "Parse invoice PDF with pdfplumber"))
+        manager.store_memory(make_entry("other", "Invoice OCR fallback for scanned PDF"))
+
+        unbounded = manager.get_relevant_context("invoice", query="invoice PDF")
+        assert "extract fields" in unbounded
+
+        context = manager.get_relevant_context("invoice", query="invoice PDF", max_tokens=40)
+        assert estimate_tokens(context) <= 40
+        assert "extract fields" not in context
+        assert context.splitlines()[1].startswith("1. ")
+        assert len(context.splitlines()) == 3
+        assert manager.get_relevant_context("invoice", max_tokens=5) == ""
+
+    def test_context_block_cached_until_index_changes(self, manager, monkeypatch):
+        manager.store_memory(make_entry("pdf", "Extract invoice fields from PDF"))
+        first = manager.get_relevant_context("invoice")
+
+        def no_ranking(*args, **kwargs):
+            raise AssertionError("cached context should not be re-ranked")
+
+        with monkeypatch.context() as patch:
+            patch.setattr(manager, "rank_memories", no_ranking)
+            assert manager.get_relevant_context("invoice") == first
+        assert manager.cache_stats()["context_hits"] == 1
+
+        manager.store_memory(make_entry("ocr", "OCR scanned invoice images"))
+        assert "OCR" in manager.get_relevant_context("invoice")
+        assert manager.cache_stats()["context_misses"] == 2
+
+    def test_context_cache_expires_for_decay(self, manager, monkeypatch):
+        manager.store_memory(make_entry("pdf", "Extract invoice fields from PDF"))
+        manager.get_relevant_context("invoice")
+        later = time.time() + memory_module.CONTEXT_CACHE_SECONDS + 1
+        monkeypatch.setattr(memory_module.time, "time", lambda: later)
+        manager.get_relevant_context("invoice")
+        assert manager.cache_stats()["context_misses"] == 2
+
+    def test_bm25_retrieval(self, tmp_path):
+        manager = MemoryManager(tmp_path / "memories", retrieval="bm25")
+        manager.store_memory(make_entry("pdf", "Extract invoice fields from PDF"))
+        manager.store_memory(make_entry("slack", "Send Slack notifications"))
+        assert [e.key for e in manager.rank_memories("invoice")] == ["pdf"]
+
+    def test_unknown_retrieval_mode(self, tmp_path):
+        with pytest.raises(ValueError, match="Unknown retrieval mode"):
+            MemoryManager(tmp_path / "memories", retrieval="embeddings")
+
+    @pytest.mark.parametrize("backend", ["json", "sqlite"])
+    def test_index_follows_other_processes(self, tmp_path, backend):
+        memory_dir = tmp_path / "memories"
+        writer = MemoryManager(memory_dir, backend=backend)
+        reader = MemoryManager(memory_dir, backend=backend)
+        writer.store_memory(make_entry("pdf", "Extract invoice fields from PDF"))
+        assert len(reader.rank_memories("invoice")) == 1
+
+        writer.store_memory(make_entry("ocr", "OCR scanned invoice images"))
+        assert len(reader.rank_memories("invoice")) == 2
+
+
+class TestDecay:
+    """Test query-time relevance decay."""
+
+    @staticmethod
+    def aged_entry(key: str, days: float, **kwargs) -> MemoryEntry:
+        entry = make_entry(key, **kwargs)
+        entry.timestamp = (datetime.now() - timedelta(days=days)).isoformat()
+        return entry
+
+    def test_ranking_reflects_age_without_writes(self, manager):
+        manager.store_memory(self.aged_entry("old", 360, value="REST API pattern"))
+        manager.store_memory(self.aged_entry("new", 0, value="REST API pattern", relevance=0.9))
+        flushes = manager.write_stats()["flushes"]
+
+        ranked = manager.rank_memories("REST API", top_k=2, min_relevance=0.0)
+
+        assert [e.key for e in ranked] == ["new", "old"]
+        assert manager.effective_relevance("old") == pytest.approx(0.25, rel=1e-3)
+        assert manager.retrieve_memory("old").relevance_score == 1.0
+        assert manager.write_stats()["flushes"] == flushes
+
+    def test_decayed_memories_drop_below_threshold(self, manager):
+        manager.store_memory(self.aged_entry("stale", 200, value="Invoice parsing"))
+        assert manager.rank_memories("invoice") == []
+        assert len(manager.rank_memories("invoice", min_relevance=0.3)) == 1
+
+    def test_materialize_decay_in_one_batch(self, manager):
+        manager.store_memory(self.aged_entry("old", 180))
+        manager.store_memory(self.aged_entry("fresh", 0))
+        manager.store_memory(self.aged_entry(
+            "decision", 900, category="architectural_decision"
+        ))
+        flushes = manager.write_stats()["flushes"]
+
+        assert manager.materialize_decay() == 1
+        assert manager.write_stats()["flushes"] == flushes + 1
+
+        old = manager.retrieve_memory("old")
+        assert old.relevance_score == pytest.approx(0.5, rel=1e-3)
+        assert old.decayed_at is not None
+        # Re-anchored: no double decay and nothing left to persist
+        assert manager.effective_relevance("old") == pytest.approx(0.5, rel=1e-3)
+        assert manager.materialize_decay() == 0
+
+    def test_materialize_decay_counts_stored_entries(self, manager, monkeypatch):
+        manager.store_memory(self.aged_entry("old", 180))
+        manager.store_memory(self.aged_entry("gone", 180))
+        resolve = manager._resolve_entry
+        # "gone" is deleted by another writer while decay is materialized
+        monkeypatch.setattr(
+            manager, "_resolve_entry",
+            lambda key, *args, **kwargs: None if key == "gone" else resolve(key, *args, **kwargs)
+        )
+
+        assert manager.materialize_decay() == 1
+
+    def test_decision_keys_never_collide(self, manager):
+        keys = [manager.store_architectural_decision(f"Decision {i}") for i in range(50)]
+        assert keys == sorted(keys)
+        assert len(set(keys)) == 50
+        assert manager.count_memories() == 50
+
+    def test_update_relevance_restarts_decay(self, manager):
+        manager.store_memory(self.aged_entry("old", 180))
+        manager.update_relevance("old", 0.8)
+        assert manager.effective_relevance("old") == pytest.approx(0.8, rel=1e-3)
+
+
+class TestBatch:
+    """Test batched write transactions."""
+
+    def test_batch_flushes_once(self, manager):
+        before = manager.write_stats()
+
+        with manager.batch():
+            for i in range(10):
+                manager.store_memory(make_entry(f"pattern_{i}"))
+            manager.update_relevance("pattern_0", 0.5)
+            manager.delete_memory("pattern_9")
+
+        after = manager.write_stats()
+        assert after["flushes"] == before["flushes"] + 1
+        assert after["batches"] == before["batches"] + 1
+        assert after["operations"] == before["operations"] + 12
+        assert after["bytes_written"] > before["bytes_written"]
+
+        assert len(manager.search_memories()) == 9
+        assert manager.retrieve_memory("pattern_0").relevance_score == 0.5
+
+    def test_reads_see_buffered_writes(self, manager):
+        manager.store_memory(make_entry("existing"))
+
+        with manager.batch():
+            manager.store_memory(make_entry("new", "Buffered"))
+            assert manager.retrieve_memory("new").value == "Buffered"
+            assert "new" not in manager._load_index()
+
+            assert manager.delete_memory("existing") is True
+            assert manager.retrieve_memory("existing") is None
+            assert manager.delete_memory("existing") is False
+
+        assert manager.retrieve_memory("existing") is None
+
+    def test_nested_batches_flush_on_outermost_exit(self, manager):
+        before = manager.write_stats()["flushes"]
+
+        with manager.batch():
+            with manager.batch():
+                manager.store_memory(make_entry("a"))
+            assert manager.write_stats()["flushes"] == before
+            manager.store_memory(make_entry("b"))
+
+        assert manager.write_stats()["flushes"] == before + 1
+
+    def test_batch_flushes_when_block_raises(self, manager):
+        with pytest.raises(RuntimeError):
+            with manager.batch():
+                manager.store_memory(make_entry("a"))
+                raise RuntimeError("tool failed")
+
+        assert manager.retrieve_memory("a") is not None
+
+    @pytest.mark.asyncio
+    async def test_async_batch(self, manager):
+        before = manager.write_stats()["flushes"]
+
+        async with manager.abatch():
+            manager.store_architectural_decision("Use asyncio for all I/O")
+            manager.store_pattern("retry", "Retry with exponential backoff")
+
+        assert manager.write_stats()["flushes"] == before + 1
+        assert manager.retrieve_memory("pattern_retry") is not None
+
+
+class TestEviction:
+    """Test per-category limits and eviction on write."""
+
+    @staticmethod
+    def bounded(tmp_path: Path, backend: str, **kwargs) -> MemoryManager:
+        return MemoryManager(tmp_path / "memories", backend=backend, **kwargs)
+
+    @pytest.mark.parametrize("backend", ["json", "sqlite"])
+    def test_relevance_policy_keeps_category_bounded(self, tmp_path, backend):
+        manager = self.bounded(tmp_path, backend, limits={"pattern": 10})
+        for i in range(25):
+            manager.store_memory(make_entry(f"pattern_{i:02d}", relevance=i / 25))
+        manager.store_memory(make_entry("decision", category="architectural_decision"))
+
+        keys = {e.key for e in manager.search_memories(category="pattern", limit=100)}
+        assert len(keys) <= 10
+        # The most relevant memories survive
+        assert {"pattern_24", "pattern_23", "pattern_22"} <= keys
+        assert manager.retrieve_memory("decision") is not None
+        manager.close()
+
+    def test_lru_policy_keeps_recently_read(self, tmp_path):
+        manager = self.bounded(tmp_path, "json", limits={"pattern": 5}, eviction="lru")
+        for i in range(5):
+            manager.store_memory(make_entry(f"pattern_{i}"))
+        manager.retrieve_memory("pattern_0")
+
+        manager.store_memory(make_entry("pattern_5"))
+
+        assert manager.retrieve_memory("pattern_0") is not None
+        assert manager.retrieve_memory("pattern_1") is None
+        assert manager.count_memories() == 5
+
+    def test_headroom_avoids_evicting_on_every_write(self, tmp_path):
+        manager = self.bounded(tmp_path, "json", limits={"pattern": 20})
+        for i in range(21):
+            manager.store_memory(make_entry(f"pattern_{i:02d}"))
+        assert manager.count_memories() == 18
+
+        manager.store_memory(make_entry("pattern_21"))
+        manager.store_memory(make_entry("pattern_22"))
+        assert manager.eviction_stats()["evictions"] == 3
+
+    def test_ttl_expires_under_limit(self, tmp_path):
+        manager = self.bounded(
+            tmp_path, "json", eviction={"error_solution": TTLPolicy({"error_solution": 30})}
+        )
+        stale = make_entry("error_old", category="error_solution")
+        stale.timestamp = (datetime.now() - timedelta(days=45)).isoformat()
+        manager.store_memory(stale)
+        manager.store_memory(make_entry("error_new", category="error_solution"))
+
+        assert manager.retrieve_memory("error_old") is None
+        assert manager.retrieve_memory("error_new") is not None
+
+    def test_counters(self, tmp_path):
+        manager = self.bounded(tmp_path, "json", limits={"pattern": 2, "error_solution": 1})
+        for i in range(3):
+            manager.store_memory(make_entry(f"pattern_{i}"))
+            manager.store_memory(make_entry(f"error_{i}", category="error_solution"))
+
+        stats = manager.eviction_stats()
+        assert stats["by_category"] == {"pattern": 1, "error_solution": 2}
+        assert stats["evictions"] == 3
+        assert stats["bytes_reclaimed"] > 0
+
+    def test_counters_skip_victims_already_deleted(self, tmp_path, monkeypatch):
+        manager = self.bounded(tmp_path, "json")
+        for i in range(10):
+            manager.store_memory(make_entry(f"pattern_{i}", relevance=(i + 1) / 10))
+        delete = manager.delete_memory
+        # pattern_0 is deleted by another writer before the eviction runs
+        monkeypatch.setattr(manager, "delete_memory", lambda key: key != "pattern_0" and delete(key))
+        manager._limits = {"pattern": 5}
+
+        assert manager.enforce_limits() == 4
+        stats = manager.eviction_stats()
+        assert stats["evictions"] == 4
+        assert stats["by_category"] == {"pattern": 4}
+
+    def test_batch_evicts_once_after_flush(self, tmp_path):
+        manager = self.bounded(tmp_path, "json", limits={"pattern": 10})
+        flushes = manager.write_stats()["flushes"]
+
+        with manager.batch():
+            for i in range(30):
+                manager.store_memory(make_entry(f"pattern_{i:02d}", relevance=i / 30))
+            assert manager.eviction_stats()["evictions"] == 0
+
+        # One flush for the batch, one for the evictions
+        assert manager.write_stats()["flushes"] == flushes + 2
+        assert manager.count_memories() == 9
+
+    def test_enforce_limits_after_lowering_limit(self, tmp_path):
+        manager = self.bounded(tmp_path, "sqlite")
+        for i in range(10):
+            manager.store_memory(make_entry(f"pattern_{i}"))
+        manager.close()
+
+        manager = self.bounded(tmp_path, "sqlite", limits={"pattern": 4})
+        assert manager.enforce_limits() == 6
+        assert manager.count_memories() == 4
+
+    def test_sync_only_reindexes_changed_keys(self, tmp_path):
+        manager = self.bounded(tmp_path, "json")
+        for i in range(50):
+            manager.store_memory(make_entry(f"pattern_{i}"))
+        manager.rank_memories("FastAPI")
+
+        reindexed = []
+        index_row = manager._index_row
+        manager._index_row = lambda key, metadata: (reindexed.append(key), index_row(key, metadata))
+        manager.store_memory(make_entry("pattern_new"))
+        manager.delete_memory("pattern_0")
+        results = manager.rank_memories("FastAPI", top_k=100)
+
+        assert reindexed == ["pattern_new"]
+        assert "pattern_0" not in {e.key for e in results}
+        assert len(results) == 50
+
+
+class TestConsolidation:
+    """Test near-duplicate merging on write and in bulk."""
+
+    @pytest.fixture(params=["json", "sqlite"])
+    def merging(self, request, tmp_path: Path) -> MemoryManager:
+        manager = MemoryManager(tmp_path / "memories", backend=request.param, merge_distance=3)
+        yield manager
+        manager.close()
+
+    def test_near_duplicate_merged_on_write(self, merging):
+        merging.store_pattern("agent_a", "Use code_generator agent for: FastAPI projects")
+        key = merging.store_memory(make_entry(
+            "pattern_agent_b", "use code_generator agent for FastAPI project."
+        ))
+
+        assert key == "pattern_agent_a"
+        assert merging.retrieve_memory("pattern_agent_b") is None
+        merged = merging.retrieve_memory("pattern_agent_a")
+        assert merged.occurrences == 2
+        assert merged.value == "Use code_generator agent for: FastAPI projects"
+        assert merging.write_stats()["merges"] == 1
+
+    def test_opposite_decisions_are_kept(self, merging):
+        first = merging.store_architectural_decision("Prefer Flask over FastAPI for REST APIs")
+        second = merging.store_architectural_decision("Prefer FastAPI over Flask for REST APIs")
+
+        assert second != first
+        assert merging.retrieve_memory(first).occurrences == 1
+        assert merging.retrieve_memory(second).value == "Prefer FastAPI over Flask for REST APIs"
+        assert merging.write_stats()["merges"] == 0
+
+    def test_distinct_values_and_categories_are_kept(self, merging):
+        merging.store_memory(make_entry("a", "Prefer FastAPI for REST APIs"))
+        merging.store_memory(make_entry("b", "Retry webhooks with exponential backoff"))
+        merging.store_memory(make_entry(
+            "c", "Prefer FastAPI for REST APIs", category="architectural_decision"
+        ))
+        assert merging.count_memories() == 3
+
+    def test_existing_key_is_overwritten_not_merged(self, merging):
+        merging.store_memory(make_entry("a"))
+        merging.store_memory(make_entry("b"))  # Merged into "a"
+        merging.store_memory(make_entry("a", "Prefer FastAPI for REST APIs!"))
+        assert merging.retrieve_memory("a").occurrences == 1
+
+    def test_consolidate_stored_duplicates(self, tmp_path):
+        manager = MemoryManager(tmp_path / "memories")
+        for i in range(5):
+            entry = make_entry(f"dup_{i}", "Validate payloads with pydantic" + "." * i,
+                               relevance=0.2 * (i + 1))
+            entry.timestamp = (datetime.now() - timedelta(minutes=10 - i)).isoformat()
+            manager.store_memory(entry)
+        manager.store_memory(make_entry("other", "Log with correlation ids"))
+        flushes = manager.write_stats()["flushes"]
+
+        assert manager.consolidate_memories() == 4
+        assert manager.write_stats()["flushes"] == flushes + 1
+
+        kept = manager.retrieve_memory("dup_0")
+        assert kept.occurrences == 5
+        assert kept.relevance_score == pytest.approx(1.0, rel=1e-3)
+        assert manager.count_memories() == 2
+        assert manager.consolidate_memories() == 0
+
+    def test_context_shows_occurrences(self, merging):
+        for i in range(3):
+            merging.store_pattern(f"p{i}", "Use pydantic for invoice models")
+        context = merging.get_relevant_context("invoice")
+        assert "Use pydantic for invoice models (seen 3x)" in context
+        assert context.count("pydantic") == 1
+
+
+class TestAsyncMemoryManager:
+    """Test the non-blocking memory API."""
+
+    @pytest.fixture
+    def memory(self, manager):
+        memory = AsyncMemoryManager(manager, max_workers=2)
+        yield memory
+        memory._executor.shutdown(wait=True)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_reads_of_a_key_are_coalesced(self, memory, monkeypatch):
+        await memory.store_memory(make_entry("a"))
+        reads = []
+        retrieve = memory.manager.retrieve_memory
+
+        def slow_retrieve(key):
+            reads.append(key)
+            time.sleep(0.05)
+            return retrieve(key)
+
+        monkeypatch.setattr(memory.manager, "retrieve_memory", slow_retrieve)
+        entries = await asyncio.gather(*(memory.retrieve_memory("a") for _ in range(10)))
+
+        assert reads == ["a"]
+        assert memory.cache_stats()["coalesced_reads"] == 9
+        assert all(entry.key == "a" for entry in entries)
+        assert len({id(entry) for entry in entries}) == 10  # Private copies
+
+    @pytest.mark.asyncio
+    async def test_write_restarts_in_flight_read(self, memory):
+        await memory.store_memory(make_entry("a", "First"))
+        stale = asyncio.ensure_future(memory.retrieve_memory("a"))
+        await memory.store_memory(make_entry("a", "Second"))
+
+        assert (await memory.retrieve_memory("a")).value == "Second"
+        await stale
+
+    @pytest.mark.asyncio
+    async def test_event_loop_not_blocked(self, memory, monkeypatch):
+        def slow_search(*args, **kwargs):
+            time.sleep(0.2)
+            return []
+
+        monkeypatch.setattr(memory.manager, "search_memories", slow_search)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.ensure_future(ticker())
+        await memory.search_memories(category="pattern")
+        task.cancel()
+        assert ticks >= 5
+
+    @pytest.mark.asyncio
+    async def test_context_token_budget(self, memory):
+        await memory.store_memory(make_entry("long", "Invoice PDF " + "extract fields " * 60))
+        await memory.store_memory(make_entry("short", "Parse invoice PDF"))
+
+        context = await memory.get_relevant_context("invoice", max_tokens=30)
+        assert "Parse invoice PDF" in context
+        assert "extract fields" not in context
+
+    @pytest.mark.asyncio
+    async def test_abatch_flushes_once(self, memory):
+        before = memory.write_stats()["flushes"]
+
+        async with memory.abatch():
+            await memory.store_architectural_decision("Use asyncio for all I/O")
+            await memory.store_pattern("retry", "Retry with exponential backoff")
+            assert (await memory.retrieve_memory("pattern_retry")) is not None
+
+        assert memory.write_stats()["flushes"] == before + 1
+        assert await memory.count_memories() == 2
+        context = await memory.get_relevant_context("retry", query="backoff")
+        assert "exponential backoff" in context
+
+    @pytest.mark.asyncio
+    async def test_concurrent_writes_are_group_committed(self, memory):
+        before = memory.write_stats()["flushes"]
+
+        keys = await asyncio.gather(*(
+            memory.store_architectural_decision(f"Decision {i}") for i in range(200)
+        ))
+
+        assert len(set(keys)) == 200
+        assert await memory.count_memories() == 200
+        stats = memory.write_stats()
+        assert stats["write_groups"] <= 3
+        assert stats["flushes"] - before == stats["write_groups"]
+
+    @pytest.mark.asyncio
+    async def test_failed_write_only_fails_its_caller(self, memory, monkeypatch):
+        store = memory.manager.store_memory
+
+        def store_or_fail(entry):
+            if entry.key == "bad":
+                raise ValueError("bad entry")
+            return store(entry)
+
+        monkeypatch.setattr(memory.manager, "store_memory", store_or_fail)
+        results = await asyncio.gather(
+            memory.store_memory(make_entry("a")),
+            memory.store_memory(make_entry("bad")),
+            memory.store_memory(make_entry("b")),
+            return_exceptions=True
+        )
+
+        assert results[0] == "a" and results[2] == "b"
+        assert isinstance(results[1], ValueError)
+        assert await memory.count_memories() == 2
+
+
+class TestExportImport:
+    """Test streaming export and bulk import."""
+
+    @pytest.fixture
+    def populated(self, manager):
+        for i in range(5):
+            manager.store_memory(make_entry(f"pattern_{i}", f"Pattern number {i}"))
+        return manager
+
+    def test_json_export_format_unchanged(self, populated, tmp_path):
+        output = tmp_path / "export.json"
+        assert populated.export_memories(output) == 5
+
+        expected = json.dumps(
+            list(populated.backend.iter_entries()), indent=2, ensure_ascii=False
+        )
+        assert output.read_text(encoding='utf-8') == expected
+
+    def test_empty_json_export(self, manager, tmp_path):
+        output = tmp_path / "export.json"
+        assert manager.export_memories(output) == 0
+        assert json.loads(output.read_text(encoding='utf-8')) == []
+
+    def test_gzip_jsonl_round_trip(self, populated, tmp_path):
+        output = tmp_path / "export.jsonl.gz"
+        assert populated.export_memories(output, format="jsonl") == 5
+        with gzip.open(output, 'rt', encoding='utf-8') as f:
+            assert len(f.readlines()) == 5
+
+        target = MemoryManager(tmp_path / "imported")
+        flushes = target.write_stats()["flushes"]
+        counts = target.bulk_import(output, chunk_size=2)
+
+        assert counts == {"read": 5, "imported": 5, "merged": 0, "skipped": 0}
+        assert target.write_stats()["flushes"] == flushes + 1
+        assert target.retrieve_memory("pattern_3").value == "Pattern number 3"
+
+    def test_dedupe_by_key(self, populated, tmp_path):
+        output = tmp_path / "export.jsonl"
+        populated.export_memories(output, format="jsonl")
+        assert populated.bulk_import(output) == {"read": 5, "imported": 0, "merged": 0, "skipped": 5}
+
+    def test_dedupe_by_content(self, manager, tmp_path):
+        manager.store_memory(make_entry("existing", "Use structured logging"))
+        lines = [
+            make_entry("a", "Use structured logging"),
+            make_entry("b", "Retry with backoff"),
+            make_entry("c", "Retry with backoff"),
+        ]
+        source = tmp_path / "import.jsonl"
+        source.write_text(
+            "".join(entry.model_dump_json() + "\n" for entry in lines), encoding='utf-8'
+        )
+
+        assert manager.bulk_import(source, dedupe="content") == {
+            "read": 3, "imported": 1, "merged": 0, "skipped": 2
+        }
+        assert manager.retrieve_memory("b") is not None
+
+    def test_import_past_limit_evicts(self, tmp_path):
+        manager = MemoryManager(tmp_path / "memories", limits={"pattern": 10})
+        source = tmp_path / "import.jsonl"
+        source.write_text("".join(
+            make_entry(f"pattern_{i}", f"Distinct pattern {i}").model_dump_json() + "\n"
+            for i in range(50)
+        ), encoding='utf-8')
+
+        assert manager.bulk_import(source)["imported"] == 50
+        remaining = manager.count_memories()
+        assert remaining <= 10
+        assert manager.eviction_stats()["evictions"] == 50 - remaining
+
+    def test_import_merges_near_duplicates(self, tmp_path):
+        manager = MemoryManager(tmp_path / "memories", merge_distance=3)
+        manager.store_pattern("agent_a", "Use code_generator agent for: FastAPI projects")
+        source = tmp_path / "import.jsonl"
+        source.write_text(make_entry(
+            "pattern_agent_b", "use code_generator agent for FastAPI project."
+        ).model_dump_json() + "\n", encoding='utf-8')
+
+        assert manager.bulk_import(source) == {
+            "read": 1, "imported": 0, "merged": 1, "skipped": 0
+        }
+        assert manager.retrieve_memory("pattern_agent_b") is None
+        assert manager.retrieve_memory("pattern_agent_a").occurrences == 2
+
+    def test_invalid_line_imports_nothing(self, manager, tmp_path):
+        source = tmp_path / "import.jsonl"
+        source.write_text(
+            make_entry("a").model_dump_json() + "\n" + '{"key": "b"}\n', encoding='utf-8'
+        )
+
+        with pytest.raises(ValueError, match="line 2"):
+            manager.bulk_import(source)
+        assert manager.retrieve_memory("a") is None
+
+    def test_unknown_format_rejected(self, manager, tmp_path):
+        with pytest.raises(ValueError):
+            manager.export_memories(tmp_path / "export.csv", format="csv")
+        with pytest.raises(ValueError):
+            manager.bulk_import(tmp_path / "missing.jsonl", dedupe="value")
+
+
+class TestJournal:
+    """Test the append-only journal of the JSON file backend."""
+
+    def test_store_appends_without_rewriting_index(self, tmp_path):
+        manager = MemoryManager(tmp_path / "memories")
+        index_before = manager.backend.index_file.read_bytes()
+
+        manager.store_memory(make_entry("a"))
+        manager.update_relevance("a", 0.5)
+        manager.delete_memory("a")
+
+        assert manager.backend.index_file.read_bytes() == index_before
+        lines = manager.backend.journal_file.read_text(encoding='utf-8').splitlines()
+        assert [json.loads(line)["op"] for line in lines] == ["put", "put", "delete"]
+
+    def test_journal_replayed_on_load(self, tmp_path):
+        memory_dir = tmp_path / "memories"
+        writer = MemoryManager(memory_dir)
+        writer.store_memory(make_entry("a", "First"))
+        writer.store_memory(make_entry("b", "Second"))
+        writer.delete_memory("b")
+
+        reader = MemoryManager(memory_dir)
+        assert reader.retrieve_memory("a").value == "First"
+        assert reader.retrieve_memory("b") is None
+
+    def test_other_writers_replayed_incrementally(self, tmp_path):
+        memory_dir = tmp_path / "memories"
+        writer = MemoryManager(memory_dir)
+        reader = MemoryManager(memory_dir)
+        writer.store_memory(make_entry("a"))
+        reader._load_index()
+
+        writer.store_memory(make_entry("b"))
+
+        assert "b" in reader._load_index()
+        assert reader.cache_stats()["tail_replays"] == 1
+
+    def test_compaction_writes_snapshot(self, tmp_path):
+        memory_dir = tmp_path / "memories"
+        manager = MemoryManager(memory_dir)
+        manager.store_memory(make_entry("a", "First"))
+        manager.store_memory(make_entry("b", "Second"))
+        manager.backend.compact()
+        manager.delete_memory("b")
+
+        assert manager.backend.compact() is True
+        assert not manager.backend.journal_file.exists()
+        assert (memory_dir / "a.json").exists()
+        assert not (memory_dir / "b.json").exists()
+
+        index = json.loads(manager.backend.index_file.read_text(encoding='utf-8'))
+        assert list(index) == ["a"]
+        assert MemoryManager(memory_dir).retrieve_memory("a").value == "First"
+
+    def test_background_compaction(self, tmp_path):
+        memory_dir = tmp_path / "memories"
+        backend = JSONFileBackend(memory_dir, compact_threshold=5)
+        manager = MemoryManager(memory_dir, backend=backend)
+        for i in range(20):
+            manager.store_memory(make_entry(f"pattern_{i}"))
+        manager.close()
+
+        assert backend.stats()["compactions"] >= 1
+        reader = MemoryManager(memory_dir)
+        assert len(reader.search_memories()) == 20
+
+    def test_torn_append_ignored(self, tmp_path):
+        memory_dir = tmp_path / "memories"
+        MemoryManager(memory_dir).store_memory(make_entry("a"))
+        with open(memory_dir / "journal.jsonl", 'a', encoding='utf-8') as f:
+            f.write('{"op": "put", "key": "b"')
+
+        assert list(MemoryManager(memory_dir)._load_index()) == ["a"]
+
+    def test_torn_append_truncated_by_next_writer(self, tmp_path):
+        memory_dir = tmp_path / "memories"
+        MemoryManager(memory_dir).store_memory(make_entry("a"))
+        with open(memory_dir / "journal.jsonl", 'a', encoding='utf-8') as f:
+            f.write('{"op": "put", "key": "b"')
+
+        MemoryManager(memory_dir).store_memory(make_entry("c"))
+
+        lines = (memory_dir / "journal.jsonl").read_text(encoding='utf-8').splitlines()
+        assert [json.loads(line)["key"] for line in lines] == ["a", "c"]
+        assert sorted(MemoryManager(memory_dir)._load_index()) == ["a", "c"]
+
+
+class TestCrashSafety:
+    """Test atomic file replacement and the directory lock."""
+
+    def test_failed_write_keeps_previous_file(self, tmp_path, monkeypatch):
+        target = tmp_path / "index.json"
+        write_atomic(target, b"{}")
+
+        def fail(fd):
+            raise OSError("disk full")
+
+        monkeypatch.setattr("orchestrator.storage.os.fsync", fail)
+        with pytest.raises(OSError):
+            write_atomic(target, b'{"a": 1}')
+
+        assert target.read_bytes() == b"{}"
+        assert [p.name for p in tmp_path.iterdir()] == ["index.json"]
+
+    def test_shared_lock_allows_other_readers(self, tmp_path):
+        first = FileLock(tmp_path / ".lock")
+        second = FileLock(tmp_path / ".lock")
+        with first.shared():
+            assert second.acquire(blocking=False)
+            second.release()
+            assert not second.acquire(exclusive=True, blocking=False)
+
+    def test_exclusive_lock_blocks_readers(self, tmp_path):
+        writer = FileLock(tmp_path / ".lock")
+        reader = FileLock(tmp_path / ".lock")
+        with writer.exclusive():
+            with writer.shared():  # Reentrant within the holder
+                pass
+            assert not reader.acquire(blocking=False)
+        assert reader.acquire(blocking=False)
+        reader.release()
+
+    def test_upgrade_rejected(self, tmp_path):
+        lock = FileLock(tmp_path / ".lock")
+        with lock.shared():
+            with pytest.raises(RuntimeError):
+                lock.acquire(exclusive=True)
+
+    def test_compaction_skipped_while_another_process_compacts(self, tmp_path):
+        memory_dir = tmp_path / "memories"
+        manager = MemoryManager(memory_dir)
+        manager.store_memory(make_entry("a"))
+
+        other = FileLock(memory_dir / ".compact.lock")
+        with other.exclusive():
+            assert manager.backend.compact() is False
+        assert manager.backend.compact() is True
+
+
+class TestShardedLayout:
+    """Test the hash-sharded JSON layout and its online migration."""
+
+    @staticmethod
+    def long_entry(key: str) -> MemoryEntry:
+        return make_entry(key, f"{key} " + "details " * 100)
+
+    def test_sharded_entries_go_to_subdirectories(self, tmp_path):
+        memory_dir = tmp_path / "memories"
+        backend = JSONFileBackend(memory_dir, shard_width=2)
+        manager = MemoryManager(memory_dir, backend=backend)
+        manager.store_memory(self.long_entry("a"))
+        backend.compact()
+
+        file_name = manager._load_index()["a"]["file"]
+        assert len(file_name.split("/")[0]) == 2
+        assert (memory_dir / file_name).exists()
+        assert not (memory_dir / "a.json").exists()
+        # Layout is recorded for every later process
+        assert JSONFileBackend(memory_dir).shard_width == 2
+        assert MemoryManager(memory_dir).retrieve_memory("a").value.startswith("a ")
+
+    def test_migrate_flat_store(self, tmp_path):
+        memory_dir = tmp_path / "memories"
+        manager = MemoryManager(memory_dir)
+        for i in range(30):
+            manager.store_memory(self.long_entry(f"key_{i}"))
+        manager.backend.compact()
+        manager.store_memory(self.long_entry("pending"))  # Only in the journal
+        stale = dict(manager._load_index()["key_0"])
+
+        assert migrate_to_sharded_layout(memory_dir, chunk_size=7) == 31
+
+        assert not [p.name for p in memory_dir.glob("key_*.json")]
+        fresh = MemoryManager(memory_dir)
+        assert fresh.backend.shard_width == 2
+        assert len(fresh.search_memories()) == 31
+        assert all(
+            fresh.retrieve_memory(f"key_{i}").value.startswith(f"key_{i} ")
+            for i in range(30)
+        )
+        assert fresh.retrieve_memory("pending") is not None
+        # Readers holding a pre-migration path are redirected
+        assert manager.backend.read_entry("key_0", stale)["key"] == "key_0"
+
+    def test_migration_is_resumable(self, tmp_path):
+        memory_dir = tmp_path / "memories"
+        manager = MemoryManager(memory_dir)
+        manager.store_memory(self.long_entry("a"))
+        manager.backend.compact()
+
+        assert migrate_to_sharded_layout(memory_dir) == 1
+        assert migrate_to_sharded_layout(memory_dir) == 0
+        assert MemoryManager(memory_dir).retrieve_memory("a") is not None
+
+
+class TestSQLiteMigration:
+    """Test the one-shot JSON to SQLite migrator."""
+
+    def test_migrates_all_entries(self, tmp_path):
+        memory_dir = tmp_path / "memories"
+        source = MemoryManager(memory_dir)
+        source.store_memory(make_entry("a", "First", relevance=0.4))
+        source.store_memory(make_entry("b", "Second", category="architectural_decision"))
+
+        assert migrate_json_to_sqlite(memory_dir) == 2
+
+        migrated = MemoryManager(memory_dir, backend="sqlite")
+        assert migrated.retrieve_memory("a").relevance_score == 0.4
+        assert [e.key for e in migrated.search_memories()] == ["b", "a"]
+        migrated.close()
+
+    def test_uses_wal_mode(self, tmp_path):
+        backend = SQLiteBackend(tmp_path / "memories.db")
+        mode = backend._conn.execute("PRAGMA journal_mode").fetchone()[0]
+        backend.close()
+
+        assert mode == "wal"
@@ -0,0 +1,143 @@
+"""
+Unit tests for the memory retrieval primitives.
+"""
+
+import random
+import time
+
+import pytest
+
+import orchestrator.retrieval as retrieval
+from orchestrator.retrieval import BM25Index, VectorIndex, tokenize
+
+requires_numpy = pytest.mark.skipif(
+    not retrieval.NUMPY_AVAILABLE, reason="NumPy is not installed"
+)
+
+
+class TestTokenize:
+    """Test term extraction."""
+
+    def test_splits_snake_case_and_punctuation(self):
+        assert tokenize("api_automation, REST-API!") == ["api", "automation", "rest", "api"]
+
+    def test_drops_stopwords_in_both_languages(self):
+        assert tokenize("Use FastAPI for the API") == ["fastapi", "api"]
+        assert tokenize("Procesamiento de facturas para la empresa") == [
+            "procesamiento", "factura", "empresa"
+        ]
+
+    def test_strips_plural_s(self):
+        assert tokenize("APIs projects process") == ["api", "project", "process"]
+
+
+class TestBM25Index:
+    """Test incremental BM25 scoring."""
+
+    def test_ranks_matching_documents(self):
+        index = BM25Index()
+        index.add("fastapi", "Prefer FastAPI for REST APIs")
+        index.add("pandas", "Use pandas for CSV data processing")
+        index.add("jwt", "Protect REST endpoints with JWT authentication")
+
+        results = index.search("REST JWT authentication", top_k=2)
+        assert [key for key, _ in results] == ["jwt", "fastapi"]
+
+    def test_only_scores_documents_sharing_terms(self):
+        index = BM25Index()
+        index.add("a", "pdf invoice extraction")
+        index.add("b", "slack notifications")
+
+        assert set(index.score("invoice")) == {"a"}
+
+    def test_replace_and_remove(self):
+        index = BM25Index()
+        index.add("a", "pdf invoice extraction")
+        index.add("a", "slack notifications")
+        assert index.score("invoice") == {}
+        assert "a" in index
+
+        index.remove("a")
+        assert len(index) == 0
+        assert index.score("slack") == {}
+
+    def test_score_limit(self):
+        index = BM25Index()
+        for i in range(10):
+            index.add(f"doc{i}", "invoice " * (i + 1))
+        assert set(index.score("invoice", limit=3)) == {"doc9", "doc8", "doc7"}
+
+
+@requires_numpy
+class TestVectorIndex:
+    """Test hashed TF-IDF cosine similarity."""
+
+    def test_ranks_by_similarity_to_request(self):
+        index = VectorIndex()
+        index.add("pdf", "Extract invoice fields from PDF with pdfplumber")
+        index.add("slack", "Send Slack notifications through webhooks")
+        index.add("csv", "Validate CSV files with pandera")
+
+        results = index.search("Quiero procesar facturas PDF (invoice extraction)", top_k=3)
+        assert [key for key, _ in results] == ["pdf"]
+        assert 0.0 < results[0][1] <= 1.0
+
+    def test_identical_text_has_similarity_one(self):
+        index = VectorIndex()
+        index.add("a", "Retry webhooks with exponential backoff")
+        assert index.score("retry webhook with exponential backoff")["a"] == pytest.approx(1.0)
+
+    def test_replace_remove_and_growth(self):
+        index = VectorIndex()
+        for i in range(100):  # Grows the matrix past its initial capacity
+            index.add(f"doc{i}", f"unrelated memory number{i}")
+        index.add("doc5", "pdf invoice extraction")
+        index.remove("doc0")
+
+        assert len(index) == 99
+        assert index.search("invoice", top_k=1)[0][0] == "doc5"
+        assert "doc0" not in index.score("memory number0")
+
+    def test_empty_query_and_index(self):
+        index = VectorIndex()
+        assert index.score("invoice") == {}
+        index.add("a", "pdf invoice")
+        assert index.score("the of and") == {}
+
+    def test_fast_at_50k_documents(self):
+        index = VectorIndex()
+        for i in range(50000):
+            index.add_terms(f"doc{i}", {f"term{i % 997}": 1, f"topic{i % 89}": 2})
+
+        index.search("term5 topic3", top_k=5)
+        started = time.perf_counter()
+        for _ in range(10):
+            index.search("term5 topic3", top_k=5)
+        assert (time.perf_counter() - started) / 10 < 0.05
+
+    def test_few_collisions_at_50k_documents(self):
+        rng = random.Random(7)
+        vocabulary = sorted({
+            "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(5, 9)))
+            for _ in range(20000)
+        })
+        documents = [rng.sample(vocabulary, 4) for _ in range(50000)]
+        index = VectorIndex()
+        for i, words in enumerate(documents):
+            index.add_terms(f"doc{i}", {word: 1 for word in words})
+
+        relevant = 0
+        for i in range(0, 50000, 2500):
+            query = documents[i][:2]
+            results = index.search(" ".join(query), top_k=10)
+            assert results[0][0] == f"doc{i}"
+            relevant += sum(
+                1 for key, _ in results if set(documents[int(key[3:])]) & set(query)
+            )
+        # Top results share a word with the query, not just hashed columns
+        assert relevant / (20 * 10) >= 0.95
+
+    def test_requires_numpy(self, monkeypatch):
+        monkeypatch.setattr(retrieval, "NUMPY_AVAILABLE", False)
+        with pytest.raises(ImportError, match="NumPy"):
+            VectorIndex()
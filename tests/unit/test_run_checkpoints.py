@@ -0,0 +1,151 @@
+"""
+Unit tests for run checkpoints and resuming a workflow.
+"""
+
+import json
+
+import pytest
+
+from orchestrator.checkpoints import RUN_FILE, CheckpointStore
+from orchestrator.memory import MemoryManager
+from orchestrator.models import AutomationIntent
+from orchestrator.workflow import OrchestrationWorkflow
+
+
+@pytest.fixture
+def intent():
+    return AutomationIntent(
+        project_name="invoice-processor",
+        project_type="data_processing",
+        main_objective="Extract totals from PDF invoices",
+        key_requirements=["Parse PDFs"],
+        required_agents=["requirements_analyst", "code_generator"],
+        complexity_level="medium",
+        estimated_duration="2 days"
+    )
+
+
+class TestCheckpointStore:
+    """Test saving and loading phase outputs."""
+
+    def test_create_records_request(self, tmp_path):
+        store = CheckpointStore.create(tmp_path, "Process invoices", "Nightly")
+
+        run = store.run_info()
+        assert run["run_id"] == store.run_id
+        assert run["user_request"] == "Process invoices"
+        assert run["additional_context"] == "Nightly"
+        assert run["status"] == "running"
+        assert (tmp_path / store.run_id / RUN_FILE).exists()
+
+    def test_load_rebuilds_models(self, tmp_path, intent):
+        store = CheckpointStore.create(tmp_path, "Process invoices")
+        store.save("intent", intent)
+        store.save("requirements", {"status": "completed"})
+        store.save("docs", None)
+
+        completed = CheckpointStore.open(tmp_path, store.run_id).load()
+        assert completed == {
+            "docs": None,
+            "intent": intent,
+            "requirements": {"status": "completed"}
+        }
+
+    def test_finish_records_status(self, tmp_path):
+        store = CheckpointStore.create(tmp_path, "Process invoices")
+        store.finish(False, "validation failed")
+        assert store.run_info()["status"] == "failed"
+        assert store.run_info()["error"] == "validation failed"
+
+        store.finish(True)
+        assert store.run_info()["status"] == "completed"
+        assert store.run_info()["error"] is None
+
+    def test_completed_run_drops_phase_files(self, tmp_path, intent):
+        store = CheckpointStore.create(tmp_path, "Process invoices")
+        store.save("intent", intent)
+        store.finish(False, "validation failed")
+        assert set(store.load()) == {"intent"}
+
+        store.finish(True)
+        assert store.load() == {}
+        assert [p.name for p in store.path.iterdir()] == [RUN_FILE]
+        assert store.run_info()["status"] == "completed"
+
+    def test_prune_keeps_newest_runs(self, tmp_path):
+        run_ids = [CheckpointStore.create(tmp_path, f"Request {i}").run_id for i in range(5)]
+
+        assert CheckpointStore.prune(tmp_path, max_runs=2) == 3
+        assert sorted(p.name for p in tmp_path.iterdir()) == run_ids[-2:]
+        assert CheckpointStore.prune(tmp_path, max_runs=2) == 0
+        assert CheckpointStore.prune(tmp_path / "missing") == 0
+
+    def test_open_unknown_run(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            CheckpointStore.open(tmp_path, "01J9ZK3Q4V7M2X8N5R6T0W1YBC")
+
+    def test_saves_are_atomic(self, tmp_path, intent):
+        store = CheckpointStore.create(tmp_path, "Process invoices")
+        store.save("intent", intent)
+
+        names = sorted(p.name for p in store.path.iterdir())
+        assert names == ["intent.json", RUN_FILE]
+        payload = json.loads((store.path / "intent.json").read_text())
+        assert payload["phase"] == "intent"
+        assert payload["value"]["project_name"] == "invoice-processor"
+
+
+class RecordingClient:
+    """SDK client stub recording the agent (first line) of every query."""
+
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+        self.queries = []
+
+    async def query(self, prompt):
+        first_line = prompt.strip().splitlines()[0]
+        self.queries.append(first_line)
+        if self.fail_on and first_line.startswith(self.fail_on):
+            raise RuntimeError(f"{self.fail_on} failed")
+
+    async def receive_response(self):
+        yield "done"
+
+
+class TestWorkflowResume:
+    """Test that a resumed workflow skips completed phases."""
+
+    @pytest.mark.asyncio
+    async def test_resume_skips_completed_phases(self, tmp_path):
+        memory = MemoryManager(tmp_path / "memories")
+        store = CheckpointStore.create(tmp_path / "runs", "Process PDF invoices")
+
+        failing = RecordingClient(fail_on="@code_generator")
+        workflow = OrchestrationWorkflow(memory=memory, working_dir=tmp_path, client=failing)
+        result = await workflow.execute("Process PDF invoices", checkpoints=store)
+
+        assert not result.success
+        assert result.error == "@code_generator failed"
+        assert result.intent is None
+        saved = set(store.load())
+        assert {"intent", "structure", "requirements"} <= saved
+        assert "code" not in saved
+
+        client = RecordingClient()
+        workflow = OrchestrationWorkflow(memory=memory, working_dir=tmp_path, client=client)
+        result = await workflow.execute(
+            "Process PDF invoices",
+            checkpoints=CheckpointStore.open(tmp_path / "runs", store.run_id)
+        )
+        memory.close()
+
+        assert result.success
+        assert "@code_generator" in client.queries
+        assert "@requirements_analyst" not in client.queries
+        assert not any(q.startswith("Analyze") or q.startswith("Create the base") for q in client.queries)
+        skipped = result.artifacts["schedule"]["skipped"]
+        assert {"intent", "structure", "requirements"} <= set(skipped)
+        assert "validation" not in skipped
+        assert result.artifacts["subagent_results"]["requirements"] == {
+            "status": "completed", "agent": "requirements_analyst"
+        }
@@ -0,0 +1,228 @@
+"""
+Unit tests for the dependency-graph scheduler and the workflow schedule.
+"""
+
+import asyncio
+
+import pytest
+
+from orchestrator.memory import MemoryManager
+from orchestrator.scheduler import DAGScheduler
+from orchestrator.sessions import ClientPool
+from orchestrator.workflow import OrchestrationWorkflow
+
+
+def sleeper(seconds: float, value=None, log=None, name=None):
+    """Task function that sleeps, logs its name and returns a value."""
+    async def run(results):
+        await asyncio.sleep(seconds)
+        if log is not None:
+            log.append(name)
+        return value
+    return run
+
+
+class TestDAGScheduler:
+    """Test ordering, concurrency and reporting."""
+
+    @pytest.mark.asyncio
+    async def test_dependencies_see_results(self):
+        scheduler = DAGScheduler()
+
+        async def code(results):
+            return f"code for {results['spec']}"
+
+        scheduler.add("spec", sleeper(0.01, "spec v1"))
+        scheduler.add("code", code, after=["spec"])
+        results = await scheduler.run()
+
+        assert results == {"spec": "spec v1", "code": "code for spec v1"}
+
+    @pytest.mark.asyncio
+    async def test_task_starts_when_its_inputs_are_ready(self):
+        log = []
+        scheduler = DAGScheduler(max_concurrency=3)
+        scheduler.add("spec", sleeper(0.02, log=log, name="spec"))
+        scheduler.add("docs", sleeper(0.2, log=log, name="docs"))
+        scheduler.add("tests", sleeper(0.02, log=log, name="tests"), after=["spec"])
+        await scheduler.run()
+
+        assert log == ["spec", "tests", "docs"]
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit_and_queue_times(self):
+        scheduler = DAGScheduler(max_concurrency=2)
+        for name in "abcd":
+            scheduler.add(name, sleeper(0.05))
+        await scheduler.run()
+        report = scheduler.report()
+
+        queued = sorted(task["queued_seconds"] for task in report["tasks"].values())
+        assert queued[0] < 0.02 and queued[1] < 0.02
+        assert queued[2] >= 0.04 and queued[3] >= 0.04
+        assert report["wall_seconds"] >= 0.1
+
+    @pytest.mark.asyncio
+    async def test_critical_path(self):
+        scheduler = DAGScheduler(max_concurrency=4)
+        scheduler.add("intent", sleeper(0.02))
+        scheduler.add("spec", sleeper(0.02), after=["intent"])
+        scheduler.add("docs", sleeper(0.03), after=["intent"])
+        scheduler.add("code", sleeper(0.08), after=["spec"])
+        scheduler.add("validate", sleeper(0.01), after=["code", "docs"])
+        await scheduler.run()
+        report = scheduler.report()
+
+        assert report["critical_path"] == ["intent", "spec", "code", "validate"]
+        assert 0.13 <= report["critical_path_seconds"] <= report["wall_seconds"] + 0.01
+        assert report["tasks"]["validate"]["after"] == ["code", "docs"]
+
+    @pytest.mark.asyncio
+    async def test_initial_results(self):
+        scheduler = DAGScheduler()
+
+        async def double(results):
+            return results["n"] * 2
+
+        scheduler.add("double", double, after=["n"])
+        assert (await scheduler.run({"n": 21}))["double"] == 42
+
+    @pytest.mark.asyncio
+    async def test_given_results_skip_tasks(self):
+        log = []
+        finished = []
+        scheduler = DAGScheduler()
+        scheduler.add("spec", sleeper(0, "new spec", log=log, name="spec"))
+        scheduler.add("code", sleeper(0, "code", log=log, name="code"), after=["spec"])
+        results = await scheduler.run(
+            {"spec": "saved spec"},
+            on_result=lambda name, value: finished.append((name, value))
+        )
+
+        assert log == ["code"]
+        assert results == {"spec": "saved spec", "code": "code"}
+        assert finished == [("code", "code")]
+        report = scheduler.report()
+        assert report["skipped"] == ["spec"]
+        assert list(report["tasks"]) == ["code"]
+        assert report["critical_path"] == ["code"]
+
+    @pytest.mark.asyncio
+    async def test_invalid_graphs(self):
+        scheduler = DAGScheduler()
+        scheduler.add("a", sleeper(0), after=["missing"])
+        with pytest.raises(ValueError, match="unknown"):
+            await scheduler.run()
+
+        scheduler = DAGScheduler()
+        scheduler.add("a", sleeper(0), after=["b"])
+        scheduler.add("b", sleeper(0), after=["a"])
+        scheduler.add("c", sleeper(0))
+        with pytest.raises(ValueError, match="cycle between tasks: a, b"):
+            await scheduler.run()
+
+        with pytest.raises(ValueError):
+            scheduler.add("a", sleeper(0))
+        with pytest.raises(ValueError):
+            DAGScheduler(max_concurrency=0)
+
+    @pytest.mark.asyncio
+    async def test_failure_cancels_running_tasks(self):
+        cancelled = asyncio.Event()
+
+        async def slow(results):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        async def fail(results):
+            raise RuntimeError("subagent failed")
+
+        scheduler = DAGScheduler()
+        scheduler.add("slow", slow)
+        scheduler.add("fail", fail)
+        scheduler.add("never", sleeper(0), after=["fail"])
+        with pytest.raises(RuntimeError, match="subagent failed"):
+            await scheduler.run()
+
+        assert cancelled.is_set()
+        assert "never" not in scheduler.report()["tasks"]
+
+
+class StubClient:
+    """SDK client stub answering every query after a short delay."""
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        pass
+
+    async def query(self, prompt):
+        pass
+
+    async def receive_response(self):
+        await asyncio.sleep(0.02)
+        yield "done"
+
+
+class TestWorkflowSchedule:
+    """Test that a workflow run reports its schedule."""
+
+    @pytest.mark.asyncio
+    async def test_schedule_in_artifacts(self, tmp_path):
+        memory = MemoryManager(tmp_path / "memories")
+        async with ClientPool(StubClient, size=3) as pool:
+            workflow = OrchestrationWorkflow(
+                memory=memory, working_dir=tmp_path, client=StubClient(), pool=pool
+            )
+            result = await workflow.execute("Process PDF invoices nightly")
+        memory.close()
+
+        assert result.success
+        schedule = result.artifacts["schedule"]
+        assert schedule["critical_path"][0] == "intent"
+        assert schedule["critical_path"][-1] == "validation"
+        assert set(schedule["tasks"]) == {
+            "intent", "structure", "requirements", "code", "tests", "docs", "validation"
+        }
+        tasks = schedule["tasks"]
+        assert tasks["tests"]["started_at"] >= tasks["requirements"]["finished_at"]
+        assert tasks["docs"]["started_at"] < tasks["requirements"]["finished_at"]
+        assert set(result.artifacts["subagent_results"]) == {"requirements", "code", "tests", "docs"}
+
+
+
+class StoringClient(StubClient):
+    """SDK client stub storing a memory, like a tool call, for each subagent query."""
+
+    def __init__(self, memory, memory_dir):
+        self.memory = memory
+        self.memory_dir = memory_dir
+        self.flushed = []
+
+    async def query(self, prompt):
+        if prompt.startswith("Analyze this automation request"):
+            return
+        key = await self.memory.store_pattern(f"step_{len(self.flushed)}", prompt[:40])
+        # Another process sees the memory as soon as the tool call returns
+        reader = MemoryManager(self.memory_dir)
+        self.flushed.append(reader.retrieve_memory(key) is not None)
+        reader.close()
+
+
+class TestWorkflowMemoryWrites:
+    """Test that a run does not hold back memory writes."""
+
+    @pytest.mark.asyncio
+    async def test_tool_writes_are_flushed_during_the_run(self, tmp_path):
+        memory = MemoryManager(tmp_path / "memories")
+        workflow = OrchestrationWorkflow(memory=memory, working_dir=tmp_path)
+        workflow.client = StoringClient(workflow.memory, tmp_path / "memories")
+        result = await workflow.execute("Process PDF invoices nightly")
+        memory.close()
+
+        assert result.success
+        assert workflow.client.flushed and all(workflow.client.flushed)
@@ -0,0 +1,172 @@
+"""
+Unit tests for the SDK client session pool and its use by the workflow.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from orchestrator.memory import MemoryManager
+from orchestrator.models import AutomationIntent, ProjectStructure
+from orchestrator.sessions import ClientPool
+from orchestrator.workflow import OrchestrationWorkflow
+
+RESPONSE_SECONDS = 0.2
+
+
+class FakeClient:
+    """Client stub whose responses take RESPONSE_SECONDS and echo the query."""
+
+    def __init__(self):
+        self.entered = False
+        self.closed = False
+        self.pending = []
+        self.transcript = []
+
+    async def __aenter__(self):
+        self.entered = True
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.closed = True
+
+    async def query(self, prompt):
+        self.pending.append(prompt)
+
+    async def receive_response(self):
+        await asyncio.sleep(RESPONSE_SECONDS)
+        prompt = self.pending.pop(0)
+        self.transcript.append(prompt)
+        yield prompt
+
+
+@pytest.fixture
+def intent():
+    return AutomationIntent(
+        project_name="invoice-processor",
+        project_type="data_processing",
+        main_objective="Automate PDF invoice processing",
+        key_requirements=["Extract data from PDF invoices"],
+        required_agents=[
+            "requirements_analyst", "code_generator", "test_writer", "documentation_writer"
+        ],
+        complexity_level="medium",
+        estimated_duration="2-3 days"
+    )
+
+
+@pytest.fixture
+def project():
+    return ProjectStructure(
+        project_name="invoice-processor",
+        project_type="data_processing",
+        directories=["src"],
+        files=[],
+        agents=[]
+    )
+
+
+class TestClientPool:
+    """Test session reuse and bounds."""
+
+    @pytest.mark.asyncio
+    async def test_sessions_opened_on_demand_and_reused(self):
+        clients = []
+
+        def factory():
+            clients.append(FakeClient())
+            return clients[-1]
+
+        async with ClientPool(factory, size=3) as pool:
+            async with pool.session() as first:
+                assert first.entered
+            async with pool.session() as second:
+                assert second is first
+            assert pool.stats()["open"] == 1
+
+        assert len(clients) == 1
+        assert clients[0].closed
+
+    @pytest.mark.asyncio
+    async def test_bounded(self):
+        async with ClientPool(FakeClient, size=2) as pool:
+            active = 0
+            peak = 0
+
+            async def use():
+                nonlocal active, peak
+                async with pool.session():
+                    active += 1
+                    peak = max(peak, active)
+                    await asyncio.sleep(0.01)
+                    active -= 1
+
+            await asyncio.gather(*(use() for _ in range(6)))
+            stats = pool.stats()
+
+        assert peak == 2
+        assert stats["open"] == 2
+        assert stats["acquisitions"] == 6
+        assert stats["waits"] > 0
+
+    @pytest.mark.asyncio
+    async def test_failed_session_is_not_reused(self):
+        async with ClientPool(FakeClient, size=1) as pool:
+            with pytest.raises(RuntimeError):
+                async with pool.session() as broken:
+                    raise RuntimeError("response interrupted")
+            async with pool.session() as client:
+                assert client is not broken
+        assert broken.closed
+
+    def test_invalid_size(self):
+        with pytest.raises(ValueError):
+            ClientPool(FakeClient, size=0)
+
+
+class TestParallelSubagents:
+    """Test that delegated subagents run on separate sessions."""
+
+    @pytest.fixture
+    def workflow(self, tmp_path):
+        memory = MemoryManager(tmp_path / "memories")
+        yield OrchestrationWorkflow(memory=memory, working_dir=tmp_path)
+        memory.close()
+
+    @pytest.mark.asyncio
+    async def test_pooled_phase_takes_slowest_subagent(self, workflow, intent, project):
+        clients = []
+
+        def factory():
+            clients.append(FakeClient())
+            return clients[-1]
+
+        async with ClientPool(factory, size=3) as pool:
+            workflow.pool = pool
+            started = time.perf_counter()
+            results = await workflow._execute_subagents_parallel(intent, project)
+            elapsed = time.perf_counter() - started
+
+        # Requirements and docs at once, then code and tests at once
+        assert elapsed < 3 * RESPONSE_SECONDS
+        assert set(results) == {"requirements", "code", "tests", "docs"}
+        assert len(clients) == 2
+        for client in clients:
+            # Every response belongs to the query sent on the same session
+            assert all(prompt.startswith("@") for prompt in client.transcript)
+        assert sum(len(client.transcript) for client in clients) == 4
+
+    @pytest.mark.asyncio
+    async def test_shared_client_is_not_interleaved(self, workflow, intent, project):
+        client = FakeClient()
+        workflow.client = client
+
+        started = time.perf_counter()
+        await workflow._execute_subagents_parallel(intent, project)
+        elapsed = time.perf_counter() - started
+
+        assert elapsed >= 4 * RESPONSE_SECONDS
+        assert [prompt.split()[0] for prompt in client.transcript] == [
+            "@requirements_analyst", "@documentation_writer", "@code_generator", "@test_writer"
+        ]
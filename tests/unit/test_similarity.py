@@ -0,0 +1,67 @@
+"""
+Unit tests for SimHash near-duplicate detection.
+"""
+
+import random
+
+from orchestrator.retrieval import tokenize
+from orchestrator.similarity import SimHashIndex, hamming, shingles, simhash
+
+
+def fingerprint(text: str) -> int:
+    """SimHash of a text's terms and word pairs."""
+    return simhash(shingles(tokenize(text)))
+
+
+class TestSimHash:
+    """Test fingerprints of similar and different values."""
+
+    def test_formatting_differences_collide(self):
+        a = fingerprint("Use code_generator agent for: FastAPI projects with pydantic models")
+        b = fingerprint("use code_generator agent for FastAPI project, with Pydantic models.")
+        assert hamming(a, b) == 0
+
+    def test_different_values_are_far_apart(self):
+        a = fingerprint("Created api_automation project: invoices")
+        b = fingerprint("Prefer structured logging with correlation ids")
+        assert hamming(a, b) > 10
+
+    def test_word_order_matters(self):
+        a = fingerprint("Prefer Flask over FastAPI for REST APIs")
+        b = fingerprint("Prefer FastAPI over Flask for REST APIs")
+        assert hamming(a, b) > 3
+
+    def test_empty_value(self):
+        assert simhash({}) == 0
+
+
+class TestSimHashIndex:
+    """Test banded Hamming-distance lookups."""
+
+    def test_finds_every_fingerprint_within_distance(self):
+        rng = random.Random(3)
+        index = SimHashIndex(max_distance=3)
+        base = rng.getrandbits(64)
+        near = {}
+        for i in range(200):
+            flips = rng.sample(range(64), rng.randint(0, 6))
+            value = base
+            for bit in flips:
+                value ^= 1 << bit
+            index.add(f"k{i}", value)
+            near[f"k{i}"] = len(flips)
+
+        found = dict(index.near(base))
+        assert found == {key: d for key, d in near.items() if d <= 3}
+        assert list(found.values()) == sorted(found.values())
+
+    def test_remove_and_replace(self):
+        index = SimHashIndex()
+        index.add("a", 0b1011)
+        index.add("a", 1 << 63)
+        assert index.near(0b1011) == []
+        assert index.near(1 << 63) == [("a", 0)]
+
+        index.remove("a")
+        assert len(index) == 0
+        assert index.fingerprint("a") is None
@@ -0,0 +1,158 @@
+"""
+Unit tests for memory-mapped memory snapshots.
+"""
+
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from orchestrator.memory import MemoryManager
+from orchestrator.models import MemoryEntry
+from orchestrator.snapshot import (
+    SNAPSHOT_FILE,
+    SnapshotBackend,
+    SnapshotIndex,
+    encode_snapshot,
+)
+
+
+def make_entry(key: str, value: str = "Prefer FastAPI for REST APIs",
+               category: str = "pattern") -> MemoryEntry:
+    """Build a memory entry for tests."""
+    return MemoryEntry(
+        key=key,
+        value=value,
+        category=category,
+        timestamp=datetime.now().isoformat()
+    )
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def writer(request, tmp_path: Path) -> MemoryManager:
+    """Writable manager with a few memories."""
+    manager = MemoryManager(tmp_path / "memories", backend=request.param)
+    with manager.batch():
+        manager.store_memory(make_entry("api", "Prefer FastAPI for REST APIs"))
+        manager.store_memory(make_entry("pdf", "Extract invoice fields with pdfplumber " * 20))
+        manager.store_memory(make_entry("auth", "Use JWT access tokens", "architectural_decision"))
+    yield manager
+    manager.close()
+
+
+class TestSnapshotFormat:
+    """Test encoding and lookups in the binary format."""
+
+    def test_lookup_by_key(self, tmp_path):
+        path = tmp_path / SNAPSHOT_FILE
+        records = [
+            (f"key_{i:03d}", {"category": "pattern", "n": i}, {"key": f"key_{i:03d}", "value": str(i)})
+            for i in reversed(range(100))
+        ]
+        path.write_bytes(encode_snapshot(records, version=7))
+
+        backend = SnapshotBackend(path)
+        index = backend.load_index()
+        assert isinstance(index, SnapshotIndex)
+        assert backend.version() == 7
+        assert len(index) == 100
+        assert list(index)[:2] == ["key_000", "key_001"]
+        assert index["key_042"]["n"] == 42
+        assert index["key_042"] is index["key_042"]
+        assert "key_100" not in index
+        assert backend.read_entry("key_099")["value"] == "99"
+        assert backend.read_entry("missing") is None
+
+    def test_unicode_keys(self, tmp_path):
+        path = tmp_path / SNAPSHOT_FILE
+        path.write_bytes(encode_snapshot([("facturación", {}, {"value": "ñ"}), ("a", {}, {"value": "a"})]))
+        assert SnapshotBackend(path).read_entry("facturación") == {"value": "ñ"}
+
+    def test_rejects_other_files(self, tmp_path):
+        path = tmp_path / SNAPSHOT_FILE
+        path.write_bytes(b"{}" * 32)
+        with pytest.raises(ValueError):
+            SnapshotBackend(path)
+
+
+class TestSnapshotManager:
+    """Test writing snapshots and reading them through MemoryManager."""
+
+    def test_reader_sees_store(self, writer):
+        assert writer.write_snapshot()
+        reader = MemoryManager.open_snapshot(writer.memory_dir)
+
+        assert reader.count_memories() == 3
+        assert reader.retrieve_memory("pdf").value == writer.retrieve_memory("pdf").value
+        assert [e.key for e in reader.search_memories(category="architectural_decision")] == ["auth"]
+        assert "FastAPI" in reader.get_relevant_context("api", query="REST API with FastAPI")
+        assert "file" not in reader._load_index()["api"]
+
+    def test_open_does_not_create_anything(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            MemoryManager.open_snapshot(tmp_path / "missing")
+        assert not (tmp_path / "missing").exists()
+
+    def test_reader_is_read_only(self, writer):
+        writer.write_snapshot()
+        reader = MemoryManager.open_snapshot(writer.memory_dir)
+        with pytest.raises(RuntimeError):
+            reader.store_memory(make_entry("new"))
+        with pytest.raises(RuntimeError):
+            reader.delete_memory("api")
+
+    def test_rewritten_only_when_store_changes(self, writer):
+        assert writer.write_snapshot()
+        assert not writer.write_snapshot()
+        writer.store_memory(make_entry("retry", "Retry with backoff"))
+        assert writer.write_snapshot()
+        assert writer.write_snapshot(force=True)
+
+    def test_staleness_checked_against_store_version(self, writer):
+        assert writer.write_snapshot()
+        backend = "sqlite" if writer.backend.name == "sqlite" else "json"
+        other = MemoryManager(writer.memory_dir, backend=backend)
+        assert not other.write_snapshot()
+
+        other.store_memory(make_entry("retry", "Retry with backoff"))
+        other.close()
+        assert writer.write_snapshot()
+        assert MemoryManager.open_snapshot(writer.memory_dir).version() == writer.version()
+
+    def test_reader_remaps_new_snapshot(self, writer):
+        writer.write_snapshot()
+        reader = MemoryManager.open_snapshot(writer.memory_dir)
+        assert reader.retrieve_memory("api").value == "Prefer FastAPI for REST APIs"
+
+        writer.store_memory(make_entry("api", "Prefer Litestar for REST APIs"))
+        writer.delete_memory("auth")
+        writer.write_snapshot()
+
+        assert reader.retrieve_memory("api").value == "Prefer Litestar for REST APIs"
+        assert reader.retrieve_memory("auth") is None
+        assert reader.cache_stats()["remaps"] == 1
+
+    def test_auto_snapshot_is_deferred(self, tmp_path):
+        manager = MemoryManager(tmp_path / "memories", snapshot=True, snapshot_delay=0.2)
+        path = tmp_path / "memories" / SNAPSHOT_FILE
+        manager.store_memory(make_entry("api"))
+        with manager.batch():
+            manager.store_memory(make_entry("pdf"))
+            manager.store_memory(make_entry("auth"))
+        assert not path.exists()  # Not rebuilt in the write path
+
+        deadline = time.monotonic() + 5
+        while not path.exists() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert len(SnapshotBackend(path).load_index()) == 3
+        manager.close()
+
+    def test_close_writes_pending_snapshot(self, tmp_path):
+        manager = MemoryManager(tmp_path / "memories", snapshot=True, snapshot_delay=60)
+        manager.store_memory(make_entry("api"))
+        path = tmp_path / "memories" / SNAPSHOT_FILE
+        assert not path.exists()
+
+        manager.close()
+        assert SnapshotBackend(path).load_index().keys() == {"api"}